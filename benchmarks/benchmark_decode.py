@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+benchmark of decoding images as done by ``detloclcheck find_checkerboard``
+
+An artificial checkerboard image of each size is stored as color JPEG and
+color PNG (like typical captures of a camera).
+Then the time for decoding is measured for:
+
+* color decode followed by :func:`cv2.cvtColor` (the former way)
+* direct gray decode (:data:`cv2.IMREAD_GRAYSCALE`)
+* reduced gray decode (:data:`cv2.IMREAD_REDUCED_GRAYSCALE_2`, ...)
+
+You can run this file directly::
+
+  env python3 benchmark_decode.py
+  env python3 benchmark_decode.py -megapixel 1 12 50 -repeat 3
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import functools
+import json
+import os
+import tempfile
+import time
+
+import cv2
+
+from detloclcheck.create_checkerboard_image import create_checkerboard_image
+from detloclcheck.tools import read_gray_image
+
+
+def read_color_convert(filename):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    decode as color image and convert to gray (the former way)
+    """
+    return cv2.cvtColor(cv2.imread(filename), cv2.COLOR_BGR2GRAY)
+
+
+def measure(function, repeat):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: minimal wall time of repeat calls of function
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark_decode(megapixel, repeat, tmpdir):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: list of dicts with the measured times
+    """
+    results = []
+    # 4:3 image with squares of 1/40 of the width (rows first)
+    width = int(round((megapixel * 1e6 * 4 / 3)**0.5))
+    size = max(15, width // 40)
+    _, _, image = create_checkerboard_image(
+        (3 * width // 4) // size, width // size, size)
+    image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    for extension in ('jpg', 'png'):
+        filename = os.path.join(tmpdir, 'checkerboard.' + extension)
+        cv2.imwrite(filename, image)
+        readers = [('color+cvtColor',
+                    functools.partial(read_color_convert, filename))]
+        for reduction in (1, 2, 4, 8):
+            readers.append(
+                (f'gray reduction {reduction}',
+                 functools.partial(read_gray_image, filename, reduction)))
+        reference = None
+        for name, reader in readers:
+            seconds = measure(reader, repeat)
+            if reference is None:
+                reference = seconds
+            results.append(
+                {'megapixel': image.shape[0] * image.shape[1] / 1e6,
+                 'format': extension, 'decoder': name, 'seconds': seconds,
+                 'speedup': reference / seconds})
+    return results
+
+
+def main():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    parser = argparse.ArgumentParser(
+        description='benchmark of decoding images for DetLocLCheck')
+    parser.add_argument(
+        '-megapixel', nargs='+', type=float, default=[1, 12],
+        dest='megapixel', help='Set the image sizes. default: 1 12')
+    parser.add_argument(
+        '-repeat', nargs=1, type=int, default=[5], dest='repeat',
+        help='Set how often each decoding is repeated. default: 5')
+    parser.add_argument(
+        '-json', nargs=1, type=str, default=None, dest='json',
+        help='Write the results to this json file.')
+    args = parser.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for megapixel in args.megapixel:
+            results += benchmark_decode(megapixel, args.repeat[0], tmpdir)
+    for result in results:
+        print(f"{result['megapixel']:6.1f} MP {result['format']} "
+              f"{result['decoder']:20s} {1000 * result['seconds']:9.2f} ms "
+              f"(speedup {result['speedup']:.1f})")
+    if args.json is not None:
+        with open(args.json[0], 'w', encoding='utf8') as fd:
+            json.dump(results, fd, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-# SPDX-FileCopyrightText: 2024-2025 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
@@ -20,6 +20,7 @@ template matching.
 
 submodules
 ==========
+.. automodule:: detloclcheck.batch
 .. automodule:: detloclcheck.create_checkerboard_image
 .. automodule:: detloclcheck.create_coordinate_system
 .. automodule:: detloclcheck.detect_localize_checkerboard
@@ -30,9 +31,9 @@ submodules
 copyright + license
 ===================
 :Author: Daniel Mohr
-:Date: 2025-02-20
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024-2025 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
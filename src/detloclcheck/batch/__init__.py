@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:mod:`detloclcheck.batch`
+=========================
+   :synopsis: :mod:`detloclcheck` is a python module for Detection and
+              Localization of a Checkerboard calibration target containing
+              L-shape marker using template matching.
+
+.. contents::
+
+description
+-----------
+
+`DetLocLCheck` is a software tool for Detection and Localization of a
+Checkerboard calibration target containing L-shape marker using
+template matching.
+
+This submodule contains tools to handle many images.
+
+functions
+---------
+.. currentmodule:: detloclcheck.batch
+.. autofunction:: json_line_to_result
+.. autofunction:: prefetch_images
+.. autofunction:: result_to_json_line
+
+submodules
+----------
+.. automodule:: detloclcheck.batch.batch_metrics
+.. automodule:: detloclcheck.batch.job_manifest
+.. automodule:: detloclcheck.batch.result_store
+.. automodule:: detloclcheck.batch.work_queue
+
+copyright + license
+-------------------
+:Author: Daniel Mohr
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+from .batch_metrics import BatchMetrics
+from .job_manifest import JobManifest
+from .json_lines import json_line_to_result, result_to_json_line
+from .prefetch_images import prefetch_images
+from .result_store import ResultStore
+from .work_queue import WorkQueue
+
+__all__ = ["BatchMetrics",
+           "JobManifest",
+           "json_line_to_result",
+           "prefetch_images",
+           "result_to_json_line",
+           "ResultStore",
+           "WorkQueue"]
@@ -0,0 +1,238 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.batch.batch_metrics
+.. autoclass:: BatchMetrics
+   :members:
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import bisect
+import collections
+import json
+import os
+import time
+
+
+class BatchMetrics():  # pylint: disable=too-many-instance-attributes
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    throughput metrics of a batch run
+
+    The counters are the number of handled images by error code (0 for
+    success), a histogram of the latency (seconds of the detection of an
+    image) and the busy time of the workers. From these the images per
+    second (since the start and since the last write) and the worker
+    utilization (busy time divided by the elapsed time of all workers)
+    are derived.
+
+    With a filename the metrics are written (replacing the file atomically)
+    in the Prometheus text format or as json, when an image is added and at
+    least interval seconds passed since the last write.
+
+    Example:
+
+    >>> from detloclcheck.batch import BatchMetrics
+    >>> metrics = BatchMetrics('metrics.prom', jobs=4, interval=10)
+    >>> metrics.add(0, 1.2)
+    >>> metrics.add(3, 0.4)
+    >>> metrics.write()
+    """
+    #: default upper bounds (in seconds) of the buckets of the latency
+    #: histogram
+    default_buckets = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+    output_formats = ('prometheus', 'json')
+
+    def __init__(self, filename=None, *, jobs=1, interval=10.0,
+                 output_format='prometheus', buckets=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param filename: None or the file for the metrics
+        :param jobs: number of workers handling images in parallel
+        :param interval: minimal seconds between two writes
+        :param output_format: "prometheus" or "json"
+        :param buckets: None or ascending upper bounds (in seconds) of the
+                        buckets of the latency histogram
+        """
+        if output_format not in self.output_formats:
+            raise ValueError(f'unknown output format "{output_format}"')
+        self.filename = filename
+        self.jobs = jobs
+        self.interval = interval
+        self.output_format = output_format
+        self.buckets = tuple(
+            self.default_buckets if buckets is None else buckets)
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.error_codes = collections.Counter()
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.latency_sum = 0.0
+        self._last_write = (self._start, 0)
+
+    @property
+    def images(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        number of handled images
+        """
+        return sum(self.error_codes.values())
+
+    def add(self, error_code, seconds):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        count a handled image and write the metrics if it is time to do so
+
+        :param error_code: 0 on success, otherwise the error code
+        :param seconds: time needed to handle the image
+        """
+        self.error_codes[int(error_code)] += 1
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.latency_sum += seconds
+        if ((self.filename is not None) and
+                (time.perf_counter() - self._last_write[0] >= self.interval)):
+            self.write()
+
+    def as_dict(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: dict (json serializable) of the metrics; the latency
+                 histogram is given as list of [upper bound, cumulative
+                 count] with None as the last upper bound (infinity)
+        """
+        now = time.perf_counter()
+        elapsed = now - self._start
+        images = self.images
+        window = now - self._last_write[0]
+        cumulative = 0
+        histogram = []
+        for upper_bound, count in zip(self.buckets + (None,),
+                                      self.bucket_counts):
+            cumulative += count
+            histogram.append([upper_bound, cumulative])
+        return {
+            'start_time': self.start_time,
+            'elapsed_seconds': elapsed,
+            'images': images,
+            'failed_images': images - self.error_codes[0],
+            'error_codes': {str(error_code): count for error_code, count
+                            in sorted(self.error_codes.items())},
+            'images_per_second': images / elapsed if elapsed > 0 else 0.0,
+            'recent_images_per_second': (
+                (images - self._last_write[1]) / window
+                if window > 0 else 0.0),
+            'latency_seconds': {'buckets': histogram,
+                                'sum': self.latency_sum,
+                                'count': images},
+            'jobs': self.jobs,
+            'busy_seconds': self.latency_sum,
+            'worker_utilization': (
+                self.latency_sum / (elapsed * self.jobs)
+                if elapsed > 0 else 0.0)}
+
+    def as_prometheus(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: the metrics in the Prometheus text format
+        """
+        data = self.as_dict()
+        lines = [
+            '# HELP detloclcheck_images_total Handled images by error code '
+            '(0 for success).',
+            '# TYPE detloclcheck_images_total counter']
+        for error_code, count in data['error_codes'].items():
+            lines.append(
+                f'detloclcheck_images_total{{error_code="{error_code}"}} '
+                f'{count}')
+        lines += [
+            '# HELP detloclcheck_image_seconds Time needed to handle an '
+            'image.',
+            '# TYPE detloclcheck_image_seconds histogram']
+        for upper_bound, count in data['latency_seconds']['buckets']:
+            upper_bound = '+Inf' if upper_bound is None else \
+                repr(float(upper_bound))
+            lines.append(
+                f'detloclcheck_image_seconds_bucket{{le="{upper_bound}"}} '
+                f'{count}')
+        lines += [
+            'detloclcheck_image_seconds_sum '
+            f"{data['latency_seconds']['sum']!r}",
+            f"detloclcheck_image_seconds_count {data['images']}"]
+        for name, metric_type, text in (
+                ('start_time', 'gauge',
+                 'Start of the batch run as unix time.'),
+                ('elapsed_seconds', 'gauge',
+                 'Seconds since the start of the batch run.'),
+                ('images_per_second', 'gauge',
+                 'Handled images per second since the start.'),
+                ('recent_images_per_second', 'gauge',
+                 'Handled images per second since the last write.'),
+                ('busy_seconds', 'counter',
+                 'Sum of the seconds needed to handle the images.'),
+                ('jobs', 'gauge', 'Number of workers.'),
+                ('worker_utilization', 'gauge',
+                 'Busy seconds divided by the elapsed seconds of all '
+                 'workers.')):
+            metric = f'detloclcheck_{name}'
+            if metric_type == 'counter':
+                metric += '_total'
+            lines += [f'# HELP {metric} {text}',
+                      f'# TYPE {metric} {metric_type}',
+                      f'{metric} {data[name]!r}']
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        write the metrics to the file (readers never see a partial file)
+        """
+        if self.output_format == 'json':
+            content = json.dumps(self.as_dict()) + '\n'
+        else:
+            content = self.as_prometheus()
+        tmp_filename = self.filename + '.tmp'
+        with open(tmp_filename, 'w', encoding='utf8') as fd:
+            fd.write(content)
+        os.replace(tmp_filename, self.filename)
+        self._last_write = (time.perf_counter(), self.images)
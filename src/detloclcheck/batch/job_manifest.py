@@ -0,0 +1,191 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.batch.job_manifest
+.. autoclass:: JobManifest
+   :members:
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import os
+
+
+def _read_records(lines):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: generator of the records of the lines; an incomplete line (of
+             an interrupted write) is skipped
+    """
+    for line in lines:
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            pass
+
+
+class JobManifest():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    manifest of a resumable batch job
+
+    The manifest is a json lines file. The first line is a header with the
+    parameters of the job. Every further line is a record of one input
+    with the keys "file", "state" ("pending", "done" or "failed") and for
+    handled inputs "error_code", "seconds" and "outputs". Records are
+    only appended (one write followed by fsync per record); the last record
+    of an input is valid and an incomplete last line of an interrupted run
+    is ignored (an incomplete header starts a new manifest). An input,
+    whose handling raised an exception, is recorded as failed.
+
+    Example:
+
+    >>> from detloclcheck.batch import JobManifest
+    >>> with JobManifest('job.jsonl', {'crosssizes': [11]}) as manifest:
+    ...     manifest.add(['foo.png', 'bar.png'])
+    ...     for filename in manifest.todo():
+    ...         manifest.update(filename, 0, 1.2, ['foo.json'])
+    """
+    states = ('pending', 'done', 'failed')
+
+    def __init__(self, filename, parameters):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param filename: file name of the manifest; an existing manifest
+                         is continued
+        :param parameters: dict of the parameters of the job (json
+                           serializable); a manifest of a job with other
+                           parameters raises a ValueError
+        """
+        self.filename = filename
+        # normalize, e. g. tuples are lists after a json round trip
+        header = json.loads(json.dumps(
+            {'version': 1, 'parameters': parameters}))
+        self.records = {}
+        lines = []
+        if os.path.isfile(filename):
+            with open(filename, 'r', encoding='utf8') as fd:
+                lines = fd.readlines()
+            if (len(lines) == 1) and (len(list(_read_records(lines))) == 0):
+                # interrupted while writing the header: a new manifest
+                lines = []
+            if (len(lines) > 0) and (json.loads(lines[0]) != header):
+                raise ValueError(
+                    f'"{filename}" belongs to a job with other parameters')
+            for record in _read_records(lines[1:]):
+                self.records[record['file']] = record
+        # pylint: disable=consider-using-with
+        self._fd = open(
+            filename, 'a' if len(lines) > 0 else 'w', encoding='utf8')
+        if self._fd.tell() == 0:
+            self._write([header])
+        elif not lines[-1].endswith('\n'):
+            # terminate an incomplete last line of an interrupted run
+            self._fd.write('\n')
+
+    def _write(self, records):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        self._fd.write(
+            ''.join(json.dumps(record) + '\n' for record in records))
+        self._fd.flush()
+        os.fsync(self._fd.fileno())
+
+    def add(self, filenames):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add inputs not yet in the manifest as pending
+        """
+        records = []
+        for filename in filenames:
+            if filename not in self.records:
+                record = {'file': filename, 'state': 'pending'}
+                self.records[filename] = record
+                records.append(record)
+        if len(records) > 0:
+            self._write(records)
+
+    def todo(self, retry_failed=False):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param retry_failed: if True, failed inputs are also returned
+
+        :return: list of the unfinished inputs
+        """
+        states = ('pending', 'failed') if retry_failed else ('pending',)
+        return [filename for filename, record in self.records.items()
+                if record['state'] in states]
+
+    def update(self, filename, error_code, seconds, outputs):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        record the handled input
+
+        :param filename: the input
+        :param error_code: 0 on success, otherwise the error code
+        :param seconds: time needed to handle the input
+        :param outputs: list of the output locations
+        """
+        record = {'file': filename,
+                  'state': 'done' if error_code == 0 else 'failed',
+                  'error_code': int(error_code), 'seconds': seconds,
+                  'outputs': list(outputs)}
+        self.records[filename] = record
+        self._write([record])
+
+    def close(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        self._fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.batch.json_lines
+.. autofunction:: result_to_json_line
+.. autofunction:: json_line_to_result
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import base64
+import json
+
+import numpy
+
+
+def _encode_array(array, binary):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    if not binary:
+        return array.tolist()
+    array = numpy.ascontiguousarray(array, dtype='<f8')
+    return {'dtype': array.dtype.str, 'shape': list(array.shape),
+            'data': base64.b64encode(array.tobytes()).decode('ascii')}
+
+
+def _decode_array(data):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    if isinstance(data, dict):
+        return numpy.frombuffer(
+            base64.b64decode(data['data']),
+            dtype=data['dtype']).reshape(data['shape'])
+    return numpy.array(data, dtype=float)
+
+
+def result_to_json_line(filename, result, *, binary=False, extra=None):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    create a compact json record (one line) for the result of an image
+
+    The record contains "file" and "status" (0 on success, otherwise the
+    error code). On success also "coordinate_system", "zeropoint", "axis1"
+    and "axis2" are given like in the json output of
+    ``detloclcheck find_checkerboard``. With binary set to True, the arrays
+    are given as dict with "dtype", "shape" and the base64 encoded "data".
+
+    :param filename: name of the image file
+    :param result: (coordinate_system, zeropoint, axis1, axis2) or
+                   (None, error_code, None, None) as returned by
+                   :func:`detect_localize_checkerboard`
+    :param binary: if True, encode arrays in binary form (base64)
+    :param extra: None or dict of further keys of the record, e. g. the id
+                  of a request
+
+    :return: json string terminated by a newline
+
+    Example:
+
+    >>> import sys
+    >>> from detloclcheck.batch import result_to_json_line
+    >>> sys.stdout.write(result_to_json_line('bar.png', (None, 5, None, None)))
+    {"file":"bar.png","status":5}
+    """
+    coordinate_system, zeropoint, axis1, axis2 = result
+    record = {'file': filename}
+    if extra is not None:
+        record.update(extra)
+    if coordinate_system is None:
+        record['status'] = int(zeropoint)
+    else:
+        record['status'] = 0
+        record['coordinate_system'] = _encode_array(coordinate_system, binary)
+        record['zeropoint'] = _encode_array(zeropoint, binary)
+        record['axis1'] = _encode_array(axis1, binary)
+        record['axis2'] = _encode_array(axis2, binary)
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def json_line_to_result(line):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    decode a record created by :func:`result_to_json_line`
+
+    :param line: one line of json
+
+    :return: (filename, result) with result as
+             (coordinate_system, zeropoint, axis1, axis2) or
+             (None, error_code, None, None)
+
+    Example:
+
+    >>> import subprocess
+    >>> from detloclcheck.batch import json_line_to_result
+    >>> with subprocess.Popen(
+    ...         ['detloclcheck', 'find_checkerboard', '-stdout_format',
+    ...          'jsonl_base64', '-f', 'foo.png', 'bar.png'],
+    ...         stdout=subprocess.PIPE, text=True) as process:
+    ...     for line in process.stdout:
+    ...         filename, result = json_line_to_result(line)
+    """
+    record = json.loads(line)
+    if record['status'] != 0:
+        return record['file'], (None, record['status'], None, None)
+    return record['file'], tuple(
+        _decode_array(record[name])
+        for name in ('coordinate_system', 'zeropoint', 'axis1', 'axis2'))
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.batch.prefetch_images
+.. autofunction:: prefetch_images
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import concurrent.futures
+import itertools
+
+from detloclcheck.tools import read_gray_image
+
+
+def prefetch_images(filenames, *, prefetch=2, reader=read_gray_image):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    read images in background threads while the caller handles the
+    current one
+
+    At most prefetch images are read ahead. Reading and decoding with
+    :func:`cv2.imread` releases the GIL, so this overlaps the image I/O
+    with the processing of the caller.
+
+    :param filenames: iterable of image files
+    :param prefetch: number of images to read ahead; 0 reads each image
+                     only when it is requested
+    :param reader: function to read an image file, e. g.
+                   :func:`detloclcheck.tools.read_gray_image` (default)
+                   or ``functools.partial(read_gray_image, reduction=2)``
+
+    :return: generator of (filename, image) in the order of filenames;
+             image is None if the file cannot be read
+
+    Example:
+
+    >>> from detloclcheck.batch import prefetch_images
+    >>> from detloclcheck.detect_localize_checkerboard import \\
+    ...     detect_localize_checkerboard
+    >>> for filename, image in prefetch_images(['foo.png', 'bar.png']):
+    ...     coordinate_system, zeropoint, axis1, axis2 = \\
+    ...         detect_localize_checkerboard(image, (11, 23), (0, 45))
+    """
+    if prefetch < 1:
+        for filename in filenames:
+            yield filename, reader(filename)
+        return
+    filenames = iter(filenames)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=prefetch)
+    try:
+        queue = collections.deque(
+            (filename, executor.submit(reader, filename))
+            for filename in itertools.islice(filenames, prefetch))
+        while len(queue) > 0:
+            filename, future = queue.popleft()
+            for next_filename in itertools.islice(filenames, 1):
+                queue.append(
+                    (next_filename, executor.submit(reader, next_filename)))
+            yield filename, future.result()
+    finally:
+        # do not read further images if the caller stopped early
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,379 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.batch.result_store
+.. autoclass:: ResultStore
+   :members:
+   :special-members: __len__, __getitem__
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+
+import numpy
+
+
+class ResultStore():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    append-only columnar store for the results of many images
+
+    The store is a directory with the files:
+
+    * format.json: description of the format
+    * index.bin: one record for every image (see _index_dtype)
+    * pixel.bin: float32 pixel coordinates of all corners
+    * lattice.bin: int16 lattice indices of all corners
+    * filenames.jsonl: one json string (the image file name) per line
+
+    All columns are only appended. The index record of an image is written
+    at last; on opening an existing store for appending, incomplete data of
+    an interrupted run is removed. For reading, all columns are memory
+    mapped; nothing is loaded before it is used.
+
+    Example:
+
+    >>> from detloclcheck.batch import ResultStore
+    >>> with ResultStore('results', mode='a') as result_store:
+    ...     result_store.append('foo.png', (coordinate_system, zeropoint,
+    ...                                     axis1, axis2))
+    ...     result_store.append('bar.png', (None, 5, None, None))
+    >>> result_store = ResultStore('results')
+    >>> coordinate_system, zeropoint, axis1, axis2 = \\
+    ...     result_store[result_store.find('foo.png')]
+    >>> failed = result_store.status != 0
+    """
+    _version = 1
+    _index_dtype = numpy.dtype([
+        ('offset', '<i8'), ('count', '<i4'), ('status', '<i2'),
+        ('zeropoint', '<f8', (2,)), ('axis1', '<f8', (2,)),
+        ('axis2', '<f8', (2,))])
+    _pixel_dtype = numpy.dtype(('<f4', (2,)))
+    _lattice_dtype = numpy.dtype(('<i2', (2,)))
+
+    def __init__(self, directory, mode='r'):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param directory: directory of the store
+        :param mode: 'r' to read an existing store or 'a' to append to a
+                     (maybe new) store
+        """
+        if mode not in ('r', 'a'):
+            raise ValueError(f'mode "{mode}" is not "r" or "a"')
+        self.directory = directory
+        self._fds = None
+        self._index = None
+        self._pixel = None
+        self._lattice = None
+        self._filenames = None
+        self._end = 0
+        if mode == 'a':
+            os.makedirs(directory, exist_ok=True)
+            if not os.path.isfile(self._path('format.json')):
+                with open(self._path('format.json'), 'w',
+                          encoding='utf8') as fd:
+                    json.dump(
+                        {'version': self._version,
+                         'index': self._index_dtype.descr,
+                         'pixel': self._pixel_dtype.descr,
+                         'lattice': self._lattice_dtype.descr}, fd)
+        self._check_format()
+        if mode == 'a':
+            self._repair()
+            self._fds = {
+                name: open(self._path(name), 'ab')  # pylint: disable=R1732
+                for name in ('index.bin', 'pixel.bin', 'lattice.bin')}
+            self._fds['filenames.jsonl'] = open(  # pylint: disable=R1732
+                self._path('filenames.jsonl'), 'a', encoding='utf8')
+
+    def _path(self, name):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        return os.path.join(self.directory, name)
+
+    def _check_format(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        with open(self._path('format.json'), 'r', encoding='utf8') as fd:
+            version = json.load(fd)['version']
+        if version != self._version:
+            raise ValueError(
+                f'result store "{self.directory}" has version {version}, '
+                f'but only version {self._version} is supported')
+
+    def _size(self, name):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        try:
+            return os.path.getsize(self._path(name))
+        except FileNotFoundError:
+            return 0
+
+    def _memmap(self, name, dtype, length):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        if length == 0:
+            # an empty file cannot be mapped
+            return numpy.empty((0,), dtype=dtype)
+        return numpy.memmap(
+            self._path(name), dtype=dtype, mode='r', shape=(length,))
+
+    def _repair(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        remove data of an interrupted append
+        """
+        length = self._size('index.bin') // self._index_dtype.itemsize
+        index = self._memmap('index.bin', self._index_dtype, length)
+        end = 0
+        if length > 0:
+            end = int(index[-1]['offset'] + index[-1]['count'])
+        del index
+        for name, size in (
+                ('index.bin', length * self._index_dtype.itemsize),
+                ('pixel.bin', end * self._pixel_dtype.itemsize),
+                ('lattice.bin', end * self._lattice_dtype.itemsize)):
+            if self._size(name) != size:
+                with open(self._path(name), 'ab') as fd:
+                    fd.truncate(size)
+        filenames = self._read_filenames()
+        if len(filenames) != length:
+            with open(self._path('filenames.jsonl'), 'w',
+                      encoding='utf8') as fd:
+                for filename in filenames[:length]:
+                    fd.write(json.dumps(filename) + '\n')
+        self._end = end
+
+    def _read_filenames(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        filenames = []
+        try:
+            with open(self._path('filenames.jsonl'), 'r',
+                      encoding='utf8') as fd:
+                for line in fd:
+                    try:
+                        filenames.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # incomplete last line
+                        break
+        except FileNotFoundError:
+            pass
+        return filenames
+
+    def append(self, filename, result):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param filename: name of the image file
+        :param result: (coordinate_system, zeropoint, axis1, axis2) or
+                       (None, error_code, None, None) as returned by
+                       :func:`detect_localize_checkerboard`
+        """
+        if self._fds is None:
+            raise ValueError('result store is not opened for appending')
+        coordinate_system, zeropoint, axis1, axis2 = result
+        record = numpy.zeros((1,), dtype=self._index_dtype)
+        record['offset'] = self._end
+        if coordinate_system is None:
+            record['status'] = zeropoint
+            record['zeropoint'] = numpy.nan
+            record['axis1'] = numpy.nan
+            record['axis2'] = numpy.nan
+        else:
+            record['count'] = coordinate_system.shape[0]
+            record['zeropoint'] = zeropoint
+            record['axis1'] = axis1
+            record['axis2'] = axis2
+            self._fds['pixel.bin'].write(
+                coordinate_system[:, 0, :].astype(
+                    self._pixel_dtype.base).tobytes())
+            self._fds['lattice.bin'].write(
+                numpy.round(coordinate_system[:, 1, :]).astype(
+                    self._lattice_dtype.base).tobytes())
+            self._end += coordinate_system.shape[0]
+        self._fds['filenames.jsonl'].write(json.dumps(filename) + '\n')
+        for name in ('pixel.bin', 'lattice.bin', 'filenames.jsonl'):
+            self._fds[name].flush()
+        # the index record makes the entry valid
+        self._fds['index.bin'].write(record.tobytes())
+        self._fds['index.bin'].flush()
+        self._index = None
+
+    def close(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        if self._fds is not None:
+            for fd in self._fds.values():
+                fd.close()
+            self._fds = None
+        self._index = None
+        self._pixel = None
+        self._lattice = None
+        self._filenames = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def index(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        memory mapped structured array with one record per image
+        """
+        if self._index is None:
+            self._index = self._memmap(
+                'index.bin', self._index_dtype,
+                self._size('index.bin') // self._index_dtype.itemsize)
+            end = 0
+            if self._index.shape[0] > 0:
+                end = int(self._index[-1]['offset'] +
+                          self._index[-1]['count'])
+            self._pixel = self._memmap('pixel.bin', self._pixel_dtype, end)
+            self._lattice = self._memmap(
+                'lattice.bin', self._lattice_dtype, end)
+            self._filenames = None
+        return self._index
+
+    @property
+    def filenames(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        list of the image file names
+        """
+        length = len(self)
+        if self._filenames is None:
+            self._filenames = self._read_filenames()[:length]
+        return self._filenames
+
+    @property
+    def status(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        status of all images: 0 on success, otherwise the error code
+        """
+        return self.index['status']
+
+    def __len__(self):
+        return self.index.shape[0]
+
+    def find(self, filename):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: position of the last entry of the image file
+        """
+        filenames = self.filenames
+        for i in range(len(filenames) - 1, -1, -1):
+            if filenames[i] == filename:
+                return i
+        raise KeyError(filename)
+
+    def pixel(self, i):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: memory mapped float32 pixel coordinates of image i
+        """
+        record = self.index[i]
+        return self._pixel[record['offset']:
+                           record['offset'] + record['count']]
+
+    def lattice(self, i):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: memory mapped int16 lattice indices of image i
+        """
+        record = self.index[i]
+        return self._lattice[record['offset']:
+                             record['offset'] + record['count']]
+
+    def __getitem__(self, i):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: (coordinate_system, zeropoint, axis1, axis2) or
+                 (None, error_code, None, None) like
+                 :func:`detect_localize_checkerboard`
+        """
+        record = self.index[i]
+        if record['status'] != 0:
+            return None, int(record['status']), None, None
+        coordinate_system = numpy.empty(
+            (record['count'], 2, 2), dtype=numpy.float64)
+        coordinate_system[:, 0, :] = self.pixel(i)
+        coordinate_system[:, 1, :] = self.lattice(i)
+        return (coordinate_system, numpy.array(record['zeropoint']),
+                numpy.array(record['axis1']), numpy.array(record['axis2']))
@@ -0,0 +1,320 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.batch.work_queue
+.. autoclass:: WorkQueue
+   :members:
+   :private-members:
+   :special-members:
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+
+
+class WorkQueue():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    work queue in a directory shared by several workers (e. g. on NFS)
+
+    Every input is an item file in one of the subdirectories "pending",
+    "claimed", "done" and "failed". A worker claims an item by an atomic
+    rename from "pending" to "claimed" and keeps it alive by updating its
+    modification time (heartbeat). An item with a heartbeat older than
+    timeout belongs to a dead worker and is moved back to "pending". The
+    records in "done" and "failed" have the same keys as the records of
+    :class:`detloclcheck.batch.JobManifest` and the worker.
+
+    Example:
+
+    >>> from detloclcheck.batch import WorkQueue
+    >>> with WorkQueue('queue') as work_queue:
+    ...     work_queue.add(['foo.png', 'bar.png'])
+    ...     filename = work_queue.claim()
+    ...     while filename is not None:
+    ...         work_queue.update(filename, 0, 1.2, ['foo.json'])
+    ...         filename = work_queue.claim()
+    """
+    states = ('pending', 'claimed', 'done', 'failed')
+
+    def __init__(self, directory, worker=None, timeout=60.0):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param directory: directory of the queue (created if necessary)
+        :param worker: name of this worker; default is hostname-pid
+        :param timeout: seconds without heartbeat after which a claimed
+                        item is moved back to pending
+        """
+        self.directory = directory
+        self.worker = worker
+        if self.worker is None:
+            self.worker = f'{socket.gethostname()}-{os.getpid()}'
+        self.timeout = timeout
+        for name in ('items',) + self.states:
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+        self._claimed = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def _path(self, state, key):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        return os.path.join(self.directory, state, key)
+
+    def _write(self, path, record):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        write the record to a temporary file in the queue directory
+
+        :return: name of the temporary file
+        """
+        fd, tmpname = tempfile.mkstemp(prefix='.tmp-', dir=self.directory)
+        with os.fdopen(fd, 'w', encoding='utf8') as tmpfile:
+            json.dump(record, tmpfile)
+        if path is not None:
+            os.replace(tmpname, path)
+        return tmpname
+
+    def add(self, filenames):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add inputs to the queue; an input already added (by any worker) is
+        ignored, therefore all workers can add the same inputs
+
+        :return: number of added inputs
+        """
+        number = 0
+        for filename in filenames:
+            key = hashlib.blake2b(
+                filename.encode('utf8'), digest_size=16).hexdigest() + '.json'
+            tmpname = self._write(None, {'file': filename})
+            try:
+                # creating a hard link is atomic and fails if it exists
+                os.link(tmpname, self._path('items', key))
+            except FileExistsError:
+                continue
+            else:
+                os.link(tmpname, self._path('pending', key))
+                number += 1
+            finally:
+                os.unlink(tmpname)
+        return number
+
+    def _now(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: current time of the file system; the clocks of the
+                 workers are not used, since they can differ
+        """
+        clock = os.path.join(self.directory, '.clock')
+        with open(clock, 'a', encoding='utf8'):
+            pass
+        os.utime(clock)
+        return os.stat(clock).st_mtime
+
+    def requeue_stale(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        move claimed items of dead workers back to pending
+
+        :return: number of moved items
+        """
+        log = logging.getLogger('detloclcheck.work_queue')
+        limit = self._now() - self.timeout
+        number = 0
+        for key in os.listdir(os.path.join(self.directory, 'claimed')):
+            try:
+                if os.stat(self._path('claimed', key)).st_mtime >= limit:
+                    continue
+                os.rename(self._path('claimed', key),
+                          self._path('pending', key))
+            except FileNotFoundError:
+                # finished or moved by another worker in the meantime
+                continue
+            log.warning('re-queued "%s" of a dead worker', key)
+            number += 1
+        return number
+
+    def claim(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        claim the next pending item
+
+        :return: the input or None if no item is pending
+        """
+        self.requeue_stale()
+        for key in sorted(
+                os.listdir(os.path.join(self.directory, 'pending'))):
+            try:
+                # the heartbeat is set before the item is claimed, otherwise
+                # another worker could see a stale item in "claimed"
+                os.utime(self._path('pending', key))
+                os.rename(self._path('pending', key),
+                          self._path('claimed', key))
+            except FileNotFoundError:
+                # claimed by another worker
+                continue
+            with open(self._path('items', key), 'r', encoding='utf8') as fd:
+                filename = json.load(fd)['file']
+            with self._lock:
+                self._claimed[filename] = key
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(
+                    target=self._run_heartbeat, daemon=True)
+                self._heartbeat.start()
+            return filename
+        return None
+
+    def _run_heartbeat(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        update the modification time of all items claimed by this worker
+        """
+        while not self._stop.wait(self.timeout / 4):
+            with self._lock:
+                keys = list(self._claimed.values())
+            for key in keys:
+                try:
+                    os.utime(self._path('claimed', key))
+                except FileNotFoundError:
+                    pass
+
+    def update(self, filename, error_code, seconds, outputs):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        finish the claimed item
+
+        :param filename: the input
+        :param error_code: 0 on success, otherwise the error code
+        :param seconds: time needed to handle the input
+        :param outputs: list of the output locations
+        """
+        with self._lock:
+            key = self._claimed.pop(filename)
+        state = 'done' if error_code == 0 else 'failed'
+        try:
+            os.rename(self._path('claimed', key), self._path(state, key))
+        except FileNotFoundError:
+            logging.getLogger('detloclcheck.work_queue').warning(
+                '"%s" was re-queued (heartbeat too old)', filename)
+            return
+        self._write(self._path(state, key),
+                    {'file': filename, 'state': state,
+                     'error_code': int(error_code), 'seconds': seconds,
+                     'outputs': list(outputs), 'worker': self.worker})
+
+    def counts(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: dict with the number of items in every state
+        """
+        return {state: len(os.listdir(os.path.join(self.directory, state)))
+                for state in self.states}
+
+    def wait(self, poll_interval=1.0):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        wait poll_interval seconds, if no item is pending
+
+        :return: True if items are pending or claimed (they can be re-queued
+                 if their worker dies), False if the queue is finished
+        """
+        counts = self.counts()
+        if counts['pending'] == 0:
+            time.sleep(poll_interval)
+            counts = self.counts()
+        return counts['pending'] + counts['claimed'] > 0
+
+    def close(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        stop the heartbeat and move unfinished items back to pending
+        """
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        with self._lock:
+            keys = list(self._claimed.values())
+            self._claimed.clear()
+        for key in keys:
+            try:
+                os.rename(self._path('claimed', key),
+                          self._path('pending', key))
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
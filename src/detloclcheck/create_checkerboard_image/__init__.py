@@ -1,4 +1,4 @@
-# SPDX-FileCopyrightText: 2024 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
@@ -22,17 +22,21 @@ functions
 ---------
 .. currentmodule:: detloclcheck.create_checkerboard_image
 .. autofunction:: create_checkerboard_image
+.. autofunction:: create_checkerboard_dataset
 
 submodules
 ----------
+.. automodule:: detloclcheck.create_checkerboard_image.checkerboard_image_cache
 .. automodule:: detloclcheck.create_checkerboard_image.checkerboard_image_class
+.. automodule::
+   detloclcheck.create_checkerboard_image.create_checkerboard_dataset
 
 copyright + license
 -------------------
 :Author: Daniel Mohr
-:Date: 2024-07-09
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024 Daniel Mohr
+:Copyright: (C) 2024, 2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
@@ -49,6 +53,7 @@ copyright + license
 # You should have received a copy of the GNU Lesser General Public License
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
+from .create_checkerboard_dataset import create_checkerboard_dataset
 from .create_checkerboard_image import create_checkerboard_image
 
-__all__ = ["create_checkerboard_image"]
+__all__ = ["create_checkerboard_dataset", "create_checkerboard_image"]
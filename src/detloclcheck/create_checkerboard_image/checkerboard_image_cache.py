@@ -0,0 +1,182 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule::
+   detloclcheck.create_checkerboard_image.checkerboard_image_cache
+.. autoclass:: CheckerboardImageCache
+   :members:
+   :private-members:
+   :special-members:
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy
+
+
+class CheckerboardImageCache():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    on-disk cache for the results of
+    :func:`detloclcheck.create_checkerboard_image.create_checkerboard_image`
+    """
+    _entry_files = ('zeropoint.npy', 'coordinates.npy', 'image.npy')
+
+    def __init__(self, directory, max_size=2**30):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        Every result is stored in its own subdirectory named by a hash of
+        all parameters and the version of DetLocLCheck. The arrays are
+        stored as .npy files. A loaded result is a writable copy, like an
+        uncached result.
+        If the cache grows larger than max_size, the least recently used
+        entries are removed.
+
+        :param directory: directory of the cache (created if necessary)
+        :param max_size: maximal size of the cache in bytes
+
+        Example:
+
+        >>> from detloclcheck.create_checkerboard_image import \\
+        ...     create_checkerboard_image
+        >>> from detloclcheck.create_checkerboard_image.\\
+        ...     checkerboard_image_cache import CheckerboardImageCache
+        >>> cache = CheckerboardImageCache('cache', max_size=2**28)
+        >>> zeropoint, coordinates, image = create_checkerboard_image(
+        ...     8, 8, 15, integrate_method=2, cache=cache)
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.version = importlib.metadata.version(
+            __package__.split('.', maxsplit=1)[0])
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, parameters):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param parameters: dict with all parameters of the generator;
+                           numpy arrays are allowed
+
+        :return: hash (hex string) of the parameters and the version
+        """
+        data = {'version': self.version}
+        for name, value in parameters.items():
+            if isinstance(value, numpy.ndarray):
+                value = value.tolist()
+            data[name] = value
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def load(self, key):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: (zeropoint, coordinates, image) or None if not cached;
+                 zeropoint is a tuple and coordinates and image are
+                 writable arrays (not shared with the cache)
+        """
+        path = os.path.join(self.directory, key)
+        try:
+            zeropoint, coordinates, image = (
+                numpy.load(os.path.join(path, filename))
+                for filename in self._entry_files)
+            # mark as recently used
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return tuple(float(value) for value in zeropoint), coordinates, image
+
+    def store(self, key, zeropoint, coordinates, image):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        store a result in the cache and remove old entries if necessary
+        """
+        path = os.path.join(self.directory, key)
+        if os.path.isdir(path):
+            return
+        # write to a temporary directory and rename it (atomic)
+        tmpdir = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        for filename, array in zip(
+                self._entry_files,
+                (numpy.asarray(zeropoint, dtype=float),
+                 numpy.asarray(coordinates), numpy.asarray(image))):
+            numpy.save(os.path.join(tmpdir, filename), array)
+        try:
+            os.rename(tmpdir, path)
+        except OSError:
+            # another process stored the same entry in the meantime
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        self._enforce_max_size()
+
+    def _enforce_max_size(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        remove least recently used entries until the cache is small enough
+        """
+        log = logging.getLogger('detloclcheck.checkerboard_image_cache')
+        entries = []
+        total_size = 0
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if entry.name.startswith('.') or not entry.is_dir():
+                    continue
+                try:
+                    size = sum(
+                        os.path.getsize(os.path.join(entry.path, filename))
+                        for filename in os.listdir(entry.path))
+                    entries.append((entry.stat().st_mtime, size, entry.path))
+                except FileNotFoundError:
+                    # removed by another process in the meantime
+                    continue
+                total_size += size
+        entries.sort()
+        while (total_size > self.max_size) and (len(entries) > 0):
+            _, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+            log.debug('removed "%s" from cache', path)
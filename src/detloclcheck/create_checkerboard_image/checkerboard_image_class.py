@@ -1,17 +1,18 @@
-# SPDX-FileCopyrightText: 2024 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2024-07-09
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024 Daniel Mohr
+:Copyright: (C) 2024, 2026 Daniel Mohr
 
 .. currentmodule::
    detloclcheck.create_checkerboard_image.checkerboard_image_class
 .. autofunction:: simpsons_rule
+.. autofunction:: transform_points
 .. autoclass:: CheckerboardImageClass
    :members:
    :private-members:
@@ -33,46 +34,64 @@
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
 import numpy
-import scipy.integrate
 
 
 def simpsons_rule(f, x1, x2, y1, y2):
     """
     :Author: Daniel Mohr
     :Email: daniel.mohr@dlr.de
-    :Date: 2016-04-17
+    :Date: 2016-04-17, 2026-10-19 (last change).
     :License: LGPL-3.0-or-later
 
     Integrate the function f over the area [x1,x2] x [y1,y2] by using
     Simpson's Rule.
+
+    The arguments can also be numpy arrays of equal shape, if f can handle
+    them. In this case the integrals over all areas are returned as array.
     """
     x12 = (x1+x2)/2.0
     y12 = (y1+y2)/2.0
-    s = numpy.zeros((9,), dtype=float)
-    s[0] = f(x1, y1)
-    s[1] = 4.0 * f(x12, y1)
-    s[2] = f(x2, y1)
-    s[3] = 4.0 * f(x1, y12)
-    s[4] = 16.0 * f(x12, y12)
-    s[5] = 4.0 * f(x2, y12)
-    s[6] = f(x1, y2)
-    s[7] = 4.0 * f(x12, y2)
-    s[8] = f(x2, y2)
+    s = numpy.array(
+        [f(x1, y1), 4.0 * f(x12, y1), f(x2, y1),
+         4.0 * f(x1, y12), 16.0 * f(x12, y12), 4.0 * f(x2, y12),
+         f(x1, y2), 4.0 * f(x12, y2), f(x2, y2)],
+        dtype=float)
     # s.sort() # this is not significant better
-    return (x2-x1) * (y2-y1) * s.sum() / 36.0
+    return (x2-x1) * (y2-y1) * s.sum(axis=0) / 36.0
+
+
+def transform_points(homography, x, y):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    apply the homography (3x3 matrix) to the points (x, y)
+
+    :param homography: 3x3 numpy array
+    :param x: scalar or numpy array with the first coordinates
+    :param y: scalar or numpy array with the second coordinates
+
+    :return: (x, y) of the transformed points
+    """
+    w = homography[2, 0] * x + homography[2, 1] * y + homography[2, 2]
+    return ((homography[0, 0] * x + homography[0, 1] * y +
+             homography[0, 2]) / w,
+            (homography[1, 0] * x + homography[1, 1] * y +
+             homography[1, 2]) / w)
 
 
 class CheckerboardImageClass():
     """
     :Author: Daniel Mohr
-    :Date: 2024-07-09
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
     """
     def __init__(self, size, zeropoint,
-                 integrate_method=0, transition_value=128):
+                 integrate_method=0, transition_value=128, homography=None):
         """
         :Author: Daniel Mohr
-        :Date: 2024-07-09
+        :Date: 2026-10-19
         :License: LGPL-3.0-or-later
 
         :param size: size of a checkerboard field
@@ -86,6 +105,11 @@ class CheckerboardImageClass():
                                  black areas. For a value of 255 the light
                                  areas in the image run out. For a value of
                                  0 the reverse effect is simulated.
+        :param homography: If not None, a 3x3 matrix mapping the plane of the
+                           checkerboard to the image (both in image indizes).
+                           This allows rotated or perspective views of the
+                           checkerboard. The zeropoint is given in the plane
+                           of the checkerboard.
 
         Example:
 
@@ -100,14 +124,25 @@ class CheckerboardImageClass():
         self.zeropoint = numpy.array(zeropoint)
         self.integrate_method = integrate_method
         self.transition_value = transition_value
+        self.homography = None
+        self._inverse_homography = None
+        if homography is not None:
+            self.homography = numpy.array(homography, dtype=float)
+            if self.homography.shape != (3, 3):
+                raise ValueError(
+                    f'homography has shape {self.homography.shape}, '
+                    'but (3, 3) is necessary')
+            self._inverse_homography = numpy.linalg.inv(self.homography)
 
     def value(self, x, y):
         """
         :Author: Daniel Mohr
-        :Date: 2024-07-09
+        :Date: 2026-10-19
         :License: LGPL-3.0-or-later
         """
         # pylint: disable=too-many-return-statements
+        if self._inverse_homography is not None:
+            x, y = transform_points(self._inverse_homography, x, y)
         xy = (x, y)
         v = (xy - self.zeropoint) / self.size
         if (-2 <= v[1]) and (v[1] <= -1) and (-3 <= v[0]) and (v[0] <= 2):
@@ -128,6 +163,39 @@ class CheckerboardImageClass():
             return 255
         return 0
 
+    def values(self, x, y):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        vectorized version of :meth:`value`
+
+        :param x: numpy array with the first image indizes
+        :param y: numpy array with the second image indizes (same shape as x)
+
+        :return: numpy array (dtype float) with the values at (x, y)
+        """
+        if self._inverse_homography is not None:
+            x, y = transform_points(self._inverse_homography, x, y)
+        v0 = (x - self.zeropoint[0]) / self.size
+        v1 = (y - self.zeropoint[1]) / self.size
+        # the first (short) bar of the L-shape marker
+        bar1 = (-2 <= v1) & (v1 <= -1) & (-3 <= v0) & (v0 <= 2)
+        white1 = bar1 & ((-5/3 <= v1) & (v1 <= -4/3) &
+                         (-8/3 <= v0) & (v0 <= 5/3))
+        # the second (long) bar of the L-shape marker
+        bar2 = ~bar1 & (-1 <= v1) & (v1 <= 2) & (-2 <= v0) & (v0 <= -1)
+        white2 = bar2 & ((-2/3 <= v1) & (v1 <= 5/3) &
+                         (-5/3 <= v0) & (v0 <= -4/3))
+        f0 = numpy.floor(v0)
+        f1 = numpy.floor(v1)
+        result = numpy.where((f0 + f1) % 2 == 0, 255.0, 0.0)
+        result[(f0 == v0) | (f1 == v1)] = self.transition_value
+        result[bar1 | bar2] = 0.0
+        result[white1 | white2] = 255.0
+        return result
+
     def __call__(self, x, y):
         """
         :Author: Daniel Mohr
@@ -142,7 +210,42 @@ class CheckerboardImageClass():
                 x - 0.5, x + 0.5,
                 y - 0.5, y + 0.5)
         if self.integrate_method == 2:  # elif
+            # only this slow method needs scipy
+            import scipy.integrate  # pylint: disable=import-outside-toplevel
             v, _ = scipy.integrate.nquad(
                 self.value, [[x - 0.5, x + 0.5], [y - 0.5, y + 0.5]])
             return v
         return None
+
+    def evaluate(self, x, y):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        vectorized version of :meth:`__call__`
+
+        For the integrate methods 0 and 1 the values of all pixels are
+        calculated in one pass. :func:`scipy.integrate.nquad` (integrate
+        method 2) cannot be vectorized and is called for every pixel.
+
+        :param x: numpy array with the first image indizes
+        :param y: numpy array with the second image indizes (same shape as x)
+
+        :return: numpy array (dtype float) with the values at (x, y)
+        """
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        if self.integrate_method == 0:
+            return self.values(x, y)
+        if self.integrate_method == 1:  # elif
+            return simpsons_rule(
+                self.values,
+                x - 0.5, x + 0.5,
+                y - 0.5, y + 0.5)
+        if self.integrate_method == 2:  # elif
+            result = numpy.zeros(x.shape, dtype=float)
+            for index in numpy.ndindex(x.shape):
+                result[index] = self(x[index], y[index])
+            return result
+        return None
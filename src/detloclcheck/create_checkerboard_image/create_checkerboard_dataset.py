@@ -0,0 +1,357 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule::
+   detloclcheck.create_checkerboard_image.create_checkerboard_dataset
+.. autofunction:: create_checkerboard_dataset
+.. autofunction:: expand_dataset_spec
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import importlib.metadata
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+
+import cv2
+import numpy
+
+from detloclcheck.batch.job_manifest import _read_records
+
+from .create_checkerboard_image import create_checkerboard_image
+
+# parameters of a single image and their default values
+DATASET_PARAMETERS = {
+    'm': 8,
+    'n': 8,
+    'size': 15.0,
+    'dx': 0.0,
+    'dy': 0.0,
+    'integrate_method': 0,
+    'transition_value': 128,
+    'scale': 1.0,
+    'angle': 0.0,
+    'perspective_x': 0.0,
+    'perspective_y': 0.0,
+    'blur': 0.0,
+    'noise': 0.0}
+_INTEGER_PARAMETERS = ('m', 'n', 'integrate_method', 'transition_value')
+
+
+def _rng(seed, index):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    random generator of the item index -- independent of the order in which
+    the items are generated
+    """
+    return numpy.random.default_rng([seed, index])
+
+
+def _convert(name, value):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    if name in _INTEGER_PARAMETERS:
+        return int(value)
+    return float(value)
+
+
+def _sample(name, value, rng):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    if isinstance(value, dict):
+        if set(value.keys()) == {'uniform'}:
+            result = float(rng.uniform(value['uniform'][0],
+                                       value['uniform'][1]))
+        elif set(value.keys()) == {'randint'}:
+            result = int(rng.integers(value['randint'][0],
+                                      value['randint'][1], endpoint=True))
+        else:
+            raise ValueError(
+                f'do not understand random specification of "{name}": '
+                f'{value}')
+    elif isinstance(value, list):
+        result = value[int(rng.integers(len(value)))]
+    else:
+        result = value
+    return _convert(name, result)
+
+
+def expand_dataset_spec(spec, seed=0):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    create the list of parameters of all images described by spec
+
+    :param spec: dict with exactly one of the keys 'grid' or 'random'.
+                 The value of 'grid' is a dict mapping parameter names to
+                 lists of values; all combinations are created.
+                 The value of 'random' is a dict with the key 'count'
+                 (number of images) and parameter names mapping to a
+                 constant, a list of values to choose from,
+                 {'uniform': [low, high]} or {'randint': [low, high]}.
+                 Possible parameters and their defaults are given in
+                 :data:`DATASET_PARAMETERS`. 'dx' and 'dy' move the
+                 zeropoint from the middle of the image, 'angle' (degrees)
+                 and 'perspective_x'/'perspective_y' define a homography,
+                 'blur' is the sigma of a gaussian blur and 'noise' the
+                 standard deviation of additive gaussian noise.
+    :param seed: seed for the random sampling
+
+    :return: list of dicts with the parameters of each image
+    """
+    if (len(spec) != 1) or (next(iter(spec)) not in ('grid', 'random')):
+        raise ValueError(
+            "dataset spec needs exactly one of the keys 'grid' or 'random'")
+    kind, fields = next(iter(spec.items()))
+    unknown = set(fields) - set(DATASET_PARAMETERS) - {'count'}
+    if unknown:
+        raise ValueError(
+            f'unknown parameters in dataset spec: {sorted(unknown)}')
+    items = []
+    if kind == 'grid':
+        names = list(fields.keys())
+        for values in itertools.product(*(fields[name] for name in names)):
+            parameters = dict(DATASET_PARAMETERS)
+            for name, value in zip(names, values):
+                parameters[name] = _convert(name, value)
+            items.append(parameters)
+    else:
+        for index in range(int(fields.get('count', 1))):
+            rng = _rng(seed, index)
+            parameters = dict(DATASET_PARAMETERS)
+            # sample in a fixed order to be reproducible
+            for name in DATASET_PARAMETERS:
+                if name in fields:
+                    parameters[name] = _sample(name, fields[name], rng)
+            items.append(parameters)
+    return items
+
+
+def _homography(parameters, image_size):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    rotation and perspective distortion around the middle of the image
+    """
+    if ((parameters['angle'] == 0) and (parameters['perspective_x'] == 0) and
+            (parameters['perspective_y'] == 0)):
+        return None
+    center = (image_size[1] / 2 - 0.5, image_size[0] / 2 - 0.5)
+    rotation = numpy.vstack((
+        cv2.getRotationMatrix2D(center, parameters['angle'], 1), (0, 0, 1)))
+    perspective = numpy.eye(3)
+    perspective[2, 0] = parameters['perspective_x']
+    perspective[2, 1] = parameters['perspective_y']
+    shift = numpy.eye(3)
+    shift[0:2, 2] = center
+    return shift @ perspective @ numpy.linalg.inv(shift) @ rotation
+
+
+def _create_item(item):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    create one image of the dataset (runs in a worker process)
+    """
+    index, parameters, seed, outdir = item
+    image_size = (int(numpy.ceil(parameters['m'] * parameters['size'])),
+                  int(numpy.ceil(parameters['n'] * parameters['size'])))
+    zeropoint = (image_size[1] / 2 - 0.5 + parameters['dx'],
+                 image_size[0] / 2 - 0.5 + parameters['dy'])
+    zeropoint, coordinates, image = create_checkerboard_image(
+        parameters['m'], parameters['n'], parameters['size'],
+        zeropoint=zeropoint,
+        integrate_method=parameters['integrate_method'],
+        transition_value=parameters['transition_value'],
+        scale=parameters['scale'],
+        homography=_homography(parameters, image_size))
+    if parameters['blur'] > 0:
+        image = cv2.GaussianBlur(image, (0, 0), parameters['blur'])
+    if parameters['noise'] > 0:
+        # different stream than the parameter sampling of the same index
+        rng = numpy.random.default_rng([seed, index, 1])
+        image = numpy.clip(
+            image + rng.normal(0, parameters['noise'], image.shape),
+            0, 255).astype(numpy.uint8)
+    filename = f'image_{index:06d}.png'
+    cv2.imwrite(os.path.join(outdir, filename), image)
+    return {'index': index,
+            'file': filename,
+            'parameters': parameters,
+            'zeropoint': [float(value) for value in zeropoint],
+            'coordinates': numpy.asarray(
+                coordinates, dtype=float).reshape((-1, 2)).tolist()}
+
+
+def _read_progress(progress_filename, header):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    read the records of already created images
+
+    :return: (records, lines) with the records by index and the lines of
+             the progress file (empty for a new progress file)
+    """
+    if not os.path.isfile(progress_filename):
+        return {}, []
+    with open(progress_filename, 'r', encoding='utf8') as fd:
+        lines = fd.readlines()
+    if len(list(_read_records(lines[:1]))) == 0:
+        # empty or interrupted while writing the header: a new file
+        return {}, []
+    if json.loads(lines[0]) != header:
+        raise ValueError(
+            f'"{progress_filename}" belongs to a different dataset '
+            '(spec or seed changed)')
+    # an interrupted write leaves an incomplete last line, which is skipped
+    return ({record['index']: record for record in _read_records(lines[1:])},
+            lines)
+
+
+def create_checkerboard_dataset(
+        spec, outdir, *, seed=0, processes=None, output_format=('json',),
+        json_indent=None):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    create a dataset of artificial checkerboard images in parallel
+
+    :param spec: description of the images, see :func:`expand_dataset_spec`
+    :param outdir: directory to store the images and the results
+    :param seed: seed for random sampling and noise; the output is
+                 deterministic for a given spec and seed
+    :param processes: number of worker processes, None means all cpus
+    :param output_format: list of formats for the consolidated ground truth
+                          ('json' and/or 'mat')
+    :param json_indent: indent in the json output
+
+    :return: the manifest (dict)
+
+    The directory will contain the images (image_000000.png, ...), the
+    manifest 'manifest.json' and the consolidated ground truth
+    'ground_truth.json' and/or 'ground_truth.mat'. The ground truth contains
+    the concatenated 'coordinates' of all images, the 'image_index' of every
+    coordinate, the 'zeropoints' and the 'files'.
+
+    Finished images are logged to 'progress.jsonl'. An interrupted run
+    can be resumed by calling this function with the same parameters;
+    only missing images are created.
+
+    Example:
+
+    >>> from detloclcheck.create_checkerboard_image import \\
+    ...     create_checkerboard_dataset
+    >>> manifest = create_checkerboard_dataset(
+    ...     {'random': {'count': 10, 'size': {'uniform': [15, 25]},
+    ...                 'angle': {'uniform': [-10, 10]}, 'noise': [0, 3]}},
+    ...     'dataset', seed=42)
+    """
+    # pylint: disable=too-many-locals
+    log = logging.getLogger('detloclcheck.create_checkerboard_dataset')
+    items = expand_dataset_spec(spec, seed)
+    os.makedirs(outdir, exist_ok=True)
+    version = importlib.metadata.version(__package__.split('.', maxsplit=1)[0])
+    # json round trip to compare with the stored header
+    header = json.loads(json.dumps({'spec': spec, 'seed': seed}))
+    progress_filename = os.path.join(outdir, 'progress.jsonl')
+    records, lines = _read_progress(progress_filename, header)
+    todo = [(index, parameters, seed, outdir)
+            for index, parameters in enumerate(items)
+            if not ((index in records) and os.path.isfile(
+                os.path.join(outdir, records[index]['file'])))]
+    log.info('create %i of %i images (%i already exist)',
+             len(todo), len(items), len(items) - len(todo))
+    with open(progress_filename, 'a' if len(lines) > 0 else 'w',
+              encoding='utf8') as fd:
+        if len(lines) == 0:
+            fd.write(json.dumps(header) + '\n')
+            fd.flush()
+            os.fsync(fd.fileno())
+        elif not lines[-1].endswith('\n'):
+            # terminate an incomplete last line of an interrupted run
+            fd.write('\n')
+        if len(todo) > 0:
+            with multiprocessing.Pool(processes) as pool:
+                for record in pool.imap_unordered(_create_item, todo):
+                    records[record['index']] = record
+                    fd.write(json.dumps(record) + '\n')
+                    fd.flush()
+    records = [records[index] for index in range(len(items))]
+    manifest = {
+        'version': version,
+        'seed': seed,
+        'spec': spec,
+        'items': [{'index': record['index'],
+                   'file': record['file'],
+                   'parameters': record['parameters'],
+                   'zeropoint': record['zeropoint'],
+                   'number_of_coordinates': len(record['coordinates'])}
+                  for record in records]}
+    with open(os.path.join(outdir, 'manifest.json'), 'w',
+              encoding='utf8') as fd:
+        json.dump(manifest, fd, indent=json_indent)
+    ground_truth = {
+        'files': [record['file'] for record in records],
+        'zeropoints': [record['zeropoint'] for record in records],
+        'image_index': [record['index'] for record in records
+                        for _ in record['coordinates']],
+        'coordinates': [coordinate for record in records
+                        for coordinate in record['coordinates']]}
+    for fmt in output_format:
+        output_filename = os.path.join(outdir, 'ground_truth.' + fmt)
+        if fmt == 'json':
+            with open(output_filename, 'w', encoding='utf8') as fd:
+                json.dump(ground_truth, fd, indent=json_indent)
+        elif fmt == 'mat':
+            import scipy.io  # pylint: disable=import-outside-toplevel
+            scipy.io.savemat(
+                output_filename,
+                {'files': ground_truth['files'],
+                 'zeropoints': numpy.array(ground_truth['zeropoints']),
+                 'image_index': numpy.array(ground_truth['image_index']),
+                 'coordinates': numpy.array(
+                     ground_truth['coordinates']).reshape((-1, 2))})
+        log.info('wrote ground truth to "%s"', output_filename)
+    return manifest
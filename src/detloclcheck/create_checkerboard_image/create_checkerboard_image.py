@@ -1,13 +1,13 @@
-# SPDX-FileCopyrightText: 2024-2025 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-02-11
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024, 2025 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
@@ -24,37 +24,64 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
+import os
+
 import cv2
 import numpy
 
-from .checkerboard_image_class import CheckerboardImageClass
+from .checkerboard_image_cache import CheckerboardImageCache
+from .checkerboard_image_class import (CheckerboardImageClass,
+                                       transform_points)
+
+
+def _swap_axes(homography):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    convert a homography between OpenCV coordinates (x, y) and
+    image indizes (row, column) -- this works in both directions
+    """
+    swap = numpy.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]], dtype=float)
+    return swap @ numpy.array(homography, dtype=float) @ swap
 
 
 def _create_image(image_size, size, zeropoint,
-                  integrate_method, transition_value):
+                  integrate_method, transition_value, *, homography=None):
     """
     :Author: Daniel Mohr
-    :Date: 2025-01-31
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
+
+    The image is calculated in one vectorized pass over all pixels
+    (except for integrate_method 2).
     """
-    image = numpy.zeros(
-        image_size,
-        dtype=numpy.uint8)
+    if homography is not None:
+        homography = _swap_axes(homography)
     checkerboard_image = CheckerboardImageClass(
         size, (zeropoint[1], zeropoint[0]),
-        integrate_method, transition_value)
-    for i in range(image_size[0]):
-        for j in range(image_size[1]):
-            image[i, j] = int(checkerboard_image(i, j))
-    return image
+        integrate_method, transition_value, homography)
+    i, j = numpy.meshgrid(
+        numpy.arange(image_size[0]), numpy.arange(image_size[1]),
+        indexing='ij')
+    return checkerboard_image.evaluate(i, j).astype(numpy.uint8)
 
 
-def _create_coordinates(image_size, size, zeropoint):
+def _create_coordinates(image_size, size, zeropoint, homography=None):
     """
     :Author: Daniel Mohr
-    :Date: 2025-01-31
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
+
+    :param homography: If not None, the 3x3 matrix mapping the plane of the
+                       checkerboard to the image (OpenCV coordinates).
+                       The coordinates are transformed by this homography
+                       and only the ones inside the image are returned.
     """
+    if homography is not None:
+        return _create_transformed_coordinates(
+            image_size, size, zeropoint, homography)
     coordinates = []
     x0 = int(numpy.ceil((0 - zeropoint[0]) / size))
     x1 = int(numpy.floor((image_size[0] - zeropoint[0]) / size))
@@ -74,12 +101,45 @@ def _create_coordinates(image_size, size, zeropoint):
     return coordinates
 
 
+def _create_transformed_coordinates(image_size, size, zeropoint, homography):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    homography = numpy.array(homography, dtype=float)
+    # the part of the plane of the checkerboard visible in the image
+    plane_x, plane_y = transform_points(
+        numpy.linalg.inv(homography),
+        numpy.array([0, image_size[1], 0, image_size[1]], dtype=float),
+        numpy.array([0, 0, image_size[0], image_size[0]], dtype=float))
+    x0 = int(numpy.floor((plane_x.min() - zeropoint[0]) / size))
+    x1 = int(numpy.ceil((plane_x.max() - zeropoint[0]) / size))
+    y0 = int(numpy.floor((plane_y.min() - zeropoint[1]) / size))
+    y1 = int(numpy.ceil((plane_y.max() - zeropoint[1]) / size))
+    coordinates = []
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            if (x, y) not in [(-2, -2), (-1, -2), (0, -2), (1, -2),
+                              (-2, -1), (-1, -1), (0, -1), (1, -1),
+                              (-2, 0), (-1, 0),
+                              (-2, 1), (-1, 1)]:
+                xcoo, ycoo = transform_points(
+                    homography,
+                    zeropoint[0] + x * size, zeropoint[1] + y * size)
+                if ((3 < xcoo) and (3 + xcoo < image_size[1]) and
+                        (3 < ycoo) and (3 + ycoo < image_size[0])):
+                    coordinates.append((xcoo, ycoo))
+    return coordinates
+
+
 def create_checkerboard_image(
         width, height, size, *,
-        zeropoint=None, integrate_method=0, transition_value=128, scale=1.0):
+        zeropoint=None, integrate_method=0, transition_value=128, scale=1.0,
+        homography=None, cache=None):
     """
     :Author: Daniel Mohr
-    :Date: 2025-02-24
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
 
     :param width: number of checkerboard fields in x direction
@@ -96,6 +156,20 @@ def create_checkerboard_image(
                              areas in the image run out. For a value of
                              0 the reverse effect is simulated.
     :param scale: scaling factor
+    :param homography: If not None, a 3x3 matrix (OpenCV coordinates) mapping
+                       the plane of the checkerboard to the image, e. g. to
+                       simulate a rotated or perspective view of the
+                       checkerboard. The inverse mapped pixels are evaluated
+                       directly (no additional warping of the image).
+                       The zeropoint is given in the plane of the
+                       checkerboard and the returned zeropoint and
+                       coordinates are transformed to the image.
+    :param cache: If not None, a directory or an instance of
+                  :class:`.checkerboard_image_cache.CheckerboardImageCache`
+                  to cache the result on disk. If None, the directory given
+                  by the environment variable DETLOCLCHECK_CACHE_DIR is used
+                  (if set). Cached results are returned as writable
+                  copies, like uncached results.
 
     :return: (zeropoint, coordinates, image)
 
@@ -138,15 +212,48 @@ def create_checkerboard_image(
     ...     coordinate_system[:,0,0], coordinate_system[:,0,1],
     ...     'g3', markersize=20)
     >>> matplotlib.pyplot.show()
+
+    Example 4:
+
+    >>> import cv2
+    >>> import numpy
+    >>> from detloclcheck.create_checkerboard_image import \
+    ...     create_checkerboard_image
+    >>> homography = numpy.vstack((
+    ...     cv2.getRotationMatrix2D((59.5, 59.5), 30, 1), (0, 0, 1)))
+    >>> zeropoint, coordinates, image = create_checkerboard_image(
+    ...     8, 8, 15, homography=homography)
     """
+    # pylint: disable=too-many-locals
+    if cache is None:
+        cache = os.environ.get('DETLOCLCHECK_CACHE_DIR')
+    if cache is not None:
+        if not isinstance(cache, CheckerboardImageCache):
+            cache = CheckerboardImageCache(cache)
+        key = cache.key(
+            {'width': width, 'height': height, 'size': size,
+             'zeropoint': zeropoint, 'integrate_method': integrate_method,
+             'transition_value': transition_value, 'scale': scale,
+             'homography': homography})
+        result = cache.load(key)
+        if result is not None:
+            return result
     image_size = (int(numpy.ceil(width*size)),
                   int(numpy.ceil(height*size)))
     if zeropoint is None:
         zeropoint = (image_size[1]/2 - 0.5, image_size[0]/2 - 0.5)
     image = _create_image(image_size, size, zeropoint,
-                          integrate_method, transition_value)
-    coordinates = _create_coordinates(image_size, size, zeropoint)
-    return zeropoint, numpy.array(coordinates), cv2.resize(
+                          integrate_method, transition_value,
+                          homography=homography)
+    coordinates = _create_coordinates(
+        image_size, size, zeropoint, homography)
+    if homography is not None:
+        zeropoint = tuple(float(value) for value in transform_points(
+            numpy.array(homography, dtype=float), zeropoint[0], zeropoint[1]))
+    result = (zeropoint, numpy.array(coordinates), cv2.resize(
         image,
         (int(scale*image.shape[1]), int(scale*image.shape[0])),
-        interpolation=cv2.INTER_AREA)
+        interpolation=cv2.INTER_AREA))
+    if cache is not None:
+        cache.store(key, *result)
+    return result
@@ -29,7 +29,7 @@ import cv2
 import numpy
 from detloclcheck.tools import (array2image, calculate_square_distances,
                                 draw_coordinate_system, filter_blurry_corners,
-                                normed_tm_ccorr_normed)
+                                normed_tm_ccorr_normed, StageTimings)
 
 
 def _cal_coordinate_system(coordinates, zeropoint, axis1, axis2):
@@ -103,7 +103,8 @@ def _find_better_axis(
 
 def create_coordinate_system(
         image, coordinates, max_distance_factor_range, *,
-        min_sharpness=1000, draw_images=(False, False, False)):
+        min_sharpness=1000, draw_images=(False, False, False),
+        timings=None):
     """
     :Author: Daniel Mohr
     :Email: daniel.mohr@uni-greifswald.de
@@ -113,6 +114,11 @@ def create_coordinate_system(
     :param coordinates: numpy array with the coordinates of the corners;
                         could be returned from
                         :func:`detloclcheck.find_checkerboardfind_checkerboard`
+    :param timings: None or an instance of
+                    :class:`detloclcheck.tools.StageTimings` recording the
+                    stages axis_search, axis_refinement, lattice_assignment,
+                    marker_search and lattice_sharpness and the counts
+                    max_distance_factors and zeropoint_attempts
 
     :return: (coordinate_system, zeropoint, axis1, axis2) on success,
              otherwise (None, error_code, None, None).
@@ -120,6 +126,9 @@ def create_coordinate_system(
     """
     # pylint: disable=too-many-locals, too-many-branches, too-many-statements
     log = logging.getLogger('detloclcheck.create_coordinate_system')
+    if timings is None:
+        timings = StageTimings(enabled=False)
+    start = timings.start()
     centerpoint = 0.5 * numpy.array(image.shape)
     n = coordinates.shape[0]
     distances = \
@@ -127,6 +136,7 @@ def create_coordinate_system(
         (coordinates[:, :, 1].reshape((n,)) - centerpoint[0])**2
     axis1 = None
     for max_distance_factor in max_distance_factor_range:
+        timings.count('max_distance_factors')
         rel_distance_interval = (
             1/max_distance_factor, max_distance_factor)
         tmp_distances = distances.copy()
@@ -168,6 +178,7 @@ def create_coordinate_system(
             tmp_distances[index] = numpy.inf
         if axis1 is not None:
             break
+    start = timings.stop('axis_search', start)
     if axis1 is None:
         log.error('ERROR: no axis found')
         return None, 2, None, None
@@ -184,6 +195,7 @@ def create_coordinate_system(
               axis1, numpy.linalg.norm(axis1),
               axis2, numpy.linalg.norm(axis2))
     while True:
+        timings.count('zeropoint_attempts')
         # now we have the other axis
         # we know:
         # (0,0) <-> zeropoint <-> coordinates[k, :, :]
@@ -230,6 +242,7 @@ def create_coordinate_system(
             if zeropoint_search_index >= coordinates.shape[0]:
                 # we have tried all corners as zeropoint
                 log.error('ERROR: no good axis found (tried all corners)')
+                timings.stop('axis_refinement', start)
                 return None, 3, None, None
             if ((zeropoint + axis1 <= 0).any() or
                     (zeropoint + axis1 >= image.shape).any()):
@@ -239,6 +252,7 @@ def create_coordinate_system(
             enhanced_axis2 = 0
         else:
             break
+    start = timings.stop('axis_refinement', start)
     coordinate_system = numpy.zeros((coordinates.shape[0], 2, 2))
     # coordinate_system[:, 0, :] are the pixel coordinates
     # coordinate_system[:, 1, :] are the coordinates in an artificial system
@@ -271,6 +285,7 @@ def create_coordinate_system(
         assigned_indizes.append(unassigned_index)
         unassigned_indizes.remove(unassigned_index)
         distances[:, unassigned_index] = numpy.inf
+    start = timings.stop('lattice_assignment', start)
     if draw_images[0]:
         # draw coordinate system
         t_coordinate_system = coordinate_system.copy()
@@ -304,6 +319,7 @@ def create_coordinate_system(
     if ((coordinatesmap.shape[0] < markertemplate.shape[0]) or
             (coordinatesmap.shape[1] < markertemplate.shape[1])):
         # coordinatesmap is too small!
+        timings.stop('marker_search', start)
         return None, 6, None, None
     result = normed_tm_ccorr_normed(coordinatesmap, markertemplate)
     if result.max() != 1:
@@ -341,6 +357,7 @@ def create_coordinate_system(
         else:
             # this should not happen
             log.error('ERROR')
+            timings.stop('marker_search', start)
             return None, 4, None, None
         log.debug('marker found at (%i,%i) with %s', j, i, markerdirection)
         # adapt coordinate system
@@ -435,7 +452,9 @@ def create_coordinate_system(
     else:
         # no marker found
         log.error('ERROR: no marker found')
+        timings.stop('marker_search', start)
         return (None, 5, None, None)
+    start = timings.stop('marker_search', start)
     log.debug('final axis: |%s| = %f, |%s| = %f',
               axis1, numpy.linalg.norm(axis1), axis2, numpy.linalg.norm(axis2))
     if draw_images[1]:
@@ -449,6 +468,7 @@ def create_coordinate_system(
     size = 0.4 * (numpy.linalg.norm(axis1) + numpy.linalg.norm(axis2))
     coordinate_system = filter_blurry_corners(
         image, coordinate_system, size, min_sharpness)
+    timings.stop('lattice_sharpness', start)
     log.debug('keep %i good corners', coordinate_system.shape[0])
     if draw_images[2]:
         cv2.imwrite(
@@ -1,4 +1,4 @@
-# SPDX-FileCopyrightText: 2024 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
@@ -22,13 +22,41 @@ functions
 ---------
 .. currentmodule:: detloclcheck.detect_localize_checkerboard
 .. autofunction:: detect_localize_checkerboard
+.. autofunction:: detect_localize_checkerboard_async
+.. autofunction:: detect_localize_checkerboard_batch
+.. autofunction:: detect_localize_checkerboard_file
+.. autofunction:: detect_localize_checkerboard_video
+.. autofunction:: prior_from_result
+
+classes
+-------
+.. autoclass:: BatchResult
+.. autoclass:: FrameDetector
+.. autoclass:: OpticalFlowTracker
+
+data
+----
+.. autodata:: DEFAULT_FALLBACK_LADDER
+
+submodules
+----------
+.. automodule::
+   detloclcheck.detect_localize_checkerboard.detection_result_cache
+.. automodule::
+   detloclcheck.detect_localize_checkerboard.detection_session
+.. automodule::
+   detloclcheck.detect_localize_checkerboard.frame_detector
+.. automodule::
+   detloclcheck.detect_localize_checkerboard.optical_flow_tracker
+.. automodule::
+   detloclcheck.detect_localize_checkerboard.tracking_prior
 
 copyright + license
 -------------------
 :Author: Daniel Mohr
-:Date: 2024-07-10
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
@@ -45,6 +73,31 @@ copyright + license
 # You should have received a copy of the GNU Lesser General Public License
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
-from .detect_localize_checkerboard import detect_localize_checkerboard
+from .detect_localize_checkerboard import (
+    DEFAULT_FALLBACK_LADDER, detect_localize_checkerboard)
+from .detect_localize_checkerboard_async import \
+    detect_localize_checkerboard_async
+from .detect_localize_checkerboard_batch import (
+    BatchResult, detect_localize_checkerboard_batch)
+from .detect_localize_checkerboard_file import \
+    detect_localize_checkerboard_file
+from .detect_localize_checkerboard_video import \
+    detect_localize_checkerboard_video
+from .detection_result_cache import DetectionResultCache
+from .detection_session import DetectionSession
+from .frame_detector import FrameDetector
+from .optical_flow_tracker import OpticalFlowTracker
+from .tracking_prior import prior_from_result
 
-__all__ = ["detect_localize_checkerboard"]
+__all__ = ["BatchResult",
+           "DEFAULT_FALLBACK_LADDER",
+           "detect_localize_checkerboard",
+           "detect_localize_checkerboard_async",
+           "detect_localize_checkerboard_batch",
+           "detect_localize_checkerboard_file",
+           "detect_localize_checkerboard_video",
+           "DetectionResultCache",
+           "DetectionSession",
+           "FrameDetector",
+           "OpticalFlowTracker",
+           "prior_from_result"]
@@ -1,4 +1,4 @@
-# SPDX-FileCopyrightText: 2024-2025 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
@@ -10,9 +10,9 @@
               L-shape marker using template matching.
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-02-24
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024, 2025 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
@@ -29,11 +29,25 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
+import functools
 import logging
+import time
 
-from detloclcheck.create_coordinate_system import create_coordinate_system
-from detloclcheck.find_checkerboard import find_checkerboard
-from detloclcheck.tools import filter_blurry_corners
+from .detection_session import DetectionSession
+from .tracking_prior import (
+    _prior_angles, _prior_roi, _shift_result, _valid_tracked_result)
+
+#: rungs for the fallback of :func:`detect_localize_checkerboard`, which
+#: loosen hit_bound, min_sharpness and max_distance_factor_range step by step
+DEFAULT_FALLBACK_LADDER = (
+    {'hit_bound': 0.9},
+    {'hit_bound': 0.9, 'min_sharpness': (50, 250, 500)},
+    {'hit_bound': 0.85, 'min_sharpness': (25, 100, 250),
+     'max_distance_factor_range': (
+         1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2., 2.5, 3.)})
+
+# error codes, which can be caused by too strict parameters
+_RECOVERABLE_ERROR_CODES = (1, 2, 3, 5, 7)
 
 
 def detect_localize_checkerboard(
@@ -41,10 +55,11 @@ def detect_localize_checkerboard(
         hit_bound=0.93, min_sharpness=(100, 500, 1000), run_parallel=False,
         max_distance_factor_range=(
             1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.),
-        log=None):
+        log=None, cache=None, fallback=None, report=None, timings=None,
+        prior=None):
     """
     :Author: Daniel Mohr
-    :Date: 2025-02-24
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
 
     Detect and localize a checkerboard in an image.
@@ -61,16 +76,60 @@ def detect_localize_checkerboard(
     :param run_parallel: whether to run the detection in parallel
     :param max_distance_factor_range: the maximum distance factor range
     :param log: a logger instance
+    :param cache: None or an instance of
+                  :class:`.detection_result_cache.DetectionResultCache`;
+                  if the same image was already handled with the same
+                  parameters, the cached result is returned (also with
+                  a prior); only results of the full search are stored,
+                  a result of the search restricted by the prior is not
+    :param fallback: None or a sequence of rungs; a rung is a dict with
+                     new values for some of hit_bound, min_sharpness and
+                     max_distance_factor_range (e. g.
+                     :data:`DEFAULT_FALLBACK_LADDER`). On the error codes
+                     1, 2, 3, 5 and 7 the next rung is tried. The
+                     template matching and all stages not affected by the
+                     changed values are reused.
+    :param report: None or a dict, which is filled with "cached" (True if
+                   the result is from the cache) and otherwise with "rung"
+                   (index of the successful rung, 0 for the given
+                   parameters, None on failure), "parameters" (of the last
+                   tried rung), "attempts" (list of dicts with "rung",
+                   "error_code" and "seconds") and "counts" (number of
+                   computations of every stage, see
+                   :class:`.detection_session.DetectionSession`)
+    :param timings: None or an instance of
+                    :class:`detloclcheck.tools.StageTimings` recording the
+                    wall and cpu time of the stages template_matching,
+                    peaks, peak_sharpness, corner_subpix, corner_sharpness,
+                    coordinate_system (with the sub-stages axis_search,
+                    axis_refinement, lattice_assignment and marker_search)
+                    and lattice_sharpness and the counts peaks,
+                    sharp_peaks, corners, max_distance_factors,
+                    zeropoint_attempts, rungs and cached_results; with a
+                    trace also the tasks of the process pools are traced;
+                    with a prior also prior_fallbacks
+    :param prior: None or a prior (e. g. of the previous frame of a video)
+                  as from
+                  :func:`.tracking_prior.prior_from_result`; then first
+                  only the padded bounding box of the prior is searched
+                  with the cross size of the prior and with the angles
+                  near to the axes of the prior. If this fails or the
+                  result does not fit to the prior (too few corners or
+                  changed lengths of the axes), the full search is done.
+                  The report gets "prior" ("tracked" or "full").
 
     :return: (coordinate_system, zeropoint, axis1, axis2) on success,
              otherwise (None, error_code, None, None).
              possible error codes: 1, 2, 3, 4, 5, 6, 7
     Notes:
-    This function uses :func:`detloclcheck.find_checkerboard.find_checkerboard`
-    to detect the checkerboard and then
-    :func:`detloclcheck.tools.filter_blurry_corners`
-    to filter out blurry corners. Finally, :func:`create_coordinate_system`
-    is used to obtain the world coordinates.
+    This function detects the checkerboard like
+    :func:`detloclcheck.find_checkerboard.find_checkerboard` and then
+    filters out blurry corners like
+    :func:`detloclcheck.tools.filter_blurry_corners`.
+    Finally, :func:`create_coordinate_system` is used to obtain the world
+    coordinates. To retry with other parameters without repeating the
+    template matching use
+    :class:`.detection_session.DetectionSession`.
 
     Example 1:
 
@@ -103,29 +162,176 @@ def detect_localize_checkerboard(
     ...     'r1', markersize=20)
     >>> matplotlib.pyplot.show()
     """
+    # pylint: disable=too-many-arguments
     if log is None:
         log = logging.getLogger('detloclcheck')
-    coordinates = find_checkerboard(
-        image,
-        crosssizes=crosssizes,
-        angles=angles,
-        hit_bound=hit_bound,
-        min_sharpness=min_sharpness[0],
-        run_parallel=run_parallel)
-    if coordinates is None:
-        log.error('ERROR: no inner corners detected')
-        return None, 1, None, None
-    # filter blurry corners (2)
-    coordinates = filter_blurry_corners(
-        image, coordinates, crosssizes[0], min_sharpness[1])
-    if coordinates.shape[0] < 24:
-        log.error(
-            'ERROR: only %i corners detected, '
-            'but we need at least 24 for marker detection',
-            coordinates.shape[0])
-        return None, 7, None, None
-    log.debug('go on with %i corners', coordinates.shape[0])
-    coordinate_system, zeropoint, axis1, axis2 = create_coordinate_system(
-        image, coordinates, max_distance_factor_range,
-        min_sharpness=min_sharpness[2])
-    return coordinate_system, zeropoint, axis1, axis2
+    return _run_steps(_detection_steps(
+        image, crosssizes, angles, hit_bound=hit_bound,
+        min_sharpness=min_sharpness, run_parallel=run_parallel,
+        max_distance_factor_range=max_distance_factor_range, log=log,
+        cache=cache, fallback=fallback, report=report, timings=timings,
+        prior=prior))
+
+
+def _run_steps(steps):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    run the steps of :func:`_detection_steps` one after the other
+
+    :return: the result of the steps
+    """
+    value = None
+    try:
+        while True:
+            value = steps.send(value)()
+    except StopIteration as stop:
+        return stop.value
+
+
+def _detection_steps(image, crosssizes, angles, *, cache, **kwargs):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    steps of :func:`detect_localize_checkerboard`
+
+    This generator yields callables without arguments (the stages of the
+    detection and the access to the cache) and gets their results sent
+    back. Therefore the caller decides where a step runs, e. g. directly
+    (:func:`_run_steps`) or in an executor
+    (:func:`.detect_localize_checkerboard_async`).
+
+    :return: (coordinate_system, zeropoint, axis1, axis2) on success,
+             otherwise (None, error_code, None, None)
+    """
+    if cache is None:
+        result, _ = yield from _prior_steps(
+            image, crosssizes, angles, **kwargs)
+        return result
+    parameters = {
+        'crosssizes': crosssizes, 'angles': angles,
+        'hit_bound': kwargs['hit_bound'],
+        'min_sharpness': kwargs['min_sharpness'],
+        'max_distance_factor_range': kwargs['max_distance_factor_range']}
+    if kwargs['fallback'] is not None:
+        parameters['fallback'] = kwargs['fallback']
+    # without the prior: a cached result is of the full search
+    key = yield functools.partial(cache.key, image, parameters)
+    result = yield functools.partial(cache.load, key)
+    if result is not None:
+        kwargs['log'].debug('use cached result %s', key)
+        if kwargs['report'] is not None:
+            kwargs['report']['cached'] = True
+        if kwargs['timings'] is not None:
+            kwargs['timings'].count('cached_results')
+        return result
+    result, tracked = yield from _prior_steps(
+        image, crosssizes, angles, **kwargs)
+    if not tracked:
+        # the result of the restricted search depends on the prior
+        yield functools.partial(cache.store, key, result)
+    return result
+
+
+def _prior_steps(image, crosssizes, angles, *, prior, **kwargs):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    steps of :func:`detect_localize_checkerboard` without the cache, see
+    :func:`_detection_steps`
+
+    :return: (result, True if the result of the search restricted by the
+             prior is used)
+    """
+    if prior is None:
+        result = yield from _session_steps(
+            image, crosssizes, angles, **kwargs)
+        return result, False
+    x0, y0, x1, y1 = _prior_roi(prior, image.shape, crosssizes)
+    tracked_report = {}
+    result = yield from _session_steps(
+        image[y0:y1, x0:x1],
+        (prior['crosssize'],) if 'crosssize' in prior else crosssizes,
+        _prior_angles(prior, angles),
+        **dict(kwargs, fallback=None, report=tracked_report))
+    if _valid_tracked_result(result, prior):
+        if kwargs['report'] is not None:
+            kwargs['report'].update(tracked_report, prior='tracked')
+        return _shift_result(result, (x0, y0)), True
+    kwargs['log'].info('tracking in region (%i, %i, %i, %i) failed, '
+                       'use full search', x0, y0, x1, y1)
+    if kwargs['timings'] is not None:
+        kwargs['timings'].count('prior_fallbacks')
+    if kwargs['report'] is not None:
+        kwargs['report']['prior'] = 'full'
+    result = yield from _session_steps(image, crosssizes, angles, **kwargs)
+    return result, False
+
+
+def _session_steps(
+        image, crosssizes, angles, *, hit_bound, min_sharpness, run_parallel,
+        max_distance_factor_range, log, fallback, report, timings):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    steps of the detection with the given parameters and the rungs of the
+    fallback in one :class:`.detection_session.DetectionSession`, see
+    :func:`_detection_steps`
+    """
+    # pylint: disable=too-many-arguments
+    session = DetectionSession(
+        image, crosssizes, angles, run_parallel=run_parallel, log=log,
+        timings=timings)
+    rungs = [{}]
+    if fallback is not None:
+        rungs += list(fallback)
+    return (yield from _rung_steps(
+        session,
+        [dict({'hit_bound': hit_bound, 'min_sharpness': min_sharpness,
+               'max_distance_factor_range': max_distance_factor_range},
+              **changes) for changes in rungs],
+        report))
+
+
+def _rung_steps(session, rungs, report):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    steps of the rungs (dicts with the parameters of
+    :meth:`.detection_session.DetectionSession.detect`) until a rung
+    succeeds or fails with an error code, which is not recoverable
+
+    :return: the result of the last tried rung
+    """
+    attempts = []
+    successful_rung = None
+    for rung, parameters in enumerate(rungs):
+        if rung > 0:
+            session.log.info('try fallback rung %i: %s', rung, parameters)
+        session.timings.count('rungs')
+        start = time.perf_counter()
+        for stage in session.stages(**parameters):
+            result = yield stage
+        error_code = 0 if result[0] is not None else result[1]
+        attempts.append({'rung': rung, 'error_code': error_code,
+                         'seconds': time.perf_counter() - start})
+        if error_code == 0:
+            successful_rung = rung
+        if error_code not in _RECOVERABLE_ERROR_CODES:
+            break
+    if report is not None:
+        report.update(
+            cached=False, rung=successful_rung,
+            parameters=rungs[len(attempts) - 1], attempts=attempts,
+            counts=dict(session.counts))
+    return result
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import contextlib
+import logging
+
+from .detect_localize_checkerboard import _detection_steps
+
+
+async def detect_localize_checkerboard_async(
+        image, crosssizes, angles, *,
+        hit_bound=0.93, min_sharpness=(100, 500, 1000),
+        max_distance_factor_range=(
+            1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.),
+        executor=None, semaphore=None, log=None, cache=None, fallback=None,
+        report=None, timings=None, prior=None):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    Detect and localize a checkerboard in an image without blocking the
+    event loop.
+
+    This is the coroutine version of :func:`detect_localize_checkerboard`
+    with the same parameters (except run_parallel) and results. The stages
+    of a :class:`.detection_session.DetectionSession` (see
+    :meth:`.detection_session.DetectionSession.stages`) and the access to
+    the cache run one after the other in the executor and no process pool
+    is created inside the stages. Between the stages the task can be
+    cancelled; a stage already running in the executor is finished in the
+    background.
+
+    :param image: numpy array, the input image
+    :param crosssizes: tuple, size of the crosses in the checkerboard
+    :param angles: tuple, a guess of the angle(s) of the crosses
+                   in the checkerboard
+    :param hit_bound: the hit bound
+    :param min_sharpness: tuple, the minimum sharpness at different steps
+    :param max_distance_factor_range: the maximum distance factor range
+    :param executor: executor running the stages, e. g. a
+                     :class:`concurrent.futures.ThreadPoolExecutor` (most
+                     time is spent in OpenCV, which releases the GIL);
+                     None uses the default executor of the event loop. The
+                     session lives in this process, therefore a process
+                     pool cannot be used.
+    :param semaphore: None or an :class:`asyncio.Semaphore` shared by all
+                      calls to limit the number of images handled at once
+    :param log: a logger instance
+    :param cache: see :func:`detect_localize_checkerboard`
+    :param fallback: see :func:`detect_localize_checkerboard`
+    :param report: see :func:`detect_localize_checkerboard`
+    :param timings: see :func:`detect_localize_checkerboard`; the memory
+                    (see :class:`detloclcheck.tools.StageTimings`) is only
+                    valid without other detections in flight
+    :param prior: see :func:`detect_localize_checkerboard`
+
+    :return: (coordinate_system, zeropoint, axis1, axis2) on success,
+             otherwise (None, error_code, None, None).
+             possible error codes: 1, 2, 3, 4, 5, 6, 7
+
+    Example:
+
+    >>> import asyncio
+    >>> import concurrent.futures
+    >>> from detloclcheck.detect_localize_checkerboard import \\
+    ...     detect_localize_checkerboard_async
+    >>> async def handle_cameras(images):
+    ...     semaphore = asyncio.Semaphore(2)
+    ...     with concurrent.futures.ThreadPoolExecutor(4) as executor:
+    ...         return await asyncio.gather(*(
+    ...             detect_localize_checkerboard_async(
+    ...                 image, (11, 23), (0, 45, 90, 135),
+    ...                 executor=executor, semaphore=semaphore)
+    ...             for image in images))
+    >>> results = asyncio.run(handle_cameras(images))
+    """
+    # pylint: disable=too-many-arguments
+    if log is None:
+        log = logging.getLogger('detloclcheck')
+    async with (semaphore if semaphore is not None
+                else contextlib.AsyncExitStack()):
+        return await _run_steps_async(
+            _detection_steps(
+                image, crosssizes, angles, hit_bound=hit_bound,
+                min_sharpness=min_sharpness, run_parallel=False,
+                max_distance_factor_range=max_distance_factor_range,
+                log=log, cache=cache, fallback=fallback, report=report,
+                timings=timings, prior=prior),
+            executor)
+
+
+async def _run_steps_async(steps, executor):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    run the steps of
+    :func:`.detect_localize_checkerboard._detection_steps` one after the
+    other in the executor
+
+    :return: the result of the steps
+    """
+    loop = asyncio.get_running_loop()
+    value = None
+    try:
+        while True:
+            value = await loop.run_in_executor(executor, steps.send(value))
+    except StopIteration as stop:
+        return stop.value
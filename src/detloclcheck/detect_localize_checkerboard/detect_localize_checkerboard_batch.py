@@ -0,0 +1,180 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import concurrent.futures
+import itertools
+import os
+import time
+
+from .detect_localize_checkerboard import detect_localize_checkerboard
+from .detect_localize_checkerboard_file import \
+    detect_localize_checkerboard_file
+
+BatchResult = collections.namedtuple(
+    'BatchResult',
+    ('index', 'file', 'result', 'error_code', 'exception', 'seconds'))
+BatchResult.__doc__ = """
+:Author: Daniel Mohr
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+
+result of one item of :func:`detect_localize_checkerboard_batch`
+
+:param index: position of the item in the input
+:param file: the image file or None if the item is an image
+:param result: (coordinate_system, zeropoint, axis1, axis2) on success,
+               otherwise None
+:param error_code: 0 on success, otherwise the error code of
+                   :func:`detect_localize_checkerboard_file` or None if an
+                   exception was raised
+:param exception: None or the exception raised handling the item
+:param seconds: time needed to handle the item
+"""
+
+
+def _detect_item(index, item, reduction, kwargs):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    handle one item of :func:`detect_localize_checkerboard_batch`
+
+    This function is also used in the worker processes.
+
+    :param index: position of the item in the input
+    :param item: image (numpy array) or image file
+    :param reduction: reduction factor used to decode an image file
+    :param kwargs: parameters (including crosssizes and angles) for
+                   :func:`detect_localize_checkerboard`
+
+    :return: :class:`BatchResult`
+    """
+    start = time.perf_counter()
+    filename = None
+    if isinstance(item, (str, os.PathLike)):
+        filename = os.fspath(item)
+    try:
+        if filename is None:
+            result = detect_localize_checkerboard(item, **kwargs)
+        else:
+            result = detect_localize_checkerboard_file(
+                filename, reduction=reduction, **kwargs)
+    except Exception as exception:  # pylint: disable=broad-exception-caught
+        return BatchResult(index, filename, None, None, exception,
+                           time.perf_counter() - start)
+    seconds = time.perf_counter() - start
+    if result[0] is None:
+        return BatchResult(index, filename, None, result[1], None, seconds)
+    return BatchResult(index, filename, result, 0, None, seconds)
+
+
+def detect_localize_checkerboard_batch(
+        items, crosssizes, angles, *,
+        jobs=1, ordered=True, max_in_flight=None, reduction=1, **kwargs):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    Detect and localize a checkerboard in many images.
+
+    The results are returned lazily as generator. The items are consumed
+    only as needed, therefore at most max_in_flight images (and results)
+    are in memory at once, also for an endless iterable (e. g. a camera).
+    Errors of an item (error codes and exceptions) are given in its result
+    and do not stop the batch.
+
+    With jobs larger than 1 the items are handled in worker processes,
+    which are started once for the whole batch. Each worker handles its
+    items serially (run_parallel is ignored), since pools nested in the
+    workers would only oversubscribe the cpus.
+
+    :param items: iterable of images (numpy arrays) or image files (str or
+                  path-like, read as gray image in the worker)
+    :param crosssizes: tuple, size of the crosses in the checkerboard
+    :param angles: tuple, a guess of the angle(s) of the crosses
+                   in the checkerboard
+    :param jobs: number of items handled in parallel in worker processes;
+                 1 handles all items in this process
+    :param ordered: if True, the results are given in the order of the
+                    items; otherwise in the order of completion
+    :param max_in_flight: maximal number of items submitted to the workers
+                          but not yet returned; default: 2 * jobs
+    :param reduction: 1, 2, 4 or 8; image files are decoded with reduced
+                      size (see :func:`detect_localize_checkerboard_file`)
+    :param kwargs: further parameters for
+                   :func:`detect_localize_checkerboard`
+
+    :return: generator of
+             :class:`.detect_localize_checkerboard_batch.BatchResult`
+
+    Example:
+
+    >>> import glob
+    >>> from detloclcheck.detect_localize_checkerboard import \\
+    ...     detect_localize_checkerboard_batch
+    >>> for item in detect_localize_checkerboard_batch(
+    ...         glob.iglob('*.png'), (11, 23), (0, 45, 90, 135), jobs=4,
+    ...         ordered=False):
+    ...     if item.error_code == 0:
+    ...         coordinate_system, zeropoint, axis1, axis2 = item.result
+    ...     else:
+    ...         print(item.file, item.error_code, item.exception)
+    """
+    # pylint: disable=too-many-arguments
+    items = enumerate(items)
+    kwargs = dict(kwargs, crosssizes=crosssizes, angles=angles)
+    if jobs == 1:
+        for index, item in items:
+            yield _detect_item(index, item, reduction, kwargs)
+        return
+    kwargs['run_parallel'] = False
+    if max_in_flight is None:
+        max_in_flight = 2 * jobs
+    max_in_flight = max(1, max_in_flight)
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+    try:
+        futures = collections.deque()
+        while True:
+            for index, item in itertools.islice(
+                    items, max_in_flight - len(futures)):
+                futures.append(executor.submit(
+                    _detect_item, index, item, reduction, kwargs))
+            if len(futures) == 0:
+                return
+            if ordered:
+                yield futures.popleft().result()
+                continue
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                futures.remove(future)
+                yield future.result()
+    finally:
+        # do not handle further items if the caller stopped early
+        executor.shutdown(wait=True, cancel_futures=True)
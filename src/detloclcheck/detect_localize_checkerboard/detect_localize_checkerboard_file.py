@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+from detloclcheck.tools import read_gray_image, scale_coordinate_system
+
+from .detect_localize_checkerboard import detect_localize_checkerboard
+
+
+def detect_localize_checkerboard_file(
+        filename, crosssizes, angles, *, reduction=1, log=None, **kwargs):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    Read an image file and detect and localize a checkerboard in it.
+
+    The file is decoded directly as gray image. With reduction larger than 1
+    it is decoded with reduced size (e. g. as a fast coarse pass on large
+    JPEG images). Then crosssizes has to fit the reduced image, but the
+    result is given in pixel coordinates of the full image.
+
+    :param filename: image file to read
+    :param crosssizes: tuple, size of the crosses in the (reduced) image
+    :param angles: tuple, a guess of the angle(s) of the crosses
+                   in the checkerboard
+    :param reduction: 1, 2, 4 or 8; each side of the image is reduced by
+                      this factor during decoding
+    :param log: a logger instance
+    :param kwargs: further parameters for :func:`detect_localize_checkerboard`
+
+    :return: (coordinate_system, zeropoint, axis1, axis2) on success,
+             otherwise (None, error_code, None, None).
+             possible error codes: 1, 2, 3, 4, 5, 6, 7 as from
+             :func:`detect_localize_checkerboard` and 8 if the file
+             cannot be read as image
+
+    Example:
+
+    >>> from detloclcheck.detect_localize_checkerboard import \
+    ...     detect_localize_checkerboard_file
+    >>> coordinate_system, zeropoint, axis1, axis2 = \
+    ...     detect_localize_checkerboard_file(
+    ...         'foo.jpg', (11, 23), (0, 45, 90, 135), reduction=2)
+    """
+    if log is None:
+        log = logging.getLogger('detloclcheck')
+    image = read_gray_image(filename, reduction)
+    if image is None:
+        log.error('ERROR: file "%s" cannot be read as image', filename)
+        return None, 8, None, None
+    coordinate_system, zeropoint, axis1, axis2 = \
+        detect_localize_checkerboard(
+            image, crosssizes, angles, log=log, **kwargs)
+    if coordinate_system is None:
+        return coordinate_system, zeropoint, axis1, axis2
+    return scale_coordinate_system(
+        coordinate_system, zeropoint, axis1, axis2, reduction)
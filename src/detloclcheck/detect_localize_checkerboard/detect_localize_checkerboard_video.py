@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import concurrent.futures
+
+import cv2
+
+from .optical_flow_tracker import OpticalFlowTracker
+
+
+def _read_frame(capture):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: (gray frame, position in seconds) or (None, None) at the end
+    """
+    success, frame = capture.read()
+    if not success:
+        return None, None
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return frame, capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+
+
+def _read_frames(capture, prefetch):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    read the frames in a background thread; at most prefetch frames are
+    read ahead
+
+    :return: generator of (gray frame, position in seconds)
+    """
+    if prefetch < 1:
+        while True:
+            frame, seconds = _read_frame(capture)
+            if frame is None:
+                return
+            yield frame, seconds
+    # one thread, therefore the frames are read in order
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        queue = collections.deque(
+            executor.submit(_read_frame, capture) for _ in range(prefetch))
+        while True:
+            frame, seconds = queue.popleft().result()
+            if frame is None:
+                return
+            queue.append(executor.submit(_read_frame, capture))
+            yield frame, seconds
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def detect_localize_checkerboard_video(
+        filename, crosssizes, angles, *, keyframe_interval=30,
+        min_tracked=0.8, prefetch=2, log=None, timings=None, **kwargs):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    Read a video file and detect and localize a checkerboard in every
+    frame.
+
+    The frames are read by :class:`cv2.VideoCapture` in a background thread
+    and are handled by :class:`.optical_flow_tracker.OpticalFlowTracker`:
+    the full detection is done only on keyframes and the corners are
+    tracked by optical flow in the frames in between.
+
+    :param filename: video file to read (any format of cv2.VideoCapture)
+    :param crosssizes: tuple, size of the crosses in the checkerboard
+    :param angles: tuple, a guess of the angle(s) of the crosses
+                   in the checkerboard
+    :param keyframe_interval: maximal number of frames from one keyframe
+                              to the next one
+    :param min_tracked: minimal fraction of the corners of the last
+                        keyframe, which have to be tracked
+    :param prefetch: number of frames read ahead; 0 reads each frame only
+                     when it is needed
+    :param log: a logger instance
+    :param timings: None or an instance of
+                    :class:`detloclcheck.tools.StageTimings` for all frames
+    :param kwargs: further parameters for
+                   :func:`detect_localize_checkerboard`
+
+    :return: generator of (index, seconds, result, source) for every frame
+             with index of the frame (starting at 0), seconds the position
+             of the frame in the video, result as from
+             :func:`detect_localize_checkerboard` and source "keyframe" or
+             "tracked"
+
+    :raises ValueError: if the file cannot be read as video (raised by
+                        the call, not by the generator)
+
+    Example:
+
+    >>> from detloclcheck.detect_localize_checkerboard import \
+    ...     detect_localize_checkerboard_video
+    >>> for index, seconds, result, source in \
+    ...         detect_localize_checkerboard_video(
+    ...             'foo.mp4', (11, 23), (0, 45, 90, 135)):
+    ...     coordinate_system, zeropoint, axis1, axis2 = result
+    """
+    # pylint: disable=too-many-arguments
+    capture = cv2.VideoCapture(filename)
+    if not capture.isOpened():
+        raise ValueError(f'file "{filename}" cannot be read as video')
+    tracker = OpticalFlowTracker(
+        crosssizes, angles, keyframe_interval=keyframe_interval,
+        min_tracked=min_tracked, log=log, **kwargs)
+    return _track_frames(capture, tracker, prefetch, timings)
+
+
+def _track_frames(capture, tracker, prefetch, timings):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: generator of (index, seconds, result, source) for every frame,
+             see :func:`detect_localize_checkerboard_video`; the capture is
+             released at the end
+    """
+    frames = _read_frames(capture, prefetch)
+    try:
+        for index, (frame, seconds) in enumerate(frames):
+            result, source = tracker(frame, timings)
+            yield index, seconds, result, source
+    finally:
+        # stop the reading thread before releasing the capture
+        frames.close()
+        capture.release()
@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule::
+   detloclcheck.detect_localize_checkerboard.detection_result_cache
+.. autoclass:: DetectionResultCache
+   :members:
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import hashlib
+import importlib.metadata
+import json
+import os
+import tempfile
+import threading
+
+import numpy
+
+
+class DetectionResultCache():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    cache for the results of :func:`detect_localize_checkerboard`
+    """
+    _names = ('coordinate_system', 'zeropoint', 'axis1', 'axis2')
+
+    def __init__(self, directory=None, max_entries=1024):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        The key of a result is a hash of the image content, all detection
+        parameters and the version of DetLocLCheck. Every result (also an
+        error code) is stored in memory and, if a directory is given, as
+        .npz file in this directory. Therefore unchanged images are not
+        handled again in a later run and identical images handled one
+        after another with the same instance are only handled once. The
+        results in memory are not pickled: worker processes (e. g. of
+        find_checkerboard -jobs or serve -jobs) share only the directory,
+        hence identical images handled at the same time in several
+        processes are handled in each. In memory only the max_entries least
+        recently used results are kept (e. g. for a long running server).
+        Loaded results are copies, which can be modified by the caller.
+
+        :param directory: directory of the cache (created if necessary) or
+                          None to cache only in memory
+        :param max_entries: maximal number of results kept in memory
+
+        Example:
+
+        >>> from detloclcheck.detect_localize_checkerboard import \\
+        ...     detect_localize_checkerboard, DetectionResultCache
+        >>> cache = DetectionResultCache('result_cache')
+        >>> coordinate_system, zeropoint, axis1, axis2 = \\
+        ...     detect_localize_checkerboard(
+        ...         image, (11, 23), (0, 45, 90, 135), cache=cache)
+        """
+        self.directory = directory
+        self.version = importlib.metadata.version(
+            __package__.split('.', maxsplit=1)[0])
+        self.max_entries = max_entries
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def __getstate__(self):
+        # do not send the results in memory to worker processes
+        state = self.__dict__.copy()
+        state['_memory'] = collections.OrderedDict()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def key(self, image, parameters):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param image: the image as numpy array
+        :param parameters: dict with all parameters influencing the result
+
+        :return: hash (hex string) of image, parameters and version
+        """
+        data = {'version': self.version,
+                'shape': list(image.shape), 'dtype': image.dtype.str}
+        for name, value in parameters.items():
+            data[name] = numpy.asarray(value).tolist()
+        hasher = hashlib.blake2b(
+            json.dumps(data, sort_keys=True).encode(), digest_size=20)
+        hasher.update(numpy.ascontiguousarray(image).data)
+        return hasher.hexdigest()
+
+    def load(self, key):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: (coordinate_system, zeropoint, axis1, axis2) or
+                 (None, error_code, None, None) or None if not cached
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+        if result is not None:
+            return self._copy(result)
+        if self.directory is None:
+            return None
+        try:
+            with numpy.load(os.path.join(self.directory, key + '.npz')) \
+                    as data:
+                if 'status' in data:
+                    result = (None, int(data['status']), None, None)
+                else:
+                    result = tuple(data[name] for name in self._names)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        self._remember(key, result)
+        return self._copy(result)
+
+    @staticmethod
+    def _copy(result):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: copy of the result, which does not share arrays with it
+        """
+        if result[0] is None:
+            return result
+        return tuple(numpy.array(array) for array in result)
+
+    def _remember(self, key, result):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        keep the result in memory and forget the least recently used ones
+        (thread-safe, e. g. for the executor threads of
+        :func:`.detect_localize_checkerboard_async`)
+        """
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def store(self, key, result):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param key: key from :meth:`key`
+        :param result: (coordinate_system, zeropoint, axis1, axis2) or
+                       (None, error_code, None, None)
+        """
+        self._remember(key, self._copy(result))
+        if self.directory is None:
+            return
+        if result[0] is None:
+            data = {'status': numpy.array(result[1])}
+        else:
+            data = dict(zip(self._names, result))
+        # write to a temporary file and rename it (atomic)
+        fd, tmpfilename = tempfile.mkstemp(
+            prefix='.tmp-', suffix='.npz', dir=self.directory)
+        with os.fdopen(fd, 'wb') as tmpfile:
+            numpy.savez(tmpfile, **data)
+        os.replace(tmpfilename, os.path.join(self.directory, key + '.npz'))
@@ -0,0 +1,373 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule::
+   detloclcheck.detect_localize_checkerboard.detection_session
+.. autoclass:: DetectionSession
+   :members:
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import functools
+import logging
+
+import numpy
+
+from detloclcheck.create_coordinate_system import create_coordinate_system
+from detloclcheck.find_checkerboard.find_checkerboard import (
+    _calculate_overall_map, _find_peaks, _refine_corners)
+from detloclcheck.tools import calculate_corner_sharpness, StageTimings
+
+# names of the stages in StageTimings, if different from the cache name
+_STAGE_NAMES = {'corners': 'corner_subpix', 'lattice': 'coordinate_system'}
+
+
+def _lattice_key(hit_bound, min_sharpness, max_distance_factor_range):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    return (float(hit_bound), float(min_sharpness[0]),
+            float(min_sharpness[1]),
+            tuple(float(factor) for factor in max_distance_factor_range))
+
+
+class DetectionSession():  # pylint: disable=too-many-instance-attributes
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    detection in one image with cached intermediate stages
+
+    Every stage of :func:`detect_localize_checkerboard` is computed only
+    when it is needed and is cached for its parameters:
+
+    ============== ============================== ==========================
+    stage          depends on                     cost
+    ============== ============================== ==========================
+    overall_map    (crosssizes, angles)           template matching (high)
+    peaks          hit_bound                      low
+    sharpness      hit_bound                      low
+    corners        min_sharpness[0]               :func:`cv2.cornerSubPix`
+    lattice        min_sharpness[1],              axis and marker search
+                   max_distance_factor_range
+    ============== ============================== ==========================
+
+    Therefore a retry with another hit_bound, min_sharpness or
+    max_distance_factor_range does not repeat the template matching and
+    min_sharpness[2] only filters the cached lattice. The number of
+    computations of every stage is counted in :attr:`counts`. With
+    timings also the time of every computation is recorded.
+    """
+
+    def __init__(self, image, crosssizes, angles, *,
+                 run_parallel=False, log=None, timings=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param image: numpy array, the input image
+        :param crosssizes: tuple, size of the crosses in the checkerboard
+        :param angles: tuple, a guess of the angle(s) of the crosses
+                       in the checkerboard
+        :param run_parallel: whether to run the template matching and
+                             :func:`cv2.cornerSubPix` in parallel
+        :param log: a logger instance
+        :param timings: None or an instance of
+                        :class:`detloclcheck.tools.StageTimings` recording
+                        the time of every computed stage (see
+                        :func:`detect_localize_checkerboard`)
+
+        Example:
+
+        >>> from detloclcheck.detect_localize_checkerboard import \\
+        ...     DetectionSession
+        >>> session = DetectionSession(image, (11, 23), (0, 45, 90, 135))
+        >>> result = session.detect()
+        >>> if result[0] is None:
+        ...     # template matching is not repeated
+        ...     result = session.detect(
+        ...         hit_bound=0.9, min_sharpness=(50, 250, 500))
+        """
+        self.image = image
+        self.crosssizes = tuple(crosssizes)
+        self.angles = tuple(angles)
+        self.run_parallel = run_parallel
+        self.log = log
+        if self.log is None:
+            self.log = logging.getLogger('detloclcheck')
+        self.counts = collections.Counter()
+        self.timings = timings
+        if self.timings is None:
+            self.timings = StageTimings(enabled=False)
+        self._overall_map = None
+        self._cache = {name: {} for name in (
+            'peaks', 'peak_sharpness', 'corners', 'corner_sharpness',
+            'lattice', 'lattice_sharpness')}
+
+    def _cached(self, name, key, function, *args, **kwargs):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: the cached value of the stage name for key; the value is
+                 computed by function(*args, **kwargs) if necessary
+        """
+        cache = self._cache[name]
+        if key not in cache:
+            with self.timings.stage(_STAGE_NAMES.get(name, name)):
+                cache[key] = function(*args, **kwargs)
+            self.counts[name] += 1
+        return cache[key]
+
+    def _remove_blurry(self, coordinates, sharpness, min_sharpness):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        like :func:`detloclcheck.tools.filter_blurry_corners` with known
+        sharpness
+        """
+        blurry_corners = sharpness < min_sharpness
+        self.log.debug('removed %i blurry corners (min_sharpness = %f)',
+                       blurry_corners.sum(), min_sharpness)
+        return coordinates[~blurry_corners]
+
+    def _template_matching(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: maximum of the template matching maps (computed)
+        """
+        return _calculate_overall_map(
+            self.image, self.crosssizes, self.angles,
+            self.run_parallel, self.timings.trace)
+
+    def _find_peaks(self, overall_map, hit_bound):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: approximated coordinates of the corners (computed)
+        """
+        return _find_peaks(overall_map, hit_bound, max(self.crosssizes))
+
+    @property
+    def overall_map(self):
+        """
+        maximum of the template matching maps
+        """
+        if self._overall_map is None:
+            with self.timings.stage('template_matching'):
+                self._overall_map = self._template_matching()
+            self.counts['overall_map'] += 1
+            self.log.debug('found template matching maps')
+        return self._overall_map
+
+    def peaks(self, hit_bound):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: approximated coordinates of the corners
+        """
+        hit_bound = float(hit_bound)
+        return self._cached(
+            'peaks', hit_bound, self._find_peaks, self.overall_map, hit_bound)
+
+    def corners(self, hit_bound, min_sharpness):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        corners as from :func:`detloclcheck.find_checkerboard`
+
+        :param hit_bound: the hit bound
+        :param min_sharpness: the minimal sharpness of the approximated
+                              coordinates (first value of min_sharpness of
+                              :meth:`detect`)
+
+        :return: coordinates of the corners or None if less than 24
+                 corners are found
+        """
+        key = (float(hit_bound), float(min_sharpness))
+        if key not in self._cache['corners']:
+            approx_coordinates = self._remove_blurry(
+                self.peaks(hit_bound),
+                self._cached(
+                    'peak_sharpness', key[0],
+                    calculate_corner_sharpness,
+                    self.image, self.peaks(hit_bound), self.crosssizes[0]),
+                min_sharpness)
+            self.timings.count('peaks', self.peaks(hit_bound).shape[0])
+            self.timings.count('sharp_peaks', approx_coordinates.shape[0])
+            if approx_coordinates.shape[0] < 24:
+                self.log.error(
+                    'ERROR: only %i corners detected, '
+                    'but we need at least 24 for marker detection',
+                    approx_coordinates.shape[0])
+                self._cache['corners'][key] = None
+            else:
+                corners = self._cached(
+                    'corners', key, _refine_corners,
+                    self.image, approx_coordinates,
+                    run_parallel=self.run_parallel,
+                    criteria_max_count=42, criteria_epsilon=0.001,
+                    trace=self.timings.trace)
+                self.timings.count('corners', corners.shape[0])
+        return self._cache['corners'][key]
+
+    def good_corners(self, hit_bound, min_sharpness):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param hit_bound: the hit bound
+        :param min_sharpness: the first 2 values of min_sharpness of
+                              :meth:`detect`
+
+        :return: coordinates of the sharp corners or None if
+                 :meth:`corners` returns None
+        """
+        corners = self.corners(hit_bound, min_sharpness[0])
+        if corners is None:
+            return None
+        key = (float(hit_bound), float(min_sharpness[0]))
+        # filter blurry corners (2)
+        return self._remove_blurry(
+            corners,
+            self._cached(
+                'corner_sharpness', key, calculate_corner_sharpness,
+                self.image, corners, self.crosssizes[0]),
+            min_sharpness[1])
+
+    def lattice(self, hit_bound, min_sharpness, max_distance_factor_range):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param hit_bound: the hit bound
+        :param min_sharpness: the first 2 values of min_sharpness of
+                              :meth:`detect`
+        :param max_distance_factor_range: the maximum distance factor range
+
+        :return: (coordinate_system, zeropoint, axis1, axis2) as from
+                 :func:`detloclcheck.create_coordinate_system` without
+                 filtering blurry corners, otherwise
+                 (None, error_code, None, None)
+        """
+        key = _lattice_key(
+            hit_bound, min_sharpness, max_distance_factor_range)
+        if key not in self._cache['lattice']:
+            coordinates = self.good_corners(hit_bound, min_sharpness)
+            if coordinates is None:
+                self.log.error('ERROR: no inner corners detected')
+                self._cache['lattice'][key] = (None, 1, None, None)
+            elif coordinates.shape[0] < 24:
+                self.log.error(
+                    'ERROR: only %i corners detected, '
+                    'but we need at least 24 for marker detection',
+                    coordinates.shape[0])
+                self._cache['lattice'][key] = (None, 7, None, None)
+            else:
+                self.log.debug('go on with %i corners', coordinates.shape[0])
+                # with -inf no corner is filtered, see detect
+                self._cached(
+                    'lattice', key, create_coordinate_system,
+                    self.image, coordinates, max_distance_factor_range,
+                    min_sharpness=-numpy.inf, timings=self.timings)
+        return self._cache['lattice'][key]
+
+    def stages(self, *,
+               hit_bound=0.93, min_sharpness=(100, 500, 1000),
+               max_distance_factor_range=(
+                   1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.)):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        see :meth:`detect` for the parameters
+
+        :return: list of callables without arguments computing the stages
+                 of :meth:`detect` one after the other (e. g. each in an
+                 executor); the last one returns the result of
+                 :meth:`detect`
+        """
+        return [
+            functools.partial(getattr, self, 'overall_map'),
+            functools.partial(self.peaks, hit_bound),
+            functools.partial(self.corners, hit_bound, min_sharpness[0]),
+            functools.partial(self.good_corners, hit_bound, min_sharpness),
+            functools.partial(self.lattice, hit_bound, min_sharpness,
+                              max_distance_factor_range),
+            functools.partial(
+                self.detect, hit_bound=hit_bound, min_sharpness=min_sharpness,
+                max_distance_factor_range=max_distance_factor_range)]
+
+    def detect(self, *,
+               hit_bound=0.93, min_sharpness=(100, 500, 1000),
+               max_distance_factor_range=(
+                   1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.)):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        see :func:`detect_localize_checkerboard` for the parameters
+
+        :return: (coordinate_system, zeropoint, axis1, axis2) on success,
+                 otherwise (None, error_code, None, None).
+                 possible error codes: 1, 2, 3, 4, 5, 6, 7
+        """
+        lattice = self.lattice(
+            hit_bound, min_sharpness, max_distance_factor_range)
+        coordinate_system, zeropoint, axis1, axis2 = lattice
+        if coordinate_system is None:
+            return lattice
+        # filter blurry corners (3) as in create_coordinate_system
+        size = 0.4 * (numpy.linalg.norm(axis1) + numpy.linalg.norm(axis2))
+        key = _lattice_key(
+            hit_bound, min_sharpness, max_distance_factor_range)
+        coordinate_system = self._remove_blurry(
+            coordinate_system,
+            self._cached(
+                'lattice_sharpness', key, calculate_corner_sharpness,
+                self.image, coordinate_system, size),
+            min_sharpness[2])
+        self.log.debug('keep %i good corners', coordinate_system.shape[0])
+        return coordinate_system, zeropoint.copy(), axis1.copy(), axis2.copy()
@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.detect_localize_checkerboard.frame_detector
+.. autoclass:: FrameDetector
+   :members:
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+from detloclcheck.find_checkerboard import PreallocatedTemplateMatching
+
+from .detection_session import DetectionSession
+
+
+class _FrameSession(DetectionSession):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :class:`DetectionSession` using the preallocated buffers of the
+    template matching and of the peak search
+    """
+
+    def __init__(self, template_matching, image, *, log, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        super().__init__(
+            image, template_matching.crosssizes, template_matching.angles,
+            run_parallel=False, log=log, timings=timings)
+        self.template_matching = template_matching
+
+    def _template_matching(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: maximum of the template matching maps (in the preallocated
+                 buffer)
+        """
+        return self.template_matching(self.image)
+
+    def _find_peaks(self, overall_map, hit_bound):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: approximated coordinates of the corners
+        """
+        return self.template_matching.find_peaks(overall_map, hit_bound)
+
+
+class FrameDetector():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    reusable detector for many images of the same shape (e. g. the frames
+    of a camera)
+
+    All working buffers of the template matching (padded and rotated
+    images, maps, maximum) and of the peak search are allocated once at
+    initialization (see
+    :class:`detloclcheck.find_checkerboard.PreallocatedTemplateMatching`)
+    and are reused for every frame. Everything runs in this process; no
+    process pool is created. The result is the same as from
+    :func:`detect_localize_checkerboard` with the same parameters.
+
+    A detector is not thread-safe; use one detector per thread.
+
+    Example:
+
+    >>> from detloclcheck.detect_localize_checkerboard import FrameDetector
+    >>> detector = FrameDetector((480, 640), (11, 23), (0, 45, 90, 135))
+    >>> for frame in frames:
+    ...     coordinate_system, zeropoint, axis1, axis2 = \\
+    ...         detector.detect(frame)
+    """
+
+    def __init__(self, shape, crosssizes, angles, *,
+                 hit_bound=0.93, min_sharpness=(100, 500, 1000),
+                 max_distance_factor_range=(
+                     1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.),
+                 log=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param shape: shape (height, width) of the gray frames
+        :param crosssizes: tuple, size of the crosses in the checkerboard
+        :param angles: tuple, a guess of the angle(s) of the crosses
+                       in the checkerboard
+        :param hit_bound: the hit bound
+        :param min_sharpness: tuple, the minimum sharpness at different
+                              steps (see :func:`detect_localize_checkerboard`)
+        :param max_distance_factor_range: the maximum distance factor range
+        :param log: a logger instance
+        """
+        self.template_matching = PreallocatedTemplateMatching(
+            shape, crosssizes, angles)
+        self.parameters = {
+            'hit_bound': hit_bound, 'min_sharpness': min_sharpness,
+            'max_distance_factor_range': max_distance_factor_range}
+        self.log = log
+        if self.log is None:
+            self.log = logging.getLogger('detloclcheck')
+
+    @property
+    def shape(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        shape of the frames
+        """
+        return self.template_matching.shape
+
+    def session(self, frame, timings=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param frame: gray image with the shape of the detector
+        :param timings: None or an instance of
+                        :class:`detloclcheck.tools.StageTimings`
+
+        :return: :class:`.detection_session.DetectionSession` of the frame
+                 using the buffers of the detector; it is valid until the
+                 next frame is handled
+        """
+        if frame.shape != self.shape:
+            raise ValueError(
+                f'frame shape {frame.shape} differs from {self.shape}')
+        return _FrameSession(
+            self.template_matching, frame, log=self.log, timings=timings)
+
+    def detect(self, frame, timings=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param frame: gray image with the shape of the detector
+        :param timings: None or an instance of
+                        :class:`detloclcheck.tools.StageTimings`
+
+        :return: (coordinate_system, zeropoint, axis1, axis2) on success,
+                 otherwise (None, error_code, None, None).
+                 possible error codes: 1, 2, 3, 4, 5, 6, 7
+        """
+        return self.session(frame, timings).detect(**self.parameters)
@@ -0,0 +1,287 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule::
+   detloclcheck.detect_localize_checkerboard.optical_flow_tracker
+.. autoclass:: OpticalFlowTracker
+   :members:
+   :special-members: __call__
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+import cv2
+import numpy
+
+from detloclcheck.tools import StageTimings
+
+from .detect_localize_checkerboard import detect_localize_checkerboard
+from .tracking_prior import prior_from_result
+
+# parameters of the pyramidal Lucas-Kanade optical flow
+_FLOW_WINDOW_SIZE = (21, 21)
+_FLOW_MAX_LEVEL = 3
+_FLOW_CRITERIA = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 30, 0.01)
+# maximal shift of a corner by cv2.cornerSubPix (in units of the shorter
+# axis); larger shifts mean the corner jumped to another one
+_MAX_SUBPIX_SHIFT = 0.25
+
+
+# pylint: disable=too-many-instance-attributes
+class OpticalFlowTracker():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    detect and localize a checkerboard in the frames of a video
+
+    The full detection (:func:`detect_localize_checkerboard`) is done only
+    on keyframes. In the frames in between, the labelled corners of the
+    previous frame are propagated by the pyramidal Lucas-Kanade optical
+    flow (:func:`cv2.calcOpticalFlowPyrLK`) and refined by
+    :func:`cv2.cornerSubPix`. A corner is dropped if it is not found back
+    by the backward flow (forward-backward error larger than max_error
+    pixels) or if the refinement moves it too far. The world coordinates
+    of the corners are kept; zeropoint, axis1 and axis2 are given by a
+    least squares fit of the tracked corners.
+
+    A new keyframe is detected after keyframe_interval frames or if the
+    track is lost, i. e. less than min_tracked of the corners of the last
+    keyframe are left. The detection on a keyframe uses the last result as
+    prior (see :func:`.tracking_prior.prior_from_result`), i. e. only the
+    region of the last (tracked) result is searched at first.
+
+    Example:
+
+    >>> import cv2
+    >>> from detloclcheck.detect_localize_checkerboard import \\
+    ...     OpticalFlowTracker
+    >>> tracker = OpticalFlowTracker((11, 23), (0, 45, 90, 135))
+    >>> capture = cv2.VideoCapture('foo.mp4')
+    >>> while True:
+    ...     success, frame = capture.read()
+    ...     if not success:
+    ...         break
+    ...     result, source = tracker(
+    ...         cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    """
+
+    def __init__(self, crosssizes, angles, *, keyframe_interval=30,
+                 min_tracked=0.8, max_error=1.0, log=None, **kwargs):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param crosssizes: tuple, size of the crosses in the checkerboard
+        :param angles: tuple, a guess of the angle(s) of the crosses
+                       in the checkerboard
+        :param keyframe_interval: maximal number of frames from one
+                                  keyframe to the next one
+        :param min_tracked: minimal fraction of the corners of the last
+                            keyframe, which have to be tracked
+        :param max_error: maximal forward-backward error (in pixel) of a
+                          tracked corner
+        :param log: a logger instance
+        :param kwargs: further parameters for
+                       :func:`detect_localize_checkerboard` (e. g.
+                       hit_bound or fallback)
+        """
+        self.crosssizes = tuple(crosssizes)
+        self.angles = tuple(angles)
+        self.keyframe_interval = keyframe_interval
+        self.min_tracked = min_tracked
+        self.max_error = max_error
+        self.log = log
+        if self.log is None:
+            self.log = logging.getLogger('detloclcheck')
+        self.parameters = kwargs
+        self.reset()
+
+    def reset(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        forget the last frame; the next frame is a keyframe
+        """
+        self._frame = None
+        self._result = None
+        self._prior = None
+        self._keyframe_corners = 0
+        self._since_keyframe = 0
+
+    def _flow(self, frame, points, window_size, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        propagate the points of the last frame to the frame by the optical
+        flow
+
+        :return: (tracked, good) with the tracked points and a boolean mask
+                 of the points found back by the backward flow and far
+                 enough from the border for the refinement
+        """
+        with timings.stage('optical_flow'):
+            tracked, status, _ = cv2.calcOpticalFlowPyrLK(
+                self._frame, frame, points, None,
+                winSize=_FLOW_WINDOW_SIZE, maxLevel=_FLOW_MAX_LEVEL,
+                criteria=_FLOW_CRITERIA)
+            back, back_status, _ = cv2.calcOpticalFlowPyrLK(
+                frame, self._frame, tracked, None,
+                winSize=_FLOW_WINDOW_SIZE, maxLevel=_FLOW_MAX_LEVEL,
+                criteria=_FLOW_CRITERIA)
+        good = ((status.ravel() == 1) & (back_status.ravel() == 1) &
+                (numpy.linalg.norm(back - points, axis=2).ravel() <=
+                 self.max_error))
+        # the window of cv2.cornerSubPix has to fit in the image
+        for dim in (0, 1):
+            good &= ((window_size < tracked[:, 0, dim]) &
+                     (tracked[:, 0, dim] <
+                      frame.shape[1 - dim] - window_size - 1))
+        return tracked, good
+
+    @staticmethod
+    def _refine(frame, tracked, window_size, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: the tracked points refined by :func:`cv2.cornerSubPix`
+        """
+        with timings.stage('corner_subpix'):
+            return cv2.cornerSubPix(
+                frame, tracked.copy(), (window_size, window_size), (-1, -1),
+                (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER,
+                 42, 0.001))
+
+    def _fit(self, pixels, world):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param pixels: pixel coordinates of the tracked corners
+        :param world: world coordinates of the tracked corners
+
+        :return: (coordinate_system, zeropoint, axis1, axis2) with
+                 zeropoint, axis1 and axis2 by a least squares fit
+        """
+        _, last_zeropoint, axis1, axis2 = self._result
+        coordinate_system = numpy.empty(
+            (world.shape[0], 2, 2), dtype=self._result[0].dtype)
+        coordinate_system[:, 0, :] = pixels
+        coordinate_system[:, 1, :] = world
+        # pixel = zeropoint + world[0] * axis1 + world[1] * axis2
+        fit = numpy.linalg.lstsq(
+            numpy.hstack((numpy.ones((world.shape[0], 1)), world)),
+            coordinate_system[:, 0, :], rcond=None)[0]
+        zeropoint = fit[0]
+        origin = (world == 0).all(axis=1)
+        if origin.any():
+            zeropoint = coordinate_system[origin, 0, :][0]
+        return (coordinate_system, zeropoint.astype(last_zeropoint.dtype),
+                fit[1].astype(axis1.dtype), fit[2].astype(axis2.dtype))
+
+    def _track(self, frame, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: (coordinate_system, zeropoint, axis1, axis2) of the
+                 tracked corners or None if the track is lost
+        """
+        coordinate_system, _, axis1, axis2 = self._result
+        points = numpy.ascontiguousarray(
+            coordinate_system[:, 0:1, :], dtype=numpy.float32)
+        square_size = min(numpy.linalg.norm(axis1), numpy.linalg.norm(axis2))
+        window_size = max(1, int(0.5 * 0.75 * square_size))
+        min_corners = max(4, self.min_tracked * self._keyframe_corners)
+        tracked, good = self._flow(frame, points, window_size, timings)
+        if good.sum() < min_corners:
+            return None
+        tracked = tracked[good]
+        refined = self._refine(frame, tracked, window_size, timings)
+        good_refined = (numpy.linalg.norm(refined - tracked, axis=2).ravel()
+                        <= _MAX_SUBPIX_SHIFT * square_size)
+        if good_refined.sum() < min_corners:
+            return None
+        return self._fit(refined[good_refined, 0, :],
+                         coordinate_system[good, 1, :][good_refined])
+
+    def __call__(self, frame, timings=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param frame: gray image (uint8); all frames need the same shape
+        :param timings: None or an instance of
+                        :class:`detloclcheck.tools.StageTimings`; recording
+                        also the stages optical_flow and corner_subpix
+                        (of the tracking) and the counts
+                        keyframes, tracked_frames and track_losses
+
+        :return: (result, source) with result as from
+                 :func:`detect_localize_checkerboard` and source
+                 "keyframe" or "tracked"
+        """
+        if timings is None:
+            timings = StageTimings(enabled=False)
+        if ((self._result is not None) and
+                (self._since_keyframe < self.keyframe_interval)):
+            result = self._track(frame, timings)
+            if result is not None:
+                self._frame = frame.copy()
+                self._result = result
+                # the number of corners is checked against the keyframe
+                self._prior = dict(
+                    prior_from_result(result, self.crosssizes),
+                    corners=self._keyframe_corners)
+                self._since_keyframe += 1
+                timings.count('tracked_frames')
+                return result, 'tracked'
+            self.log.debug('track lost, detect keyframe')
+            timings.count('track_losses')
+        timings.count('keyframes')
+        result = detect_localize_checkerboard(
+            frame, self.crosssizes, self.angles, log=self.log,
+            timings=timings, prior=self._prior, **self.parameters)
+        self._frame = frame.copy()
+        self._since_keyframe = 0
+        if result[0] is None:
+            self._result = None
+            self._prior = None
+        else:
+            self._result = result
+            self._prior = prior_from_result(result, self.crosssizes)
+            self._keyframe_corners = result[0].shape[0]
+        return result, 'keyframe'
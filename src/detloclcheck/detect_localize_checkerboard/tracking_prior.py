@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule:: detloclcheck.detect_localize_checkerboard.tracking_prior
+.. autofunction:: prior_from_result
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import math
+
+import numpy
+
+# padding of the bounding box of the prior in units of the longer axis
+_PRIOR_MARGIN = 1.5
+# maximal difference (in degree) of a template angle to the prior
+_PRIOR_ANGLE_TOLERANCE = 15.0
+# a tracked result needs at least this fraction of the corners of the
+# prior
+_PRIOR_MIN_CORNERS = 0.5
+# maximal change of the length of an axis (factor) for a tracked result
+_PRIOR_MAX_AXIS_CHANGE = 1.5
+
+
+def prior_from_result(result, crosssizes=None):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    create a prior (e. g. for the next frame of a video) from a result of
+    :func:`detect_localize_checkerboard`
+
+    :param result: (coordinate_system, zeropoint, axis1, axis2) or
+                   (None, error_code, None, None)
+    :param crosssizes: None or the cross sizes of the detection; the
+                       largest cross size not larger than the shorter axis
+                       (otherwise the smallest) becomes the cross size of
+                       the prior
+
+    :return: None for a failed result, otherwise a dict (json
+             serializable) with "bbox" (x0, y0, x1, y1 of the corners),
+             "axis1", "axis2", "corners" (number of corners) and with
+             crosssizes also "crosssize"
+    """
+    coordinate_system, _, axis1, axis2 = result
+    if coordinate_system is None:
+        return None
+    pixels = coordinate_system[:, 0, :]
+    prior = {
+        'bbox': [float(value) for value in numpy.hstack(
+            (pixels.min(axis=0), pixels.max(axis=0)))],
+        'axis1': [float(value) for value in axis1],
+        'axis2': [float(value) for value in axis2],
+        'corners': int(coordinate_system.shape[0])}
+    if crosssizes is not None:
+        square_size = min(numpy.linalg.norm(axis1), numpy.linalg.norm(axis2))
+        fitting = [crosssize for crosssize in crosssizes
+                   if crosssize <= square_size]
+        prior['crosssize'] = int(
+            max(fitting) if len(fitting) > 0 else min(crosssizes))
+    return prior
+
+
+def _prior_angles(prior, angles):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    The template (angle 0) is a cross of the diagonals, therefore it fits
+    to an axis with the angle 45 (modulo 90, the 2 colorings of the
+    corners alternate). The image is rotated counter-clockwise by the
+    template angle, which gives the angle of the axis in image
+    coordinates (y down) minus 45.
+
+    :return: the angles within the tolerance of the axes of the prior (at
+             least the nearest ones)
+    """
+    targets = [math.degrees(math.atan2(axis[1], axis[0])) - 45
+               for axis in (prior['axis1'], prior['axis2'])]
+
+    def distance(angle):
+        return min(min((angle - target) % 90, (target - angle) % 90)
+                   for target in targets)
+
+    selected = tuple(angle for angle in angles
+                     if distance(angle) <= _PRIOR_ANGLE_TOLERANCE)
+    if len(selected) == 0:
+        minimal_distance = min(distance(angle) for angle in angles)
+        selected = tuple(angle for angle in angles
+                         if distance(angle) == minimal_distance)
+    return selected
+
+
+def _prior_roi(prior, shape, crosssizes):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: (x0, y0, x1, y1) of the padded bounding box of the prior in
+             the image
+    """
+    margin = _PRIOR_MARGIN * max(
+        numpy.linalg.norm(prior['axis1']),
+        numpy.linalg.norm(prior['axis2'])) + max(crosssizes)
+    x0, y0, x1, y1 = prior['bbox']
+    return (max(0, int(math.floor(x0 - margin))),
+            max(0, int(math.floor(y0 - margin))),
+            min(shape[1], int(math.ceil(x1 + margin)) + 1),
+            min(shape[0], int(math.ceil(y1 + margin)) + 1))
+
+
+def _valid_tracked_result(result, prior):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: True if the result fits to the prior
+    """
+    coordinate_system, _, axis1, axis2 = result
+    if coordinate_system is None:
+        return False
+    if coordinate_system.shape[0] < _PRIOR_MIN_CORNERS * prior['corners']:
+        return False
+    for axis, prior_axis in ((axis1, prior['axis1']),
+                             (axis2, prior['axis2'])):
+        ratio = numpy.linalg.norm(axis) / numpy.linalg.norm(prior_axis)
+        if not 1 / _PRIOR_MAX_AXIS_CHANGE <= ratio <= _PRIOR_MAX_AXIS_CHANGE:
+            return False
+    return True
+
+
+def _shift_result(result, offset):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: result of a region of interest in the coordinates of the image
+    """
+    coordinate_system, zeropoint, axis1, axis2 = result
+    offset = numpy.array(offset, dtype=coordinate_system.dtype)
+    coordinate_system = coordinate_system.copy()
+    coordinate_system[:, 0, :] += offset
+    return coordinate_system, zeropoint + offset, axis1, axis2
@@ -23,11 +23,17 @@ functions
 .. currentmodule:: detloclcheck.find_checkerboard
 .. autofunction:: find_checkerboard
 
+classes
+-------
+.. autoclass:: PreallocatedTemplateMatching
+
 submodules
 ----------
 .. automodule:: detloclcheck.find_checkerboard.calculatetemplatematching
 .. automodule:: detloclcheck.find_checkerboard.create_template
 .. automodule:: detloclcheck.find_checkerboard.parallel_cornersubpix
+.. automodule::
+   detloclcheck.find_checkerboard.preallocated_template_matching
 .. automodule:: detloclcheck.find_checkerboard.set_black_border
 
 copyright + license
@@ -53,5 +59,7 @@ copyright + license
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
 from .find_checkerboard import find_checkerboard
+from .preallocated_template_matching import PreallocatedTemplateMatching
 
-__all__ = ["find_checkerboard"]
+__all__ = ["find_checkerboard",
+           "PreallocatedTemplateMatching"]
@@ -1,4 +1,4 @@
-# SPDX-FileCopyrightText: 2024-2025 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
@@ -10,9 +10,9 @@
            :func:`detloclcheck.find_checkerboard.find_checkerboard`.
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-02-24
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024, 2025 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
@@ -32,11 +32,12 @@
 import itertools
 import logging
 import multiprocessing
+import time
 
 import cv2
 import numpy
 from detloclcheck.tools import (calculate_square_distances,
-                                filter_blurry_corners)
+                                filter_blurry_corners, StageTimings)
 
 from .calculatetemplatematching import CalculateTemplateMatching
 from .create_template import create_template
@@ -44,60 +45,34 @@ from .parallel_cornersubpix import ParallelCornerSubPix
 from .set_black_border import _set_black_border
 
 
-def find_checkerboard(
-        image, *,
-        crosssizes=None, angles=None,
-        hit_bound=0.93, min_sharpness=100, run_parallel=False,
-        criteria_max_count=42, criteria_epsilon=0.001):
+def _calculate_overall_map(image, crosssizes, angles, run_parallel,
+                           trace=None):
     """
     :Author: Daniel Mohr
-    :Date: 2025-02-24
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
 
-    find the inner checkerboard corners in the image
-
-    :param image: 2 dimensional numpy array describing the image
-    :param crosssizes: list of cross sizes to test, default: [5, 11, 23]
-    :param angles: list of angles to test, default: [0, 45, 90, 135]
-    :param hit_bound: minimal value in the template matching to be a
-                      checkerboard corner
-    :param min_sharpness: minimal sharpness for a good corner
-    :param run_parallel: if set to True will run in parallel
-    :param criteria_max_count: parameter for :func:`cv2.cornerSubPix`
-                               to define the maximal count of iterations
-    :param criteria_epsilon: parameter for :func:`cv2.cornerSubPix` to
-                             minimal corner position move between 2 steps
-
-    Example 1:
+    :param trace: None or :class:`detloclcheck.tools.TraceEvents` to trace
+                  the tasks of the process pool and the reduction
 
-    >>> import cv2
-    >>> from detloclcheck import find_checkerboard
-    >>> image = cv2.imread('foo.png')
-    >>> gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    >>> coordinates = find_checkerboard.find_checkerboard(
-    ...    gray_image, crosssizes=[35, 55], min_sharpness=10)
-    >>> import matplotlib.pyplot
-    >>> matplotlib.pyplot.imshow(gray_image, cmap="Greys")
-    >>> matplotlib.pyplot.plot(coordinates[:, 0, 0], coordinates[:, 0, 1],
-    ...                        'r1', markersize=20)
-    >>> matplotlib.pyplot.show()
+    :return: maximum of the template matching maps of all cross sizes and
+             angles (with black border)
     """
-    # pylint: disable=too-many-locals, too-many-statements
-    log = logging.getLogger('detloclcheck.find_checkerboard')
-    if crosssizes is None:
-        crosssizes = [5, 11, 23]
-    if angles is None:
-        angles = [0, 45, 90, 135]
-    _ = map(create_template, crosssizes)
     iter_data = itertools.product(crosssizes, angles)
     calculate_template_matching = CalculateTemplateMatching(image)
     if run_parallel:
         with multiprocessing.Pool() as pool:
-            template_machting_maps = list(
-                pool.map(calculate_template_matching, iter_data))
+            if trace is None:
+                template_machting_maps = list(
+                    pool.map(calculate_template_matching, iter_data))
+            else:
+                template_machting_maps = trace.map(
+                    pool, calculate_template_matching, iter_data,
+                    'template_matching')
     else:
         template_machting_maps = list(
             map(calculate_template_matching, iter_data))
+    reduce_start = time.time()
     max_crosssize = max(crosssizes)
     for template_machting_map in template_machting_maps:
         _set_black_border(
@@ -106,14 +81,46 @@ def find_checkerboard(
         image.shape, dtype=template_machting_maps[0].dtype)
     for template_machting_map in template_machting_maps:
         overall_map = numpy.maximum(overall_map, template_machting_map)
-    log.debug('found template matching maps')
-    approx_coordinates = []
-    mask = numpy.ones(overall_map.shape, dtype=numpy.uint8)
+    if trace is not None:
+        trace.span('template_matching reduce', reduce_start, time.time(),
+                   category='reduce')
+    return overall_map
+
+
+def _peak_mask(shape, max_crosssize):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: mask for :func:`_find_peaks` without the border of the image
+    """
+    mask = numpy.ones(shape, dtype=numpy.uint8)
     window_half_size = max_crosssize // 2
     mask[0:(window_half_size+1), :] = 0
     mask[-(window_half_size+2):, :] = 0
     mask[:, 0:(window_half_size+1)] = 0
     mask[:, -(window_half_size+2):] = 0
+    return mask
+
+
+def _find_peaks(overall_map, hit_bound, max_crosssize, mask=None):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :param mask: None or the mask from :func:`_peak_mask` (e. g. a
+                 preallocated copy), which is changed
+
+    :return: approximated coordinates of the maxima in overall_map
+             reaching hit_bound (with a distance of at least half of
+             max_crosssize) as numpy array of shape (n, 1, 2)
+    """
+    approx_coordinates = []
+    if mask is None:
+        mask = _peak_mask(overall_map.shape, max_crosssize)
+    window_half_size = max_crosssize // 2
     while True:
         _, maxval, _, pos = cv2.minMaxLoc(overall_map, mask)
         if maxval >= hit_bound:  # check if pos could be a chessboard corner
@@ -125,18 +132,22 @@ def find_checkerboard(
             mask[y0:y1, x0:x1] = 0
         else:
             break
-    approx_coordinates = numpy.array(approx_coordinates)
-    log.debug('found approximated coordinates')
-    # filter blurry corners
-    approx_coordinates = filter_blurry_corners(
-        image, approx_coordinates, crosssizes[0], min_sharpness)
+    return numpy.array(
+        approx_coordinates, dtype=numpy.float32).reshape((-1, 1, 2))
+
+
+def _refine_corners(
+        image, approx_coordinates, *,
+        run_parallel, criteria_max_count, criteria_epsilon, trace=None):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: coordinates of the corners refined by :func:`cv2.cornerSubPix`
+    """
+    log = logging.getLogger('detloclcheck.find_checkerboard')
     n = approx_coordinates.shape[0]
-    if n < 24:
-        log.error(
-            'ERROR: only %i corners detected, '
-            'but we need at least 24 for marker detection',
-            n)
-        return None
     distances = calculate_square_distances(
         approx_coordinates[:, :, 0].reshape((n,)),
         approx_coordinates[:, :, 1].reshape((n,)),
@@ -154,7 +165,90 @@ def find_checkerboard(
     pfcsp = ParallelCornerSubPix(
         image, approx_coordinates, (window_size, window_size),
         criteria_max_count=criteria_max_count,
-        criteria_epsilon=criteria_epsilon)
-    coordinates = pfcsp()
+        criteria_epsilon=criteria_epsilon,
+        run_parallel=run_parallel, trace=trace)
+    return pfcsp()
+
+
+def find_checkerboard(
+        image, *,
+        crosssizes=None, angles=None,
+        hit_bound=0.93, min_sharpness=100, run_parallel=False,
+        criteria_max_count=42, criteria_epsilon=0.001, timings=None):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    find the inner checkerboard corners in the image
+
+    :param image: 2 dimensional numpy array describing the image
+    :param crosssizes: list of cross sizes to test, default: [5, 11, 23]
+    :param angles: list of angles to test, default: [0, 45, 90, 135]
+    :param hit_bound: minimal value in the template matching to be a
+                      checkerboard corner
+    :param min_sharpness: minimal sharpness for a good corner
+    :param run_parallel: if set to True will run in parallel; otherwise
+                         no process pool is created at all
+    :param criteria_max_count: parameter for :func:`cv2.cornerSubPix`
+                               to define the maximal count of iterations
+    :param criteria_epsilon: parameter for :func:`cv2.cornerSubPix` to
+                             minimal corner position move between 2 steps
+    :param timings: None or an instance of
+                    :class:`detloclcheck.tools.StageTimings` recording the
+                    stages template_matching, peaks, peak_sharpness and
+                    corner_subpix and the counts peaks, sharp_peaks and
+                    corners (and the tasks of the process pools if it
+                    has a trace)
+
+    Example 1:
+
+    >>> import cv2
+    >>> from detloclcheck import find_checkerboard
+    >>> image = cv2.imread('foo.png')
+    >>> gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    >>> coordinates = find_checkerboard.find_checkerboard(
+    ...    gray_image, crosssizes=[35, 55], min_sharpness=10)
+    >>> import matplotlib.pyplot
+    >>> matplotlib.pyplot.imshow(gray_image, cmap="Greys")
+    >>> matplotlib.pyplot.plot(coordinates[:, 0, 0], coordinates[:, 0, 1],
+    ...                        'r1', markersize=20)
+    >>> matplotlib.pyplot.show()
+    """
+    log = logging.getLogger('detloclcheck.find_checkerboard')
+    if crosssizes is None:
+        crosssizes = [5, 11, 23]
+    if angles is None:
+        angles = [0, 45, 90, 135]
+    if timings is None:
+        timings = StageTimings(enabled=False)
+    _ = map(create_template, crosssizes)
+    start = timings.start()
+    overall_map = _calculate_overall_map(
+        image, crosssizes, angles, run_parallel, timings.trace)
+    log.debug('found template matching maps')
+    start = timings.stop('template_matching', start)
+    approx_coordinates = _find_peaks(overall_map, hit_bound, max(crosssizes))
+    log.debug('found approximated coordinates')
+    start = timings.stop('peaks', start)
+    timings.count('peaks', approx_coordinates.shape[0])
+    # filter blurry corners
+    approx_coordinates = filter_blurry_corners(
+        image, approx_coordinates, crosssizes[0], min_sharpness)
+    start = timings.stop('peak_sharpness', start)
+    n = approx_coordinates.shape[0]
+    timings.count('sharp_peaks', n)
+    if n < 24:
+        log.error(
+            'ERROR: only %i corners detected, '
+            'but we need at least 24 for marker detection',
+            n)
+        return None
+    coordinates = _refine_corners(
+        image, approx_coordinates, run_parallel=run_parallel,
+        criteria_max_count=criteria_max_count,
+        criteria_epsilon=criteria_epsilon, trace=timings.trace)
+    timings.stop('corner_subpix', start)
+    timings.count('corners', coordinates.shape[0])
     log.debug('found %i corners', coordinates.shape[0])
     return coordinates
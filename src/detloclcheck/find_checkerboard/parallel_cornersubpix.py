@@ -1,13 +1,13 @@
-# SPDX-FileCopyrightText: 2024-2025 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-02-24
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024, 2025 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 
 .. currentmodule:: detloclcheck.find_checkerboard.parallel_cornersubpix
 .. autoclass:: ParallelCornerSubPix
@@ -32,6 +32,7 @@
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
 import multiprocessing
+import time
 
 import cv2
 import numpy
@@ -41,16 +42,17 @@ import numpy
 class ParallelCornerSubPix():
     """
     :Author: Daniel Mohr
-    :Date: 2025-02-24
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
     """
     def __init__(self, image, coordinates, window_size, *,
                  zero_zone=(-1, -1),
                  criteria_max_count=42,
-                 criteria_epsilon=0.001):
+                 criteria_epsilon=0.001,
+                 run_parallel=True, trace=None):
         """
         :Author: Daniel Mohr
-        :Date: 2025-02-24
+        :Date: 2026-10-19
         :License: LGPL-3.0-or-later
 
         runs :func:`cv2.cornerSubPix` parallel using
@@ -67,6 +69,12 @@ class ParallelCornerSubPix():
                                    to define the maximal count of iterations
         :param criteria_epsilon: parameter for :func:`cv2.cornerSubPix` to
                                  minimal corner position move between 2 steps
+        :param run_parallel: if set to False, :func:`cv2.cornerSubPix` is
+                             called once in this process (no pool is
+                             created, e. g. inside a worker process)
+        :param trace: None or :class:`detloclcheck.tools.TraceEvents` to
+                      trace the tasks of the process pool and the
+                      reduction
 
         Example:
 
@@ -80,16 +88,34 @@ class ParallelCornerSubPix():
         self.zero_zone = zero_zone
         self.criteria = (cv2.TERM_CRITERIA_EPS + cv2.TermCriteria_COUNT,
                          criteria_max_count, criteria_epsilon)
+        self.run_parallel = run_parallel
+        self.trace = trace
+
+    def __getstate__(self):
+        # the trace stays in this process
+        state = self.__dict__.copy()
+        state['trace'] = None
+        return state
 
     def __call__(self):
+        if not self.run_parallel:
+            return self._fqs(self.coordinates.copy())
         iter_data = numpy.array_split(
             self.coordinates, multiprocessing.cpu_count())
         with multiprocessing.Pool() as pool:
-            map_results = list(pool.map(self._fqs, iter_data))
+            if self.trace is None:
+                map_results = list(pool.map(self._fqs, iter_data))
+            else:
+                map_results = self.trace.map(
+                    pool, self._fqs, iter_data, 'corner_subpix')
+        reduce_start = time.time()
         ncorners = []
         for corners in map_results:
             ncorners.append(corners)
         results = numpy.vstack(ncorners)
+        if self.trace is not None:
+            self.trace.span('corner_subpix reduce', reduce_start, time.time(),
+                            category='reduce')
         return results
 
     def _fqs(self, coordinates):
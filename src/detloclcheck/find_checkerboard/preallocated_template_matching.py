@@ -0,0 +1,208 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+.. currentmodule::
+   detloclcheck.find_checkerboard.preallocated_template_matching
+.. autoclass:: PreallocatedTemplateMatching
+   :members:
+   :special-members: __call__
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import cv2
+import numpy
+
+from .create_template import create_template
+from .find_checkerboard import _find_peaks, _peak_mask
+from .set_black_border import _set_black_border
+
+
+# pylint: disable=too-many-instance-attributes
+class PreallocatedTemplateMatching():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    template matching of images with a fixed shape in preallocated buffers
+
+    The result is the same as the maximum of the template matching maps of
+    :func:`detloclcheck.find_checkerboard.find_checkerboard` (always in
+    this process), but all working buffers (padded and rotated images,
+    the maps of the template matching, the maximum and the mask of the
+    peak search) are allocated once and are reused for every image. The
+    padded image is rotated once for every angle (and not for every
+    combination of cross size and angle).
+
+    Example:
+
+    >>> from detloclcheck.find_checkerboard.preallocated_template_matching \\
+    ...     import PreallocatedTemplateMatching
+    >>> template_matching = PreallocatedTemplateMatching(
+    ...     (480, 640), (11, 23), (0, 45, 90, 135))
+    >>> for frame in frames:
+    ...     overall_map = template_matching(frame)
+    ...     peaks = template_matching.find_peaks(overall_map, 0.93)
+    """
+
+    def __init__(self, shape, crosssizes, angles):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param shape: shape (height, width) of the gray images
+        :param crosssizes: tuple, size of the crosses in the checkerboard
+        :param angles: tuple, a guess of the angle(s) of the crosses
+                       in the checkerboard
+        """
+        self.shape = tuple(shape)
+        self.crosssizes = tuple(crosssizes)
+        self.angles = tuple(angles)
+        self.templates = {crosssize: create_template(crosssize)
+                          for crosssize in self.crosssizes}
+        max_crosssize = max(self.crosssizes)
+        self._border = (max_crosssize, max_crosssize)
+        self.overall_map = numpy.zeros(self.shape, dtype=numpy.float32)
+        self._map = numpy.zeros(self.shape, dtype=numpy.float32)
+        self._peak_mask = _peak_mask(self.shape, max_crosssize)
+        self._mask = self._peak_mask.copy()
+        # results of cv2.matchTemplate for every cross size and image size
+        self._match = {}
+        self._add_match_buffers(self.shape)
+        self._rotations = []
+        if any(angle != 0 for angle in self.angles):
+            diagonal = int(numpy.linalg.norm(self.shape))
+            self._pos = ((diagonal - self.shape[0]) // 2,
+                         (diagonal - self.shape[1]) // 2)
+            self._large_image = numpy.zeros(
+                (diagonal, diagonal), dtype=numpy.uint8)
+            self._rotated_image = numpy.zeros_like(self._large_image)
+            self._large_map = numpy.zeros(
+                (diagonal, diagonal), dtype=numpy.float32)
+            self._unrotated_map = numpy.zeros_like(self._large_map)
+            self._add_match_buffers((diagonal, diagonal))
+            rotate_center = (diagonal / 2, diagonal / 2)
+            self._rotations = [
+                (cv2.getRotationMatrix2D(rotate_center, angle, 1),
+                 cv2.getRotationMatrix2D(rotate_center, -angle, 1))
+                for angle in self.angles if angle != 0]
+
+    def _add_match_buffers(self, shape):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        for crosssize, template in self.templates.items():
+            self._match[(crosssize, shape)] = numpy.zeros(
+                (shape[0] - template.shape[0] + 1,
+                 shape[1] - template.shape[1] + 1), dtype=numpy.float32)
+
+    def _add_map(self, image, map_buffer, crosssize):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        like :func:`detloclcheck.tools.normed_tm_ccorr_normed` in
+        map_buffer
+        """
+        template = self.templates[crosssize]
+        match = self._match[(crosssize, image.shape)]
+        cv2.matchTemplate(image, template, cv2.TM_CCORR_NORMED, match)
+        y0 = template.shape[0] // 2
+        x0 = template.shape[1] // 2
+        numpy.add(match, 1.0, out=match)
+        numpy.multiply(
+            match, 0.5,
+            out=map_buffer[y0:y0 + match.shape[0], x0:x0 + match.shape[1]])
+        # the border outside of the valid region (odd template size) may
+        # contain values of a smaller template
+        _set_black_border(map_buffer, template.shape)
+
+    def _add_maximum(self, template_matching_map):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        _set_black_border(template_matching_map, self._border)
+        numpy.maximum(self.overall_map, template_matching_map,
+                      out=self.overall_map)
+
+    def __call__(self, image):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param image: gray image (uint8) with the shape given at
+                      initialization
+
+        :return: maximum of the template matching maps of all cross sizes
+                 and angles (with black border); this is the buffer
+                 :attr:`overall_map`, which is overwritten by the next call
+        """
+        if image.shape != self.shape:
+            raise ValueError(
+                f'image shape {image.shape} differs from {self.shape}')
+        self.overall_map.fill(0)
+        if 0 in self.angles:
+            for crosssize in self.crosssizes:
+                self._add_map(image, self._map, crosssize)
+                self._add_maximum(self._map)
+        if len(self._rotations) == 0:
+            return self.overall_map
+        pos = self._pos
+        self._large_image[pos[0]:pos[0] + self.shape[0],
+                          pos[1]:pos[1] + self.shape[1]] = image
+        size = self._large_image.shape[::-1]
+        for rotation, unrotation in self._rotations:
+            cv2.warpAffine(self._large_image, rotation, size,
+                           self._rotated_image)
+            for crosssize in self.crosssizes:
+                self._add_map(self._rotated_image, self._large_map, crosssize)
+                cv2.warpAffine(self._large_map, unrotation, size,
+                               self._unrotated_map)
+                self._add_maximum(self._unrotated_map[
+                    pos[0]:pos[0] + self.shape[0],
+                    pos[1]:pos[1] + self.shape[1]])
+        return self.overall_map
+
+    def find_peaks(self, overall_map, hit_bound):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        like :func:`detloclcheck.find_checkerboard.find_checkerboard` with
+        the preallocated mask
+
+        :return: approximated coordinates of the maxima in overall_map
+                 reaching hit_bound as numpy array of shape (n, 1, 2)
+        """
+        numpy.copyto(self._mask, self._peak_mask)
+        return _find_peaks(
+            overall_map, hit_bound, max(self.crosssizes), self._mask)
@@ -0,0 +1,976 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+argument parsers of the sub-commands of :program:`detloclcheck`
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+
+from detloclcheck.scripts.arguments import (
+    check_arg_file, check_arg_positive_int, check_arg_positive_float,
+    add_detection_arguments)
+
+
+def add_find_checkerboard_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command find_checkerboard to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'find_checkerboard',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='For more help: detloclcheck find_checkerboard -h',
+        description='detloclcheck find_checkerboard is a python script for '
+        'detection and localization of a checkerboard calibration target '
+        'containing L-shape marker using template matching.',
+        epilog=epilog)
+    parser.add_argument(
+        '-file',
+        '-f',
+        nargs="+",
+        type=check_arg_file,
+        required=True,
+        dest='file',
+        help='Set the file(s) to use.',
+        metavar='f')
+    parser.add_argument(
+        '-output_format',
+        nargs='+',
+        type=str,
+        choices=['json', 'mat'],
+        required=False,
+        default=None,
+        dest='output_format',
+        help='Set the output format to use. '
+        '"json" will save the result as a json file. '
+        '"mat" will save the result as a MATLAB-style .mat file. '
+        'default: json (none if -result_store or -stdout_format is given)',
+        metavar='f')
+    parser.add_argument(
+        '-result_store',
+        nargs=1,
+        type=str,
+        required=False,
+        default=None,
+        dest='result_store',
+        help='Append the results of all files (including the error codes of '
+        'failed files) to this result store directory instead of writing '
+        'one file per image. Pixel coordinates are stored as float32 and '
+        'lattice indices as int16. The store can be read lazily with '
+        'detloclcheck.batch.ResultStore and by detloclcheck visualize.',
+        metavar='d')
+    parser.add_argument(
+        '-stdout_format',
+        nargs=1,
+        type=str,
+        choices=['none', 'jsonl', 'jsonl_base64'],
+        required=False,
+        default=['none'],
+        dest='stdout_format',
+        help='Stream one compact json record (one line) per image to stdout '
+        'as soon as the image is done (logging is done on stderr). '
+        'A record contains "file" and "status" (0 or the error code) and on '
+        'success "coordinate_system", "zeropoint", "axis1" and "axis2". '
+        '"jsonl" gives the arrays as lists, "jsonl_base64" as dict with '
+        '"dtype", "shape" and base64 encoded "data". Records can be decoded '
+        'with detloclcheck.batch.json_line_to_result. '
+        'default: none',
+        metavar='f')
+    parser.add_argument(
+        '-result_cache',
+        nargs=1,
+        type=str,
+        required=False,
+        default=None,
+        dest='result_cache',
+        help='Cache the results in this directory. The key is a hash of the '
+        'decoded image, all detection parameters and the version of '
+        'DetLocLCheck. Unchanged images are not handled again in a later '
+        'run. Identical images in one run are only handled once with '
+        '-jobs 1; the worker processes of -jobs share only the stored '
+        'results, i. e. identical images handled at the same time are '
+        'handled in each worker.',
+        metavar='d')
+    parser.add_argument(
+        '-manifest',
+        nargs=1,
+        type=str,
+        required=False,
+        default=None,
+        dest='manifest',
+        help='Record the state (pending, done, failed), error code, time and '
+        'outputs of every input in this job manifest (json lines, updated '
+        'atomically). If the manifest exists, only its unfinished inputs and '
+        'new given files are handled, e. g. to continue an interrupted run. '
+        'The detection parameters have to be the same.',
+        metavar='f')
+    parser.add_argument(
+        '-retry_failed',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='retry_failed',
+        help='If set this flag, failed inputs in the manifest are handled '
+        'again.')
+    parser.add_argument(
+        '-work_queue',
+        nargs=1,
+        type=str,
+        required=False,
+        default=None,
+        dest='work_queue',
+        help='Run as worker of this work queue directory, e. g. on a shared '
+        'file system used by several nodes. The given files are added to '
+        'the queue (files already in the queue are ignored) and pending '
+        'files are handled until the queue is finished. Therefore all '
+        'workers can be started with the same command. Files of a dead '
+        'worker are handled again. With -result_store every worker writes '
+        'its own result store in a subdirectory named by the worker.',
+        metavar='d')
+    parser.add_argument(
+        '-work_queue_timeout',
+        nargs=1,
+        type=float,
+        required=False,
+        default=[60.0],
+        dest='work_queue_timeout',
+        help='Seconds without heartbeat after which a worker is dead and '
+        'its files are handled again. default: 60',
+        metavar='s')
+    parser.add_argument(
+        '-json_indent',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[None],
+        dest='json_indent',
+        help='Set the indent in the json output. On default a minimal file '
+        'size is achieved. Setting any numbers will lead to a better human '
+        'readable output with a larger file size. '
+        'default: None',
+        metavar='f')
+    add_detection_arguments(parser)
+    parser.add_argument(
+        '-timings',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='timings',
+        help='If set this flag, the wall and cpu time of every stage of the '
+        'detection and counts (e. g. number of peaks and corners) are '
+        'logged and added as "timings" to the json output and to the '
+        'records on stdout.')
+    parser.add_argument(
+        '-memory',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='memory',
+        help='If set this flag, also the peak memory, the retained memory '
+        'and the growth of the maximal resident set size of every stage are '
+        'recorded (see -timings) using tracemalloc. This slows down the '
+        'detection.')
+    parser.add_argument(
+        '-trace',
+        nargs=1,
+        type=str,
+        required=False,
+        dest='trace',
+        help='If given, the stages of every image and the tasks of the '
+        'process pools (see -run_parallel) are written as trace events '
+        '(chrome://tracing, https://ui.perfetto.dev) to this json file. '
+        'For every task the waiting time in the queue, the computation in '
+        'the worker and the time until collected are shown. This implies '
+        '-timings.',
+        metavar='f')
+    parser.add_argument(
+        '-metrics',
+        nargs=1,
+        type=str,
+        required=False,
+        dest='metrics',
+        help='If given, throughput metrics (handled images by error code, '
+        'histogram of the seconds per image, images per second and worker '
+        'utilization) are written to this file during the run (see '
+        '-metrics_interval) and at the end. The file is replaced '
+        'atomically, e. g. for the textfile collector of the Prometheus '
+        'node exporter.',
+        metavar='f')
+    parser.add_argument(
+        '-metrics_format',
+        nargs=1,
+        type=str,
+        choices=['prometheus', 'json'],
+        required=False,
+        default=['prometheus'],
+        dest='metrics_format',
+        help='Set the format of the metrics file. default: prometheus',
+        metavar='f')
+    parser.add_argument(
+        '-metrics_interval',
+        nargs=1,
+        type=float,
+        required=False,
+        default=[10.0],
+        dest='metrics_interval',
+        help='Minimal seconds between two writes of the metrics file. The '
+        'file is written when an image is done. default: 10',
+        metavar='s')
+    parser.add_argument(
+        '-track',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='track',
+        help='If set this flag, the files are handled as frames of a video '
+        'in the given order: the result of a file (bounding box, axes and '
+        'cross size) is used as prior for the next file. Then only the '
+        'padded bounding box is searched with the cross size and the '
+        'angles of the prior. If this fails or does not fit to the prior, '
+        'the full search is done. Needs -jobs 1 and cannot be combined '
+        'with -work_queue.')
+    parser.add_argument(
+        '-log_file',
+        nargs=1,
+        type=str,
+        required=False,
+        dest='log_file',
+        help='Set the log file. If not given logging is only done on stdout.',
+        metavar='f')
+    parser.add_argument(
+        '-run_parallel',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='run_parallel',
+        help='If set this flag, will try to do things in parallel.')
+    parser.add_argument(
+        '-jobs',
+        nargs=1,
+        type=check_arg_positive_int,
+        required=False,
+        default=[1],
+        dest='jobs',
+        help='Set the number of files handled in parallel by worker '
+        'processes. Results are written as soon as a file is done. '
+        'default: 1',
+        metavar='n')
+    parser.add_argument(
+        '-nesting',
+        nargs=1,
+        type=str,
+        choices=['serial', 'inner'],
+        required=False,
+        default=['serial'],
+        dest='nesting',
+        help='Set the nesting policy for "-jobs" larger than 1. '
+        '"serial" handles each file serially in its worker process '
+        '(-run_parallel is ignored). '
+        '"inner" allows each worker process to do things in parallel if '
+        '-run_parallel is set (this may oversubscribe the cpus). '
+        'default: serial',
+        metavar='p')
+    parser.add_argument(
+        '-prefetch',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[0],
+        dest='prefetch',
+        help='Set the number of images read and decoded ahead in background '
+        'threads. Results are then also written in the background. '
+        'This overlaps image I/O (e. g. on network storage) with the '
+        'detection. It is only used with "-jobs 1". '
+        'default: 0',
+        metavar='k')
+    parser.add_argument(
+        '-decode_reduction',
+        nargs=1,
+        type=int,
+        choices=[1, 2, 4, 8],
+        required=False,
+        default=[1],
+        dest='decode_reduction',
+        help='Decode the images with reduced size as a fast coarse pass. '
+        'Each side of an image is reduced by this factor already during '
+        'decoding, which is much faster for JPEG files. '
+        'The parameters (e. g. -crosssizes) have to fit the reduced images, '
+        'but the results are given in pixel coordinates of the full images. '
+        'default: 1',
+        metavar='r')
+    return parser
+
+
+def add_create_checkerboard_image_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command create_checkerboard_image to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'create_checkerboard_image',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='For more help: detloclcheck create_checkerboard_image -h',
+        description='detloclcheck create_checkerboard_image is a python script'
+        ' to create an artificial image of a checkerboard.',
+        epilog=epilog)
+    parser.add_argument(
+        '-outfile',
+        nargs=1,
+        type=str,
+        required=True,
+        dest='outfile',
+        help='Set the filename to write result image. '
+        'The coordinates will be written to a file with a different postfix.',
+        metavar='f')
+    parser.add_argument(
+        '-output_format',
+        nargs='+',
+        type=str,
+        choices=['json', 'mat'],
+        required=False,
+        default=['json'],
+        dest='output_format',
+        help='Set the output format to use for the coordinates. '
+        '"json" will save the result as a json file. '
+        '"mat" will save the result as a MATLAB-style .mat file. '
+        'default: json',
+        metavar='f')
+    parser.add_argument(
+        '-json_indent',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[None],
+        dest='json_indent',
+        help='Set the indent in the json output. On default a minimal file '
+        'size is achieved. Setting any numbers will lead to a better human '
+        'readable output with a larger file size. '
+        'default: None',
+        metavar='f')
+    parser.add_argument(
+        '-size',
+        nargs=1,
+        type=float,
+        required=False,
+        default=[15.0],
+        dest='size',
+        help='size of a checkerboard field. default: 15.0',
+        metavar='f')
+    parser.add_argument(
+        '-scale',
+        nargs=1,
+        type=float,
+        required=False,
+        default=[1.0],
+        dest='scale',
+        help='scaling factor. default 1.0',
+        metavar='f')
+    parser.add_argument(
+        '-m',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[8],
+        dest='m',
+        help='number rows of checkerboard fields. default: 8',
+        metavar='f')
+    parser.add_argument(
+        '-n',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[8],
+        dest='n',
+        help='number columns of checkerboard fields. default: 8',
+        metavar='f')
+    parser.add_argument(
+        '-zeropoint',
+        nargs=2,
+        type=float,
+        required=False,
+        default=None,
+        dest='zeropoint',
+        help='zeropoint in opencv coordinate. default: [middle of the image]',
+        metavar='f')
+    parser.add_argument(
+        '-integrate_method',
+        nargs=1,
+        type=int,
+        choices=[0, 1, 2],
+        required=False,
+        default=[0],
+        dest='integrate_method',
+        help='Set the method used for integration over one pixel. '
+        '0: no integration. 1: simple Simpson\'s Rule. '
+        '2: use of scipy.integrate.nquad. '
+        'default: 0',
+        metavar='f')
+    parser.add_argument(
+        '-transition_value',
+        nargs=1,
+        type=int,
+        choices=range(256),
+        required=False,
+        default=[128],
+        dest='transition_value',
+        help='Set the transition value between white and black areas. '
+        'For a value of 255 the light areas in the image run out. '
+        'For a value of 0 the reverse effect is simulated. '
+        'default: 128',
+        metavar='f')
+    parser.add_argument(
+        '-homography',
+        nargs=9,
+        type=float,
+        required=False,
+        default=None,
+        dest='homography',
+        help='Set a homography (3x3 matrix in row-major order, OpenCV '
+        'coordinates) mapping the plane of the checkerboard to the image. '
+        'This allows to create rotated or perspective views of the '
+        'checkerboard. The zeropoint is given in the plane of the '
+        'checkerboard. default: [no homography]',
+        metavar='h')
+    return parser
+
+
+def add_create_checkerboard_dataset_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command create_checkerboard_dataset to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'create_checkerboard_dataset',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='For more help: detloclcheck create_checkerboard_dataset -h',
+        description='detloclcheck create_checkerboard_dataset is a python '
+        'script to create many artificial images of checkerboards in '
+        'parallel. The images are described by a json file with exactly one '
+        'of the keys "grid" or "random". "grid" maps parameter names to '
+        'lists of values and all combinations are created, e. g.: '
+        '{"grid": {"size": [15, 23], "angle": [0, 10, 20]}}. '
+        '"random" contains the number of images "count" and maps parameter '
+        'names to a constant, a list of values to choose from, '
+        '{"uniform": [low, high]} or {"randint": [low, high]}, e. g.: '
+        '{"random": {"count": 100, "size": {"uniform": [15, 25]}, '
+        '"noise": [0, 2, 4]}}. '
+        'Possible parameters: m, n, size, dx, dy (move of the zeropoint), '
+        'integrate_method, transition_value, scale, angle, perspective_x, '
+        'perspective_y, blur, noise. '
+        'The images, a manifest and the consolidated ground truth are '
+        'written to the output directory. An interrupted run can be resumed '
+        'by calling it again with the same parameters.',
+        epilog=epilog)
+    parser.add_argument(
+        '-spec',
+        nargs=1,
+        type=check_arg_file,
+        required=True,
+        dest='spec',
+        help='Set the json file describing the images.',
+        metavar='f')
+    parser.add_argument(
+        '-outdir',
+        nargs=1,
+        type=str,
+        required=True,
+        dest='outdir',
+        help='Set the directory to store the images and the results.',
+        metavar='d')
+    parser.add_argument(
+        '-seed',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[0],
+        dest='seed',
+        help='Set the seed for random sampling and noise. The result is '
+        'deterministic for a given seed. default: 0',
+        metavar='i')
+    parser.add_argument(
+        '-processes',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[None],
+        dest='processes',
+        help='Set the number of worker processes. '
+        'default: [number of cpus]',
+        metavar='i')
+    parser.add_argument(
+        '-output_format',
+        nargs='+',
+        type=str,
+        choices=['json', 'mat'],
+        required=False,
+        default=['json'],
+        dest='output_format',
+        help='Set the output format to use for the consolidated ground '
+        'truth. '
+        '"json" will save the result as a json file. '
+        '"mat" will save the result as a MATLAB-style .mat file. '
+        'default: json',
+        metavar='f')
+    parser.add_argument(
+        '-json_indent',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[None],
+        dest='json_indent',
+        help='Set the indent in the json output. On default a minimal file '
+        'size is achieved. Setting any numbers will lead to a better human '
+        'readable output with a larger file size. '
+        'default: None',
+        metavar='f')
+    return parser
+
+
+def add_visualize_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command visualize to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'visualize',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='For more help: detloclcheck visualize -h',
+        description='detloclcheck visualize is a python script'
+        ' to visualize the data found by detloclcheck find_checkerboard.',
+        epilog=epilog)
+    parser.add_argument(
+        dest='data_file_name',
+        nargs='+',
+        type=str,
+        metavar='data',
+        help='Name of the data file(s) to visualize. '
+        'This could be the output of detloclcheck find_checkerboard and a '
+        'json or a mat file or a result store directory (all successful '
+        'results in it are visualized).')
+    parser.add_argument(
+        '-image_file_name',
+        nargs='+',
+        type=str,
+        required=False,
+        dest='image_file_name',
+        metavar='img',
+        help='Name of the image file(s) to visualize.')
+    parser.add_argument(
+        '-subplot',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='dosubplot',
+        help='If set this flag, will plot in subplots.')
+    return parser
+
+
+def add_serve_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command serve to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'serve',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='For more help: detloclcheck serve -h',
+        description='detloclcheck serve is a long-lived detection server. '
+        'The worker processes and caches are kept warm, therefore the time '
+        'per image is only the time of the detection. '
+        'On a Unix socket (-socket) every line is a json request and is '
+        'answered by one json line. '
+        'On localhost (-port) a POST request with the content type '
+        'application/json is a json request and any other content is an '
+        'encoded image (e. g. PNG) named by the path. '
+        'A json request contains "file" (an image file readable by the '
+        'server) or "image" (the base64 encoded content of an image file) '
+        'and optional "name", "id" (copied to the answer) and "binary" '
+        '(see jsonl_base64 of find_checkerboard). The answer is a record '
+        'like from find_checkerboard -stdout_format with the additional key '
+        '"seconds" or a record with the key "error" for an invalid request. '
+        'The server stops on SIGTERM or SIGINT.',
+        epilog=epilog)
+    parser.add_argument(
+        '-socket',
+        nargs=1,
+        type=str,
+        required=False,
+        default=None,
+        dest='socket',
+        help='Listen on this Unix socket.',
+        metavar='f')
+    parser.add_argument(
+        '-port',
+        nargs=1,
+        type=int,
+        required=False,
+        default=None,
+        dest='port',
+        help='Listen for HTTP requests on this port of localhost '
+        '(127.0.0.1). With 0 a free port is used and logged.',
+        metavar='p')
+    parser.add_argument(
+        '-jobs',
+        nargs=1,
+        type=check_arg_positive_int,
+        required=False,
+        default=[1],
+        dest='jobs',
+        help='Set the number of worker processes. They are started once and '
+        'each handles one image at a time. With 1 the images are handled in '
+        'the server process. default: 1',
+        metavar='n')
+    parser.add_argument(
+        '-max_concurrent',
+        nargs=1,
+        type=check_arg_positive_int,
+        required=False,
+        default=None,
+        dest='max_concurrent',
+        help='Set the maximal number of requests handled at once. Further '
+        'requests wait. default: [-jobs]',
+        metavar='n')
+    add_detection_arguments(parser)
+    parser.add_argument(
+        '-timings',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='timings',
+        help='If set this flag, the wall and cpu time of every stage of the '
+        'detection and counts (e. g. number of peaks and corners) are '
+        'added as "timings" to the answers.')
+    parser.add_argument(
+        '-memory',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='memory',
+        help='If set this flag, also the peak memory, the retained memory '
+        'and the growth of the maximal resident set size of every stage are '
+        'added (see -timings) using tracemalloc. This slows down the '
+        'detection. The memory of a stage is only valid for one request '
+        'at a time per process, therefore with -jobs 1 also '
+        '-max_concurrent 1 is necessary.')
+    parser.add_argument(
+        '-result_cache',
+        nargs=1,
+        type=str,
+        required=False,
+        default=None,
+        dest='result_cache',
+        help='Cache the results in this directory (see find_checkerboard).',
+        metavar='d')
+    parser.add_argument(
+        '-decode_reduction',
+        nargs=1,
+        type=int,
+        choices=[1, 2, 4, 8],
+        required=False,
+        default=[1],
+        dest='decode_reduction',
+        help='Decode the images with reduced size (see find_checkerboard). '
+        'default: 1',
+        metavar='r')
+    parser.add_argument(
+        '-log_file',
+        nargs=1,
+        type=str,
+        required=False,
+        dest='log_file',
+        help='Set the log file. If not given logging is only done on stdout.',
+        metavar='f')
+    return parser
+
+
+def add_video_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command video to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'video',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='For more help: detloclcheck video -h',
+        description='detloclcheck video detects and localizes the '
+        'checkerboard in every frame of video files (read by '
+        'cv2.VideoCapture, e. g. MP4). The full detection is done only on '
+        'keyframes; in the frames in between the labelled corners are '
+        'tracked by pyramidal Lucas-Kanade optical flow and refined by '
+        'cv2.cornerSubPix. A new keyframe is detected after '
+        '-keyframe_interval frames or if the track is lost. For every frame '
+        'a record like from find_checkerboard -stdout_format with the '
+        'additional keys "frame" (index), "seconds" (position in the video) '
+        'and "source" ("keyframe" or "tracked") is written to stdout as '
+        'soon as the frame is done (logging is done on stderr).',
+        epilog=epilog)
+    parser.add_argument(
+        '-file',
+        '-f',
+        nargs="+",
+        type=check_arg_file,
+        required=True,
+        dest='file',
+        help='Set the video file(s) to use.',
+        metavar='f')
+    add_detection_arguments(parser)
+    parser.add_argument(
+        '-keyframe_interval',
+        nargs=1,
+        type=check_arg_positive_int,
+        required=False,
+        default=[30],
+        dest='keyframe_interval',
+        help='Set the maximal number of frames from one keyframe to the '
+        'next one. With 1 every frame is a keyframe. default: 30',
+        metavar='n')
+    parser.add_argument(
+        '-min_tracked',
+        nargs=1,
+        type=float,
+        required=False,
+        default=[0.8],
+        dest='min_tracked',
+        help='The track is lost (and a new keyframe is detected) if less '
+        'than this fraction of the corners of the last keyframe is '
+        'tracked. default: 0.8',
+        metavar='x')
+    parser.add_argument(
+        '-prefetch',
+        nargs=1,
+        type=int,
+        required=False,
+        default=[2],
+        dest='prefetch',
+        help='Set the number of frames read and decoded ahead in a '
+        'background thread. default: 2',
+        metavar='k')
+    parser.add_argument(
+        '-stdout_format',
+        nargs=1,
+        type=str,
+        choices=['none', 'jsonl', 'jsonl_base64'],
+        required=False,
+        default=['jsonl'],
+        dest='stdout_format',
+        help='Set the format of the records on stdout (see '
+        'find_checkerboard). default: jsonl',
+        metavar='f')
+    parser.add_argument(
+        '-run_parallel',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='run_parallel',
+        help='If set this flag, will try to do things in parallel during '
+        'the detection of keyframes.')
+    parser.add_argument(
+        '-log_file',
+        nargs=1,
+        type=str,
+        required=False,
+        dest='log_file',
+        help='Set the log file. If not given logging is only done on stdout.',
+        metavar='f')
+    return parser
+
+
+def add_benchmark_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command benchmark to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'benchmark',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='For more help: detloclcheck benchmark -h',
+        description='detloclcheck benchmark measures the time of every '
+        'stage of the detection (template matching, peaks, corners, '
+        'filtering of blurry corners, coordinate system) and of the whole '
+        'detection in synthetic 4:3 checkerboard images for all '
+        'combinations of the given image sizes, square sizes and '
+        'rotations. The minimal and the median time of the repetitions are '
+        'stored together with the environment (machine, versions) in a '
+        'json file. With -compare the minimal times (and the peak memory) '
+        'are compared to a '
+        'former json file (same image size, square size and rotation) and '
+        'the exit code is 1 if a stage is slower than allowed by '
+        '-tolerance.',
+        epilog=epilog)
+    parser.add_argument(
+        '-megapixel',
+        nargs='+',
+        type=check_arg_positive_float,
+        required=False,
+        default=[1, 12],
+        dest='megapixel',
+        help='Set the image sizes in megapixel. default: 1 12',
+        metavar='mp')
+    parser.add_argument(
+        '-square_size',
+        nargs='+',
+        type=check_arg_positive_int,
+        required=False,
+        default=[15, 31],
+        dest='square_size',
+        help='Set the sizes of the checkerboard squares in pixel. Together '
+        'with the image size this gives the number of corners. '
+        'default: 15 31',
+        metavar='s')
+    parser.add_argument(
+        '-rotation',
+        nargs='+',
+        type=float,
+        required=False,
+        default=[0, 30],
+        dest='rotation',
+        help='Set the rotations of the checkerboard in degree. '
+        'default: 0 30',
+        metavar='a')
+    parser.add_argument(
+        '-repeat',
+        nargs=1,
+        type=check_arg_positive_int,
+        required=False,
+        default=[3],
+        dest='repeat',
+        help='Set how often every measurement is repeated. default: 3',
+        metavar='n')
+    add_detection_arguments(parser)
+    parser.add_argument(
+        '-memory',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='memory',
+        help='If set this flag, the peak memory of every stage is measured '
+        'in an additional run using tracemalloc (see find_checkerboard '
+        '-memory) and compared like the times (with at least 1 MiB '
+        'difference for a regression).')
+    parser.add_argument(
+        '-import_time',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='import_time',
+        help='If set this flag, also the import of the command line script '
+        'and of the modules of the sub-commands is measured in new python '
+        'processes (see -repeat) and compared like the times (with at '
+        'least 10 ms difference for a regression). The start of '
+        'detloclcheck should not import cv2, numpy or scipy.')
+    parser.add_argument(
+        '-json',
+        nargs=1,
+        type=str,
+        required=False,
+        default=None,
+        dest='json',
+        help='Write the results to this json file.',
+        metavar='f')
+    parser.add_argument(
+        '-compare',
+        nargs=1,
+        type=check_arg_file,
+        required=False,
+        default=None,
+        dest='compare',
+        help='Compare the results with this json file of a former run '
+        '(the baseline).',
+        metavar='f')
+    parser.add_argument(
+        '-tolerance',
+        nargs=1,
+        type=float,
+        required=False,
+        default=[0.2],
+        dest='tolerance',
+        help='A stage is a regression if its time (peak memory) is larger '
+        'than (1 + tolerance) times the value of the baseline plus 1 ms '
+        '(1 MiB). '
+        'default: 0.2',
+        metavar='x')
+    parser.add_argument(
+        '-log_file',
+        nargs=1,
+        type=str,
+        required=False,
+        dest='log_file',
+        help='Set the log file. If not given logging is only done on stdout.',
+        metavar='f')
+    return parser
+
+
+def add_version_parser(subparsers, epilog):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the sub-command version to subparsers
+
+    :return: the parser of the sub-command
+    """
+    parser = subparsers.add_parser(
+        'version',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        help='return version of DetLocLCheck',
+        description='display version information of DetLocLCheck',
+        epilog=epilog)
+    return parser
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+
+checks of the arguments of :program:`detloclcheck` and arguments shared by
+several sub-commands
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import logging
+import os
+
+
+def check_arg_file(data):
+    """
+    :Author: Daniel Mohr
+    :Date: 2024-07-01
+    :License: LGPL-3.0-or-later
+    """
+    log = logging.getLogger('detloclcheck.check_arg_file')
+    log.debug('handle file "%s"', data)
+    if not os.path.isfile(data):
+        msg = f'"{data}" is not a file'
+        raise argparse.ArgumentTypeError(msg)
+    return data
+
+
+def check_arg_positive_int(data):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    data = int(data)
+    if data < 1:
+        msg = f'"{data}" is not a positive integer'
+        raise argparse.ArgumentTypeError(msg)
+    return data
+
+
+def check_arg_positive_float(data):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    data = float(data)
+    if not 0 < data < float('inf'):
+        msg = f'"{data}" is not a positive number'
+        raise argparse.ArgumentTypeError(msg)
+    return data
+
+
+def check_arg_crosssizes(data):
+    """
+    :Author: Daniel Mohr
+    :Date: 2024-07-01
+    :License: LGPL-3.0-or-later
+    """
+    log = logging.getLogger('detloclcheck.check_arg_crosssizes')
+    log.debug('check crosssize "%s"', data)
+    try:
+        data = int(data)
+    except ValueError:
+        msg = f'"{data}" can not be interpreted as int'
+        # pylint: disable=raise-missing-from
+        raise argparse.ArgumentTypeError(msg)
+    if data % 2 == 0:
+        msg = f'"{data}" is not odd'
+        raise argparse.ArgumentTypeError(msg)
+    return data
+
+
+def add_detection_arguments(parser):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the arguments of the detection parameters to the parser
+    """
+    parser.add_argument(
+        '-crosssizes',
+        nargs="+",
+        type=check_arg_crosssizes,
+        required=False,
+        default=(11, 23),
+        dest='crosssizes',
+        help='Set a list of cross sizes to test. You can use odd integers. '
+        'This is used during template matching. default: 11, 23',
+        metavar='s')
+    parser.add_argument(
+        '-angles',
+        nargs="+",
+        type=check_arg_crosssizes,
+        required=False,
+        default=(0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5),
+        dest='angles',
+        help='Set a list of angles to test. '
+        'This is used during template matching. '
+        'default: 0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5',
+        metavar='a')
+    parser.add_argument(
+        '-hit_bound',
+        nargs=1,
+        type=float,
+        required=False,
+        default=[0.93],
+        dest='hit_bound',
+        help='This value is used during template matching. A checkerboard '
+        'corner has to reach at least this value. default: 0.93',
+        metavar='x')
+    parser.add_argument(
+        '-min_sharpness',
+        nargs=3,
+        type=float,
+        required=False,
+        default=(100, 500, 1000),
+        dest='min_sharpness',
+        help='At 3 steps blurry corners are removed. These list of values '
+        'define the minimal sharpness for a good corner and others are '
+        'intepreted as blurry. default: 100, 500, 1000',
+        metavar='x')
+    parser.add_argument(
+        '-max_distance_factor_range',
+        nargs="+",
+        type=float,
+        required=False,
+        default=(1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.),
+        dest='max_distance_factor_range',
+        help='Set the possible maximal distance factors. Typically it is '
+        'assumed that the x size and y size of a checkerboard cell is equal. '
+        'But if the checkerboard is rotated against the focus plane then '
+        'other x/y are possible. This list defines which factors are maximal '
+        'allowed. We try first to find the coordinate axis with the maximal '
+        'the first factor. If this is not possible, we take the next and so '
+        'on. default: 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.',
+        metavar='x')
+    parser.add_argument(
+        '-fallback',
+        default=False,
+        required=False,
+        action='store_true',
+        dest='fallback',
+        help='If set this flag, on the error codes 1, 2, 3, 5 and 7 the '
+        'detection is repeated with looser parameters (hit_bound, '
+        'min_sharpness, max_distance_factor_range) step by step. The '
+        'template matching is not repeated. The steps are given by '
+        'detloclcheck.detect_localize_checkerboard.DEFAULT_FALLBACK_LADDER.')
+
+
+def detection_parameters(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :param args: parsed arguments added by :func:`add_detection_arguments`
+
+    :return: dict of keyword arguments for
+             :func:`detloclcheck.detect_localize_checkerboard.\
+detect_localize_checkerboard`
+    """
+    # pylint: disable=import-outside-toplevel
+    from detloclcheck.detect_localize_checkerboard import \
+        DEFAULT_FALLBACK_LADDER
+    parameters = {
+        'crosssizes': args.crosssizes,
+        'angles': args.angles,
+        'hit_bound': args.hit_bound[0],
+        'min_sharpness': args.min_sharpness,
+        'max_distance_factor_range': args.max_distance_factor_range}
+    if args.fallback:
+        parameters['fallback'] = DEFAULT_FALLBACK_LADDER
+    return parameters
@@ -1,11 +1,11 @@
-# SPDX-FileCopyrightText: 2024-2025 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-06-27
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
 """
 # This file is part of DetLocLCheck.
@@ -24,6 +24,8 @@
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
+import functools
+import importlib
 import importlib.metadata
 import json
 import logging
@@ -31,76 +33,49 @@ import logging.handlers
 import os
 import sys
 
-import cv2
-import numpy
-import scipy.io
+from detloclcheck.scripts import argument_parsers
+# imported for backward compatibility
+from detloclcheck.scripts.arguments import (  # pylint: disable=unused-import
+    check_arg_file)  # noqa: F401
+# cv2, numpy, scipy and the detection are imported by the sub-commands
+# needing them; the start (e. g. version, -h or wrong arguments) is fast
 
-from detloclcheck.create_checkerboard_image import create_checkerboard_image
-from detloclcheck.detect_localize_checkerboard import \
-    detect_localize_checkerboard
 
-
-def run_find_checkerboard(args):
+def _run_module(name, args):
     """
     :Author: Daniel Mohr
-    :Date: 2025-02-24
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
+
+    import the module detloclcheck.scripts.<name> and run its function
+    <name>
+
+    :return: the exit code of the function
     """
-    errorcode = 0
-    log = logging.getLogger('detloclcheck.run_find_checkerboard')
-    for filename in args.file:
-        log.info('handle file "%s"', filename)
-        image = cv2.imread(filename)
-        if image is None:
-            log.error('file "%s" cannot be read as image', filename)
-            return 1
-        gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        coordinate_system, zeropoint, axis1, axis2 = \
-            detect_localize_checkerboard(
-                gray_image, args.crosssizes, args.angles,
-                hit_bound=args.hit_bound[0],
-                min_sharpness=args.min_sharpness,
-                run_parallel=args.run_parallel,
-                max_distance_factor_range=args.max_distance_factor_range,
-                log=None)
-        if coordinate_system is None:
-            log.error(
-                'ERROR %i during handling file "%s"', zeropoint, filename)
-            errorcode += zeropoint
-            continue
-        for output_format in args.output_format:
-            output_filename = \
-                os.path.splitext(filename)[0] + '.' + output_format
-            if output_format == 'json':
-                with open(output_filename, 'w', encoding='utf8') as fd:
-                    json.dump(
-                        {'coordinate_system': coordinate_system.tolist(),
-                         'zeropoint': zeropoint.tolist(),
-                         'axis1': axis1.tolist(), 'axis2': axis2.tolist()},
-                        fd, indent=args.json_indent[0])
-            if output_format == 'mat':
-                scipy.io.savemat(
-                    output_filename,
-                    {'coordinate_system': coordinate_system,
-                     'zeropoint': zeropoint,
-                     'axis1': axis1, 'axis2': axis2})
-            log.info('wrote result with %i good corners to "%s"',
-                     coordinate_system.shape[0],
-                     output_filename)
-    return errorcode
+    module = importlib.import_module(f'detloclcheck.scripts.{name}')
+    return getattr(module, name)(args)
 
 
 def run_create_checkerboard_image(args):
     """
     :Author: Daniel Mohr
-    :Date: 2025-02-24
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
     """
+    # pylint: disable=import-outside-toplevel
+    import cv2
+    import numpy
+    from detloclcheck.create_checkerboard_image import \
+        create_checkerboard_image
     log = logging.getLogger('detloclcheck.run_create_checkerboard_image')
+    homography = None
+    if args.homography is not None:
+        homography = numpy.array(args.homography).reshape((3, 3))
     zeropoint, coordinates, image = create_checkerboard_image(
         args.m[0], args.n[0], args.size[0],
         zeropoint=args.zeropoint, integrate_method=args.integrate_method[0],
-        transition_value=args.transition_value[0], scale=args.scale[0])
+        transition_value=args.transition_value[0], scale=args.scale[0],
+        homography=homography)
     cv2.imwrite(args.outfile[0], image)
     for output_format in args.output_format:
         output_filename = \
@@ -113,6 +88,7 @@ def run_create_checkerboard_image(args):
                      'zeropoint': zeropoint},
                     fd, indent=args.json_indent[0])
         if args.output_format[0] == 'mat':
+            import scipy.io
             scipy.io.savemat(
                 output_filename,
                 {'coordinates': coordinates,
@@ -121,51 +97,123 @@ def run_create_checkerboard_image(args):
     return 0
 
 
+def run_create_checkerboard_dataset(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    # pylint: disable=import-outside-toplevel
+    from detloclcheck.create_checkerboard_image import \
+        create_checkerboard_dataset
+    log = logging.getLogger('detloclcheck.run_create_checkerboard_dataset')
+    with open(args.spec[0], 'r', encoding='utf8') as fd:
+        spec = json.load(fd)
+    try:
+        manifest = create_checkerboard_dataset(
+            spec, args.outdir[0], seed=args.seed[0],
+            processes=args.processes[0], output_format=args.output_format,
+            json_indent=args.json_indent[0])
+    except ValueError as error:
+        log.error('ERROR: %s', error)
+        return 1
+    log.info('dataset with %i images in "%s"',
+             len(manifest['items']), args.outdir[0])
+    return 0
+
+
+def _load_visualize_data(data_file_name):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :param data_file_name: json or mat file or a result store directory
+
+    :return: list of (coordinate_system, zeropoint, axis1, axis2) or None
+             if the file extension is unknown; for a result store the list
+             has one entry per image in the order of the store and the
+             entry of a failed image is None
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy
+    from detloclcheck.batch import ResultStore
+    log = logging.getLogger('detloclcheck.run_visualize')
+    if os.path.isdir(data_file_name):
+        data = []
+        result_store = ResultStore(data_file_name)
+        for i, filename in enumerate(result_store.filenames):
+            if result_store.status[i] != 0:
+                # keep the position to stay in line with -image_file_name
+                log.warning('skip "%s" with error %i',
+                            filename, result_store.status[i])
+                data.append(None)
+                continue
+            log.debug('use "%s" from "%s"', filename, data_file_name)
+            data.append(result_store[i])
+        result_store.close()
+        return data
+    _, file_extension = os.path.splitext(data_file_name)
+    if file_extension.lower() == '.json':
+        with open(data_file_name, 'r', encoding='utf8') as fd:
+            data = json.load(fd)
+            coordinate_system = numpy.array(data['coordinate_system'])
+            zeropoint = numpy.array(data['zeropoint'])
+    elif file_extension.lower() == '.mat':
+        import scipy.io
+        data = scipy.io.loadmat(data_file_name)
+        coordinate_system = data['coordinate_system']
+        zeropoint = numpy.reshape(data['zeropoint'], (2,))
+    else:
+        log.error('ERROR: do not understand file extension "%s"',
+                  file_extension)
+        return None
+    return [(coordinate_system, zeropoint, data['axis1'], data['axis2'])]
+
+
 def run_visualize(args):
     """
     :Author: Daniel Mohr
-    :Date: 2025-06-27
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
     """
-    # pylint: disable=import-outside-toplevel,too-many-branches,too-many-locals
+    # pylint: disable=import-outside-toplevel,too-many-locals
+    # pylint: disable=too-many-branches
+    import cv2
     import matplotlib.pyplot
+    import numpy
     log = logging.getLogger('detloclcheck.run_visualize')
+    data = []
+    for data_file_name in args.data_file_name:
+        log.debug('read "%s"', data_file_name)
+        file_data = _load_visualize_data(data_file_name)
+        if file_data is None:
+            return 1
+        data += file_data
+    if all(file_data is None for file_data in data):
+        # e. g. an empty result store
+        log.error('ERROR: no results to visualize')
+        return 1
     if args.dosubplot:
-        ncolumns = int(numpy.sqrt(len(args.data_file_name)))
-        nrows = int(numpy.ceil(len(args.data_file_name) / ncolumns))
-        if ncolumns * nrows < len(args.data_file_name):
+        ncolumns = int(numpy.sqrt(len(data)))
+        nrows = int(numpy.ceil(len(data) / ncolumns))
+        if ncolumns * nrows < len(data):
             raise ValueError(
                 "something went wrong in 'run_visualize': "
-                f"{ncolumns * nrows} < {len(args.data_file_name)}")
-    for fid, data_file_name in enumerate(args.data_file_name):
+                f"{ncolumns * nrows} < {len(data)}")
+    for fid, file_data in enumerate(data):
+        if file_data is None:
+            # failed image in a result store
+            continue
+        coordinate_system, zeropoint, axis1, axis2 = file_data
         if args.dosubplot:
             matplotlib.pyplot.subplot(
                 nrows, ncolumns, 1 + fid)
-        visualize_image = False
+        log.debug('axis1: %s', axis1)
+        log.debug('axis2: %s', axis2)
         if ((args.image_file_name is not None) and
                 (fid < len(args.image_file_name))):
-            visualize_image = True
-            log.debug('visualize "%s" with with"%s"',
-                      data_file_name, args.image_file_name[fid])
-        else:
-            log.debug('visualize "%s"', data_file_name)
-        _, file_extension = os.path.splitext(data_file_name)
-        if file_extension.lower() == '.json':
-            with open(data_file_name, 'r', encoding='utf8') as fd:
-                data = json.load(fd)
-                coordinate_system = numpy.array(data['coordinate_system'])
-                zeropoint = numpy.array(data['zeropoint'])
-        elif file_extension.lower() == '.mat':
-            data = scipy.io.loadmat(data_file_name)
-            coordinate_system = data['coordinate_system']
-            zeropoint = numpy.reshape(data['zeropoint'], (2,))
-        else:
-            log.error('ERROR: do not understand file extension "%s"',
-                      file_extension)
-            return 1
-        log.debug('axis1: %s', data['axis1'])
-        log.debug('axis2: %s', data['axis2'])
-        if visualize_image:
+            log.debug('visualize with "%s"', args.image_file_name[fid])
             gray_image = cv2.imread(
                 args.image_file_name[fid], cv2.COLOR_BGR2GRAY)
             matplotlib.pyplot.imshow(gray_image, cmap="gray")
@@ -203,52 +251,24 @@ def run_version(_):
     return 0
 
 
-def check_arg_file(data):
-    """
-    :Author: Daniel Mohr
-    :Date: 2024-07-01
-    :License: LGPL-3.0-or-later
-    """
-    log = logging.getLogger('detloclcheck.check_arg_file')
-    log.debug('handle file "%s"', data)
-    if not os.path.isfile(data):
-        msg = f'"{data}" is not a file'
-        raise argparse.ArgumentTypeError(msg)
-    return data
-
-
-def check_arg_crosssizes(data):
-    """
-    :Author: Daniel Mohr
-    :Date: 2024-07-01
-    :License: LGPL-3.0-or-later
-    """
-    log = logging.getLogger('detloclcheck.check_arg_crosssizes')
-    log.debug('check crosssize "%s"', data)
-    try:
-        data = int(data)
-    except ValueError:
-        msg = f'"{data}" can not be interpreted as int'
-        # pylint: disable=raise-missing-from
-        raise argparse.ArgumentTypeError(msg)
-    if data % 2 == 0:
-        msg = f'"{data}" is not odd'
-        raise argparse.ArgumentTypeError(msg)
-    return data
-
-
 def my_argument_parser():
     """
     :Author: Daniel Mohr
-    :Date: 2025-04-11
+    :Date: 2026-10-19
     :License: LGPL-3.0-or-later
     """
     epilog = "Example:\n\n"
     epilog += "detloclcheck create_checkerboard_image -outfile foo.png\n"
+    epilog += "detloclcheck create_checkerboard_dataset -spec spec.json " \
+        "-outdir dataset\n"
     epilog += "detloclcheck find_checkerboard -f foo.png\n"
-    epilog += "detloclcheck visualize foo.json -i foo.png\n\n"
+    epilog += "detloclcheck find_checkerboard -f *.png -jobs 4\n"
+    epilog += "detloclcheck serve -socket /tmp/detloclcheck.sock -jobs 2\n"
+    epilog += "detloclcheck video -f foo.mp4 > foo.jsonl\n"
+    epilog += "detloclcheck visualize foo.json -i foo.png\n"
+    epilog += "detloclcheck benchmark -json new.json -compare old.json\n\n"
     epilog += "Author: Daniel Mohr\n"
-    epilog += "Date: 2025-04-11\n"
+    epilog += "Date: 2026-10-19\n"
     epilog += "DetLocLCheck Version: "
     epilog += importlib.metadata.version(
         __package__.split('.', maxsplit=1)[0]) + "\n"
@@ -262,276 +282,26 @@ def my_argument_parser():
     subparsers = parser.add_subparsers(
         dest='subparser_name',
         help='There are different sub-commands with there own flags.')
-    # subparser find_checkerboard
-    parser_find_checkerboard = subparsers.add_parser(
-        'find_checkerboard',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        help='For more help: detloclcheck find_checkerboard -h',
-        description='detloclcheck find_checkerboard is a python script for '
-        'detection and localization of a checkerboard calibration target '
-        'containing L-shape marker using template matching.',
-        epilog=epilog)
-    parser_find_checkerboard.set_defaults(func=run_find_checkerboard)
-    parser_find_checkerboard.add_argument(
-        '-file',
-        nargs="+",
-        type=check_arg_file,
-        required=True,
-        dest='file',
-        help='Set the file(s) to use.',
-        metavar='f')
-    parser_find_checkerboard.add_argument(
-        '-output_format',
-        nargs='+',
-        type=str,
-        choices=['json', 'mat'],
-        required=False,
-        default=['json'],
-        dest='output_format',
-        help='Set the output format to use. '
-        '"json" will save the result as a json file. '
-        '"mat" will save the result as a MATLAB-style .mat file. '
-        'default: json',
-        metavar='f')
-    parser_find_checkerboard.add_argument(
-        '-json_indent',
-        nargs=1,
-        type=int,
-        required=False,
-        default=[None],
-        dest='json_indent',
-        help='Set the indent in the json output. On default a minimal file '
-        'size is achieved. Setting any numbers will lead to a better human '
-        'readable output with a larger file size. '
-        'default: None',
-        metavar='f')
-    parser_find_checkerboard.add_argument(
-        '-crosssizes',
-        nargs="+",
-        type=check_arg_crosssizes,
-        required=False,
-        default=(11, 23),
-        dest='crosssizes',
-        help='Set a list of cross sizes to test. You can use odd integers. '
-        'This is used during template matching. default: 11, 23',
-        metavar='s')
-    parser_find_checkerboard.add_argument(
-        '-angles',
-        nargs="+",
-        type=check_arg_crosssizes,
-        required=False,
-        default=(0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5),
-        dest='angles',
-        help='Set a list of angles to test. '
-        'This is used during template matching. '
-        'default: 0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5',
-        metavar='a')
-    parser_find_checkerboard.add_argument(
-        '-hit_bound',
-        nargs=1,
-        type=float,
-        required=False,
-        default=[0.93],
-        dest='hit_bound',
-        help='This value is used during template matching. A checkerboard '
-        'corner has to reach at least this value. default: 0.93',
-        metavar='x')
-    parser_find_checkerboard.add_argument(
-        '-min_sharpness',
-        nargs=3,
-        type=float,
-        required=False,
-        default=(100, 500, 1000),
-        dest='min_sharpness',
-        help='At 3 steps blurry corners are removed. These list of values '
-        'define the minimal sharpness for a good corner and others are '
-        'intepreted as blurry. default: 100, 500, 1000',
-        metavar='x')
-    parser_find_checkerboard.add_argument(
-        '-max_distance_factor_range',
-        nargs="+",
-        type=float,
-        required=False,
-        default=(1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.),
-        dest='max_distance_factor_range',
-        help='Set the possible maximal distance factors. Typically it is '
-        'assumed that the x size and y size of a checkerboard cell is equal. '
-        'But if the checkerboard is rotated against the focus plane then '
-        'other x/y are possible. This list defines which factors are maximal '
-        'allowed. We try first to find the coordinate axis with the maximal '
-        'the first factor. If this is not possible, we take the next and so '
-        'on. default: 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.',
-        metavar='x')
-    parser_find_checkerboard.add_argument(
-        '-log_file',
-        nargs=1,
-        type=str,
-        required=False,
-        dest='log_file',
-        help='Set the log file. If not given logging is only done on stdout.',
-        metavar='f')
-    parser_find_checkerboard.add_argument(
-        '-run_parallel',
-        default=False,
-        required=False,
-        action='store_true',
-        dest='run_parallel',
-        help='If set this flag, will try to do things in parallel.')
-    # subparser create_checkerboard_image
-    parser_create_checkerboard_image = subparsers.add_parser(
-        'create_checkerboard_image',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        help='For more help: detloclcheck create_checkerboard_image -h',
-        description='detloclcheck create_checkerboard_image is a python script'
-        ' to create an artificial image of a checkerboard.',
-        epilog=epilog)
-    parser_create_checkerboard_image.set_defaults(
-        func=run_create_checkerboard_image)
-    parser_create_checkerboard_image.add_argument(
-        '-outfile',
-        nargs=1,
-        type=str,
-        required=True,
-        dest='outfile',
-        help='Set the filename to write result image. '
-        'The coordinates will be written to a file with a different postfix.',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-output_format',
-        nargs='+',
-        type=str,
-        choices=['json', 'mat'],
-        required=False,
-        default=['json'],
-        dest='output_format',
-        help='Set the output format to use for the coordinates. '
-        '"json" will save the result as a json file. '
-        '"mat" will save the result as a MATLAB-style .mat file. '
-        'default: json',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-json_indent',
-        nargs=1,
-        type=int,
-        required=False,
-        default=[None],
-        dest='json_indent',
-        help='Set the indent in the json output. On default a minimal file '
-        'size is achieved. Setting any numbers will lead to a better human '
-        'readable output with a larger file size. '
-        'default: None',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-size',
-        nargs=1,
-        type=float,
-        required=False,
-        default=[15.0],
-        dest='size',
-        help='size of a checkerboard field. default: 15.0',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-scale',
-        nargs=1,
-        type=float,
-        required=False,
-        default=[1.0],
-        dest='scale',
-        help='scaling factor. default 1.0',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-m',
-        nargs=1,
-        type=int,
-        required=False,
-        default=[8],
-        dest='m',
-        help='number rows of checkerboard fields. default: 8',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-n',
-        nargs=1,
-        type=int,
-        required=False,
-        default=[8],
-        dest='n',
-        help='number columns of checkerboard fields. default: 8',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-zeropoint',
-        nargs=2,
-        type=float,
-        required=False,
-        default=None,
-        dest='zeropoint',
-        help='zeropoint in opencv coordinate. default: [middle of the image]',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-integrate_method',
-        nargs=1,
-        type=int,
-        choices=[0, 1, 2],
-        required=False,
-        default=[0],
-        dest='integrate_method',
-        help='Set the method used for integration over one pixel. '
-        '0: no integration. 1: simple Simpson\'s Rule. '
-        '2: use of scipy.integrate.nquad. '
-        'default: 0',
-        metavar='f')
-    parser_create_checkerboard_image.add_argument(
-        '-transition_value',
-        nargs=1,
-        type=int,
-        choices=range(256),
-        required=False,
-        default=[128],
-        dest='transition_value',
-        help='Set the transition value between white and black areas. '
-        'For a value of 255 the light areas in the image run out. '
-        'For a value of 0 the reverse effect is simulated. '
-        'default: 128',
-        metavar='f')
-    parser_visualize = subparsers.add_parser(
-        'visualize',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        help='For more help: detloclcheck visualize -h',
-        description='detloclcheck visualize is a python script'
-        ' to visualize the data found by detloclcheck find_checkerboard.',
-        epilog=epilog)
-    parser_visualize.set_defaults(
-        func=run_visualize)
-    parser_visualize.add_argument(
-        dest='data_file_name',
-        nargs='+',
-        type=str,
-        metavar='data',
-        help='Name of the data file(s) to visualize. '
-        'This could be the output of detloclcheck find_checkerboard and a '
-        'json or a mat file.')
-    parser_visualize.add_argument(
-        '-image_file_name',
-        nargs='+',
-        type=str,
-        required=False,
-        dest='image_file_name',
-        metavar='img',
-        help='Name of the image file(s) to visualize.')
-    parser_visualize.add_argument(
-        '-subplot',
-        default=False,
-        required=False,
-        action='store_true',
-        dest='dosubplot',
-        help='If set this flag, will plot in subplots.')
-    parser_version = subparsers.add_parser(
-        'version',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        help='return version of DetLocLCheck',
-        description='display version information of DetLocLCheck',
-        epilog=epilog)
-    parser_version.set_defaults(
-        func=run_version)
+    # sub-commands running a function of this module or of the module of
+    # the same name (imported only when needed)
+    for add_parser, func in (
+            (argument_parsers.add_find_checkerboard_parser,
+             functools.partial(_run_module, 'run_find_checkerboard')),
+            (argument_parsers.add_create_checkerboard_image_parser,
+             run_create_checkerboard_image),
+            (argument_parsers.add_create_checkerboard_dataset_parser,
+             run_create_checkerboard_dataset),
+            (argument_parsers.add_visualize_parser,
+             run_visualize),
+            (argument_parsers.add_serve_parser,
+             functools.partial(_run_module, 'run_serve')),
+            (argument_parsers.add_video_parser,
+             functools.partial(_run_module, 'run_video')),
+            (argument_parsers.add_benchmark_parser,
+             functools.partial(_run_module, 'run_benchmark')),
+            (argument_parsers.add_version_parser,
+             run_version)):
+        add_parser(subparsers, epilog).set_defaults(func=func)
     return parser
 
 
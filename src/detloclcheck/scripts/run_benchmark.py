@@ -0,0 +1,436 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+
+implementation of the sub-command benchmark of the script detloclcheck
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import datetime
+import functools
+import importlib.metadata
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess  # nosec B404
+import sys
+import time
+
+import cv2
+import numpy
+
+from detloclcheck.create_checkerboard_image import create_checkerboard_image
+from detloclcheck.detect_localize_checkerboard import (
+    detect_localize_checkerboard, DetectionSession)
+from detloclcheck.scripts.arguments import detection_parameters
+from detloclcheck.tools import StageTimings
+
+# differences below these values are never a regression
+_MIN_DIFFERENCE = {'seconds': 0.001, 'peak_memory': 2**20,
+                   'import_seconds': 0.01}
+
+# names of the stages of DetectionSession.stages
+_STAGES = (
+    'overall_map', 'peaks', 'corners', 'good_corners', 'lattice', 'filter')
+
+# modules measured with -import_time: the start of the command line
+# script and the modules loaded by the sub-commands
+_IMPORT_MODULES = (
+    'detloclcheck.scripts.detloclcheck',
+    'detloclcheck.scripts.run_find_checkerboard',
+    'detloclcheck.scripts.run_serve',
+    'detloclcheck.scripts.run_video',
+    'detloclcheck.create_checkerboard_image')
+
+
+def _environment():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: dict describing the machine and the software versions
+    """
+    return {
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'node': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'detloclcheck': importlib.metadata.version(
+            __package__.split('.', maxsplit=1)[0]),
+        'numpy': numpy.__version__,
+        'opencv': cv2.__version__,
+        'opencv_threads': cv2.getNumThreads(),
+        'opencv_optimized': cv2.useOptimized()}
+
+
+def _create_workload(megapixel, square_size, rotation):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    create a 4:3 checkerboard image with about megapixel pixels
+
+    :return: (coordinates, image)
+    """
+    width = int(round((megapixel * 1e6 * 4 / 3)**0.5))
+    fields = (max(8, (3 * width // 4) // square_size),
+              max(8, width // square_size))
+    homography = None
+    if rotation != 0:
+        # rotate around the default zeropoint (center of the image)
+        homography = numpy.vstack((
+            cv2.getRotationMatrix2D(
+                (fields[1] * square_size / 2 - 0.5,
+                 fields[0] * square_size / 2 - 0.5),
+                rotation, 1),
+            (0, 0, 1)))
+    _, coordinates, image = create_checkerboard_image(
+        fields[0], fields[1], square_size, homography=homography)
+    return coordinates, image
+
+
+def _measure(function, repeat):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: (result of the last call, list of the wall times)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def _benchmark_workload(image, parameters, repeat):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    measure every stage of the detection (see
+    :class:`detloclcheck.detect_localize_checkerboard.DetectionSession`)
+    and the whole detection
+
+    :return: (result of the detection, dict of lists of the wall times)
+    """
+    times = collections.defaultdict(list)
+    for _ in range(repeat):
+        # a new session computes every stage once
+        session = DetectionSession(
+            image, parameters['crosssizes'], parameters['angles'])
+        for stage, function in zip(
+                _STAGES,
+                session.stages(
+                    hit_bound=parameters['hit_bound'],
+                    min_sharpness=parameters['min_sharpness'],
+                    max_distance_factor_range=parameters[
+                        'max_distance_factor_range'])):
+            times[stage] += _measure(function, 1)[1]
+    result, times['total'] = _measure(
+        functools.partial(detect_localize_checkerboard, image, **parameters),
+        repeat)
+    return result, times
+
+
+def _measure_memory(image, parameters):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: dict with the peak memory (in bytes) of every stage of the
+             detection (see :class:`detloclcheck.tools.StageTimings`)
+    """
+    with StageTimings(memory=True) as timings, timings.stage('total'):
+        detect_localize_checkerboard(image, timings=timings, **parameters)
+    return {stage: values['peak_memory']
+            for stage, values in timings.as_dict()['stages'].items()}
+
+
+def _measure_import_times(repeat):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    measure the import of every module in :data:`_IMPORT_MODULES` in a new
+    python process (nothing is cached in the process)
+
+    :return: dict with the minimal seconds of every module
+    """
+    import_seconds = {}
+    for module in _IMPORT_MODULES:
+        code = ('import time; start = time.perf_counter(); '
+                f'import {module}; print(time.perf_counter() - start)')
+        times = []
+        for _ in range(repeat):
+            cpi = subprocess.run(  # nosec B603
+                [sys.executable, '-c', code], stdout=subprocess.PIPE,
+                check=True)
+            times.append(float(cpi.stdout))
+        import_seconds[module] = min(times)
+    return import_seconds
+
+
+def _compare_import_times(import_seconds, baseline, tolerance):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    compare the import times with the baseline
+
+    :return: list of dicts, one for every module found in both
+    """
+    baseline_values = baseline.get('import_seconds', {})
+    return [{'stage': module,
+             'measure': 'import_seconds',
+             'baseline': baseline_values[module],
+             'value': value,
+             'ratio': value / max(baseline_values[module], 1e-9),
+             'regression': bool(
+                 value > (1 + tolerance) * baseline_values[module] +
+                 _MIN_DIFFERENCE['import_seconds'])}
+            for module, value in import_seconds.items()
+            if module in baseline_values]
+
+
+def _workload_key(workload):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+    """
+    return (workload['megapixel'], workload['square_size'],
+            workload['rotation'])
+
+
+def _load_baseline(filename):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: the baseline or None if the file is not a json file of
+             detloclcheck benchmark
+    """
+    log = logging.getLogger('detloclcheck.run_benchmark')
+    try:
+        with open(filename, encoding='utf8') as fd:
+            baseline = json.load(fd)
+    except (OSError, ValueError) as error:
+        log.error('ERROR: can not read the baseline "%s": %s',
+                  filename, error)
+        return None
+    if not (isinstance(baseline, dict) and
+            isinstance(baseline.get('results'), list) and
+            isinstance(baseline.get('import_seconds', {}), dict) and
+            all(isinstance(workload, dict) and
+                all(key in workload
+                    for key in ('megapixel', 'square_size', 'rotation'))
+                for workload in baseline['results'])):
+        log.error('ERROR: "%s" is not a result of detloclcheck benchmark',
+                  filename)
+        return None
+    return baseline
+
+
+def _compare(results, baseline, tolerance):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    compare the minimal times (and the peak memory) of every stage with
+    the baseline
+
+    :return: list of dicts, one for every stage and measure found in both
+             (import_seconds are compared by :func:`_compare_import_times`)
+    """
+    reference = {_workload_key(workload): workload
+                 for workload in baseline['results']}
+    comparison = []
+    for workload in results:
+        baseline_workload = reference.get(_workload_key(workload))
+        if baseline_workload is None:
+            continue
+        for measure in ('seconds', 'peak_memory'):
+            min_difference = _MIN_DIFFERENCE[measure]
+            baseline_values = baseline_workload.get(measure, {})
+            for stage, value in workload.get(measure, {}).items():
+                if stage not in baseline_values:
+                    continue
+                comparison.append({
+                    'megapixel': workload['megapixel'],
+                    'square_size': workload['square_size'],
+                    'rotation': workload['rotation'],
+                    'stage': stage,
+                    'measure': measure,
+                    'baseline': baseline_values[stage],
+                    'value': value,
+                    'ratio': value / max(baseline_values[stage], 1e-9),
+                    'regression': bool(
+                        value > (1 + tolerance) * baseline_values[stage] +
+                        min_difference)})
+    return comparison
+
+
+def _run_workload(workload, image, parameters, args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    measure the detection in the image and add the results to the
+    workload
+
+    :param workload: dict with megapixel, square_size, rotation and the
+                     number of corners of the image
+    """
+    log = logging.getLogger('detloclcheck.run_benchmark')
+    result, times = _benchmark_workload(image, parameters, args.repeat[0])
+    workload.update({
+        'shape': list(image.shape),
+        'detected_corners': 0 if result[0] is None else result[0].shape[0],
+        'error_code': 0 if result[0] is not None else result[1],
+        'seconds': {stage: min(values) for stage, values in times.items()},
+        'median_seconds': {stage: statistics.median(values)
+                           for stage, values in times.items()}})
+    if args.memory:
+        workload['peak_memory'] = _measure_memory(image, parameters)
+    log.info(
+        '%.1f MP %s, square size %i, rotation %.1f, '
+        '%i of %i corners detected (error code %i)',
+        image.shape[0] * image.shape[1] / 1e6, image.shape,
+        workload['square_size'], workload['rotation'],
+        workload['detected_corners'], workload['corners'],
+        workload['error_code'])
+    for stage, seconds in workload['seconds'].items():
+        log.info('  %-12s %10.2f ms', stage, 1000 * seconds)
+    for stage, peak in workload.get('peak_memory', {}).items():
+        log.info('  %-18s %10.1f MiB', stage, peak / 2**20)
+
+
+def _compare_output(output, baseline, args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    add the comparison with the baseline to the output and log the
+    regressions
+
+    :return: 0 or 1 if a regression is found
+    """
+    log = logging.getLogger('detloclcheck.run_benchmark')
+    output['baseline_environment'] = baseline.get('environment')
+    output['comparison'] = _compare(
+        output['results'], baseline, args.tolerance[0])
+    if len(output['comparison']) == 0:
+        log.warning('no workload of the baseline "%s" was measured',
+                    args.compare[0])
+    if 'import_seconds' in output:
+        output['comparison'] += _compare_import_times(
+            output['import_seconds'], baseline, args.tolerance[0])
+    exit_status = 0
+    for item in output['comparison']:
+        if not item['regression']:
+            continue
+        exit_status = 1
+        if item['measure'] == 'import_seconds':
+            log.error('regression: import %s: %g -> %g (x %.2f)',
+                      item['stage'], item['baseline'], item['value'],
+                      item['ratio'])
+        else:
+            log.error(
+                'regression: %.1f MP, square size %i, rotation %.1f, '
+                '%s %s: %g -> %g (x %.2f)',
+                item['megapixel'], item['square_size'], item['rotation'],
+                item['stage'], item['measure'], item['baseline'],
+                item['value'], item['ratio'])
+    return exit_status
+
+
+def run_benchmark(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    measure the stages of the detection in synthetic images of
+    different sizes, square sizes and rotations (and with -import_time
+    the import of the modules of the command line script)
+
+    :return: 0 on success, 1 if a regression against the baseline is found
+             or the baseline can not be read
+    """
+    log = logging.getLogger('detloclcheck.run_benchmark')
+    parameters = detection_parameters(args)
+    baseline = None
+    if args.compare is not None:
+        # before the (long) measurement
+        baseline = _load_baseline(args.compare[0])
+        if baseline is None:
+            return 1
+    output = {'environment': _environment(),
+              'parameters': {key: value for key, value in parameters.items()
+                             if key != 'fallback'},
+              'repeat': args.repeat[0],
+              'results': []}
+    if args.fallback:
+        output['parameters']['fallback'] = True
+    for megapixel in args.megapixel:
+        for square_size in args.square_size:
+            for rotation in args.rotation:
+                coordinates, image = _create_workload(
+                    megapixel, square_size, rotation)
+                workload = {
+                    'megapixel': megapixel,
+                    'square_size': square_size,
+                    'rotation': rotation,
+                    'corners': len(coordinates)}
+                _run_workload(workload, image, parameters, args)
+                output['results'].append(workload)
+    if args.import_time:
+        output['import_seconds'] = _measure_import_times(args.repeat[0])
+        for module, seconds in output['import_seconds'].items():
+            log.info('import %-42s %8.1f ms', module, 1000 * seconds)
+    exit_status = 0
+    if baseline is not None:
+        exit_status = _compare_output(output, baseline, args)
+    if args.json is not None:
+        with open(args.json[0], 'w', encoding='utf8') as fd:
+            json.dump(output, fd, indent=1)
+    return exit_status
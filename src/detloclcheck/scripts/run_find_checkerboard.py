@@ -0,0 +1,597 @@
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+
+implementation of the sub-command find_checkerboard of the script
+detloclcheck
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import concurrent.futures
+import concurrent.futures.process
+import functools
+import json
+import logging
+import os
+import sys
+import time
+
+from detloclcheck.batch import (
+    BatchMetrics, JobManifest, prefetch_images, result_to_json_line,
+    ResultStore, WorkQueue)
+from detloclcheck.detect_localize_checkerboard import (
+    detect_localize_checkerboard, DetectionResultCache, prior_from_result)
+from detloclcheck.scripts.arguments import detection_parameters
+from detloclcheck.tools import (
+    read_gray_image, scale_coordinate_system, StageTimings, TraceEvents)
+
+# error code of a file, whose handling raised an exception (the detection
+# returns 1 to 7 and 8 is used for a file, which cannot be read as image)
+_EXCEPTION_ERROR_CODE = 9
+
+
+def _find_checkerboard_in_file(filename, parameters, reduction):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    read the image file and run
+    :func:`detloclcheck.detect_localize_checkerboard.detect_localize_checkerboard`
+
+    This function is also used in the worker processes of the parallel
+    batch mode.
+
+    :param filename: image file to handle
+    :param parameters: dict of keyword arguments for
+                       :func:`detect_localize_checkerboard`
+    :param reduction: reduction factor used to decode the image
+
+    :return: (filename, result, seconds, timings) with result None if the
+             file cannot be read
+    """
+    return _find_checkerboard_in_image(
+        filename, read_gray_image(filename, reduction), parameters,
+        reduction)
+
+
+def _find_checkerboard_in_image(filename, gray_image, parameters, reduction):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: (filename, result, seconds, timings) with result None if
+             gray_image is None; if the detection raises an exception, the
+             result is (None, 9, None, None); the result is given in pixel
+             coordinates
+             of the full image, seconds is the time needed for the
+             detection and timings is None or the dict of
+             :meth:`detloclcheck.tools.StageTimings.as_dict` (if the
+             parameter timings is a dict of keyword arguments for
+             :class:`detloclcheck.tools.StageTimings`); with the
+             additional keyword argument "trace" set to True the timings
+             contain the "trace_events" of this image
+    """
+    log = logging.getLogger('detloclcheck.run_find_checkerboard')
+    log.info('handle file "%s"', filename)
+    if gray_image is None:
+        return filename, None, 0.0, None
+    timings = None
+    trace = None
+    if parameters.get('timings') is not None:
+        # a new instance for every image (also in the worker processes)
+        options = dict(parameters['timings'])
+        if options.pop('trace', False):
+            trace = TraceEvents()
+        timings = StageTimings(**options, trace=trace)
+        parameters = dict(parameters, timings=timings)
+    trace_start = time.time()
+    start = time.perf_counter()
+    try:
+        result = detect_localize_checkerboard(
+            gray_image, log=None, **parameters)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # e. g. a cv2.error for an image smaller than the templates
+        log.exception('exception during handling file "%s"', filename)
+        result = (None, _EXCEPTION_ERROR_CODE, None, None)
+    if result[0] is not None:
+        result = scale_coordinate_system(*result, reduction)
+    seconds = time.perf_counter() - start
+    if trace is not None:
+        trace.span('detection', trace_start, time.time(),
+                   category='image', args={'file': filename})
+    if timings is not None:
+        timings.close()
+        timings = timings.as_dict()
+        if trace is not None:
+            timings['trace_events'] = trace.events
+        log.info('stages of "%s": %s', filename, ', '.join(
+            f"{stage} {1000 * stage_timings['wall']:.1f} ms" + (
+                f" {stage_timings['peak_memory'] / 2**20:.1f} MiB"
+                if 'peak_memory' in stage_timings else '')
+            for stage, stage_timings in timings['stages'].items()))
+    return filename, result, seconds, timings
+
+
+def _find_checkerboard_in_files(
+        filenames, parameters, jobs, prefetch, reduction, *, track=False):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :param filenames: image files to handle
+    :param parameters: dict of keyword arguments for
+                       :func:`detect_localize_checkerboard`
+    :param jobs: number of files handled in parallel in worker processes;
+                 1 handles all files in this process
+    :param prefetch: number of images read ahead in background threads
+                     (only used for jobs equal 1)
+    :param reduction: reduction factor used to decode the images
+    :param track: if True, the result of a file is the prior of the next
+                  file (only used for jobs equal 1)
+
+    :return: generator of (filename, result, seconds, timings) in the
+             order of completion
+    """
+    if jobs == 1:
+        prior = None
+        for filename, gray_image in prefetch_images(
+                filenames, prefetch=prefetch,
+                reader=functools.partial(
+                    read_gray_image, reduction=reduction)):
+            item = _find_checkerboard_in_image(
+                filename, gray_image,
+                parameters if prior is None else dict(parameters, prior=prior),
+                reduction)
+            if track:
+                result = item[1]
+                prior = None
+                if (result is not None) and (result[0] is not None):
+                    # the prior is given in the decoded image
+                    prior = prior_from_result(
+                        scale_coordinate_system(*result, 1 / reduction),
+                        parameters['crosssizes'])
+            yield item
+        return
+    # the workers are no daemons, therefore they can start own pools
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                _find_checkerboard_in_file, filename, parameters, reduction):
+            filename
+            for filename in filenames}
+        for future in concurrent.futures.as_completed(futures):
+            yield _future_result(future, futures[future])
+
+
+def _future_result(future, filename):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: the result of the future of :func:`_find_checkerboard_in_file`
+             or a failed result with error code 9 if the future raised an
+             exception (e. g. BrokenProcessPool if a worker process
+             died; then all pending futures raise it)
+    """
+    log = logging.getLogger('detloclcheck.run_find_checkerboard')
+    try:
+        return future.result()
+    except concurrent.futures.process.BrokenProcessPool as msg:
+        log.error('worker process died during handling file "%s": %s',
+                  filename, msg)
+    except Exception:  # pylint: disable=broad-exception-caught
+        log.exception('exception during handling file "%s"', filename)
+    return filename, (None, _EXCEPTION_ERROR_CODE, None, None), 0.0, None
+
+
+def _find_checkerboard_in_queue(work_queue, parameters, jobs, reduction):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    handle the items of the work queue until it is finished
+
+    At most jobs items are claimed at once. The caller has to finish every
+    returned item with :meth:`WorkQueue.update`.
+
+    :param work_queue: :class:`detloclcheck.batch.WorkQueue`
+    :param parameters: dict of keyword arguments for
+                       :func:`detect_localize_checkerboard`
+    :param jobs: number of files handled in parallel in worker processes;
+                 1 handles all files in this process
+    :param reduction: reduction factor used to decode the images
+
+    :return: generator of (filename, result, seconds, timings) in the
+             order of completion
+    """
+    if jobs == 1:
+        while True:
+            filename = work_queue.claim()
+            if filename is not None:
+                yield _find_checkerboard_in_file(
+                    filename, parameters, reduction)
+            elif not work_queue.wait():
+                return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        broken = False
+        while True:
+            while (not broken) and (len(futures) < jobs):
+                filename = work_queue.claim()
+                if filename is None:
+                    break
+                futures[executor.submit(
+                    _find_checkerboard_in_file,
+                    filename, parameters, reduction)] = filename
+            if len(futures) == 0:
+                if broken or not work_queue.wait():
+                    return
+                continue
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                # a broken pool cannot run further items, the unclaimed
+                # items are left to other workers of the queue
+                broken = broken or isinstance(
+                    future.exception(),
+                    concurrent.futures.process.BrokenProcessPool)
+                yield _future_result(future, futures.pop(future))
+
+
+class _ResultWriter():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    write the results of the sub-command find_checkerboard to all requested
+    outputs and record them in the job manifest or work queue
+    """
+
+    def __init__(self, args, manifest):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param args: the parsed arguments
+        :param manifest: :class:`detloclcheck.batch.JobManifest` or
+                         :class:`detloclcheck.batch.WorkQueue` or None
+        """
+        self.args = args
+        self.manifest = manifest
+        self.failed_files = []
+        self.errorcode = 0
+        self.error_codes = collections.Counter()
+        self.result_store = None
+        if args.result_store is not None:
+            directory = args.result_store[0]
+            if isinstance(manifest, WorkQueue):
+                # a result store has only one writer
+                directory = os.path.join(directory, manifest.worker)
+            self.result_store = ResultStore(directory, mode='a')
+
+    def __call__(self, filename, result, seconds, timings=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        write the result for the image file in all requested output formats
+
+        A failed result is only stored in the result store, streamed to
+        stdout and recorded in the manifest. The result None means the file
+        cannot be read. The timings (if not None) are added to the json
+        outputs.
+        """
+        log = logging.getLogger('detloclcheck.run_find_checkerboard')
+        if result is None:
+            log.error('file "%s" cannot be read as image', filename)
+            result = (None, 8, None, None)
+        elif result[0] is None:
+            log.error(
+                'ERROR %i during handling file "%s"', result[1], filename)
+        if result[0] is None:
+            self.failed_files.append(filename)
+            self.errorcode += result[1]
+            self.error_codes[result[1]] += 1
+        outputs = []
+        if self.result_store is not None:
+            self.result_store.append(filename, result)
+            outputs.append(self.result_store.directory)
+        if self.args.stdout_format[0] != 'none':
+            # one write and flush per record; the consumer gets each record
+            # as soon as the image is done
+            sys.stdout.write(result_to_json_line(
+                filename, result,
+                binary=self.args.stdout_format[0] == 'jsonl_base64',
+                extra=None if timings is None else {'timings': timings}))
+            sys.stdout.flush()
+            outputs.append('stdout')
+        if result[0] is not None:
+            outputs += self._write_files(filename, result, timings)
+        if self.manifest is not None:
+            self.manifest.update(
+                filename, 0 if result[0] is not None else result[1],
+                seconds, outputs)
+
+    def _write_files(self, filename, result, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: list of the written files
+        """
+        log = logging.getLogger('detloclcheck.run_find_checkerboard')
+        coordinate_system, zeropoint, axis1, axis2 = result
+        output_filenames = []
+        for output_format in self.args.output_format:
+            output_filename = \
+                os.path.splitext(filename)[0] + '.' + output_format
+            if output_format == 'json':
+                data = {'coordinate_system': coordinate_system.tolist(),
+                        'zeropoint': zeropoint.tolist(),
+                        'axis1': axis1.tolist(), 'axis2': axis2.tolist()}
+                if timings is not None:
+                    data['timings'] = timings
+                with open(output_filename, 'w', encoding='utf8') as fd:
+                    json.dump(data, fd, indent=self.args.json_indent[0])
+            if output_format == 'mat':
+                # scipy is only needed for this format
+                import scipy.io  # pylint: disable=import-outside-toplevel
+                scipy.io.savemat(
+                    output_filename,
+                    {'coordinate_system': coordinate_system,
+                     'zeropoint': zeropoint,
+                     'axis1': axis1, 'axis2': axis2})
+            log.info('wrote result with %i good corners to "%s"',
+                     coordinate_system.shape[0],
+                     output_filename)
+            output_filenames.append(output_filename)
+        return output_filenames
+
+    def close(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        if self.result_store is not None:
+            self.result_store.close()
+
+
+def _detection_parameters(args, jobs):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: dict of keyword arguments for
+             :func:`detect_localize_checkerboard`
+    """
+    run_parallel = args.run_parallel
+    if (jobs > 1) and (args.nesting[0] == 'serial'):
+        # parallel over files only, avoid oversubscription
+        run_parallel = False
+    parameters = detection_parameters(args)
+    parameters['run_parallel'] = run_parallel
+    if args.result_cache is not None:
+        parameters['cache'] = DetectionResultCache(args.result_cache[0])
+    if args.timings or args.memory or (args.trace is not None):
+        # replaced by a StageTimings for every image
+        parameters['timings'] = {'memory': args.memory}
+        if args.trace is not None:
+            parameters['timings']['trace'] = True
+    return parameters
+
+
+def _manifest_parameters(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: dict of all parameters influencing the results
+    """
+    parameters = detection_parameters(args)
+    parameters['decode_reduction'] = args.decode_reduction[0]
+    if args.fallback:
+        # only set if used, older manifests stay valid
+        parameters['fallback'] = True
+    return parameters
+
+
+def _open_manifest(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: (manifest, filenames) with the job manifest or the work queue
+             (None if not requested) and the files to handle (None for a
+             work queue)
+    """
+    log = logging.getLogger('detloclcheck.run_find_checkerboard')
+    if args.work_queue is not None:
+        if args.manifest is not None:
+            raise ValueError('-manifest and -work_queue cannot be combined')
+        work_queue = WorkQueue(
+            args.work_queue[0], timeout=args.work_queue_timeout[0])
+        log.info('added %i of %i files to work queue "%s" as worker "%s"',
+                 work_queue.add(args.file), len(args.file),
+                 args.work_queue[0], work_queue.worker)
+        return work_queue, None
+    if args.manifest is None:
+        return None, args.file
+    manifest = JobManifest(args.manifest[0], _manifest_parameters(args))
+    manifest.add(args.file)
+    filenames = manifest.todo(retry_failed=args.retry_failed)
+    log.info('handle %i unfinished of %i files in manifest "%s"',
+             len(filenames), len(manifest.records), args.manifest[0])
+    return manifest, filenames
+
+
+def _start_results(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: (manifest, jobs, results) with the job manifest or the work
+             queue (None if not requested), the number of parallel jobs and
+             the generator of the results
+    :raises ValueError: if the arguments cannot be combined
+    """
+    manifest, filenames = _open_manifest(args)
+    jobs = args.jobs[0]
+    if args.track and ((jobs > 1) or (filenames is None)):
+        raise ValueError(
+            '-track needs -jobs 1 and cannot be combined with -work_queue')
+    if filenames is not None:
+        jobs = max(1, min(jobs, len(filenames)))
+    parameters = _detection_parameters(args, jobs)
+    if filenames is None:
+        results = _find_checkerboard_in_queue(
+            manifest, parameters, jobs, args.decode_reduction[0])
+    else:
+        results = _find_checkerboard_in_files(
+            filenames, parameters, jobs, args.prefetch[0],
+            args.decode_reduction[0], track=args.track)
+    return manifest, jobs, results
+
+
+def _write_results(results, result_writer, prefetch, *, trace, metrics):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    write the results; with prefetch larger than 0 the results are written
+    in a background thread and at most prefetch results are waiting
+
+    :param trace: TraceEvents collecting the trace events or None
+    :param metrics: BatchMetrics or None
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as writer:
+        writes = collections.deque()
+        for filename, result, seconds, timings in results:
+            if (trace is not None) and (timings is not None):
+                trace.extend(timings.pop('trace_events'), file=filename)
+            if metrics is not None:
+                metrics.add(
+                    8 if result is None else (
+                        0 if result[0] is not None else result[1]),
+                    seconds)
+            if prefetch < 1:
+                result_writer(filename, result, seconds, timings)
+                continue
+            writes.append(writer.submit(
+                result_writer, filename, result, seconds, timings))
+            while len(writes) > prefetch:
+                # bound the number of results waiting to be written
+                writes.popleft().result()
+        while len(writes) > 0:
+            writes.popleft().result()
+
+
+def run_find_checkerboard(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    Files which cannot be read or handled are skipped. The returned error
+    code is the sum of the error codes of all files handled in this run (8
+    for a file, which cannot be read as image, and 9 for a file, whose
+    handling raised an exception, as recorded in the result store, the
+    manifest and the streamed records), but at most 255 (an exit status is
+    taken modulo 256). The number of files per error code is logged.
+
+    With -prefetch the next images are read in background threads and the
+    results are written in a background thread while the current image is
+    handled.
+
+    With -manifest only the unfinished inputs of the manifest (and the new
+    given files) are handled.
+
+    With -work_queue the given files are added to the work queue and
+    pending items are claimed until the queue is finished.
+
+    With -trace the trace events of all images (also from the worker
+    processes) are collected and written at the end.
+
+    With -metrics the throughput metrics (see
+    :class:`detloclcheck.batch.BatchMetrics`) are written periodically
+    during the run and at the end.
+
+    With -track the result of a file is used as prior for the next file
+    (e. g. the frames of a video), see the parameter prior of
+    :func:`detloclcheck.detect_localize_checkerboard.detect_localize_checkerboard`.
+    """
+    log = logging.getLogger('detloclcheck.run_find_checkerboard')
+    try:
+        manifest, jobs, results = _start_results(args)
+    except ValueError as msg:
+        log.error('ERROR: %s', msg)
+        return 1
+    if args.output_format is None:
+        args.output_format = ['json']
+        if ((args.result_store is not None) or
+                (args.stdout_format[0] != 'none')):
+            args.output_format = []
+    result_writer = _ResultWriter(args, manifest)
+    trace = None if args.trace is None else TraceEvents()
+    metrics = None
+    if args.metrics is not None:
+        metrics = BatchMetrics(
+            args.metrics[0], jobs=jobs, interval=args.metrics_interval[0],
+            output_format=args.metrics_format[0])
+    _write_results(results, result_writer, args.prefetch[0],
+                   trace=trace, metrics=metrics)
+    result_writer.close()
+    if manifest is not None:
+        manifest.close()
+    if metrics is not None:
+        metrics.write()
+        data = metrics.as_dict()
+        log.info('%i images in %.1f s (%.2f images/s, worker utilization '
+                 '%.2f)', data['images'], data['elapsed_seconds'],
+                 data['images_per_second'], data['worker_utilization'])
+    if trace is not None:
+        trace.write(args.trace[0])
+        log.info('wrote %i trace events to "%s"', len(trace.events),
+                 args.trace[0])
+    if len(result_writer.failed_files) > 0:
+        log.error('%i files failed (%s): %s', len(result_writer.failed_files),
+                  ', '.join(f'{number} with error code {code}'
+                            for code, number in sorted(
+                                result_writer.error_codes.items())),
+                  ', '.join(f'"{filename}"'
+                            for filename in result_writer.failed_files))
+    return min(result_writer.errorcode, 255)
@@ -0,0 +1,377 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+
+implementation of the sub-command serve of the script detloclcheck
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import base64
+import concurrent.futures
+import http.server
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socketserver
+import stat
+import threading
+
+from detloclcheck.batch import result_to_json_line
+from detloclcheck.detect_localize_checkerboard import DetectionResultCache
+from detloclcheck.find_checkerboard.create_template import create_template
+from detloclcheck.scripts.arguments import detection_parameters
+from detloclcheck.scripts.run_find_checkerboard import (
+    _find_checkerboard_in_file, _find_checkerboard_in_image)
+from detloclcheck.tools import decode_gray_image
+
+
+# barrier of the worker processes, set by _init_worker
+_WORKER_BARRIER = None
+
+
+def _warm_up(crosssizes):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    create the templates (cached per process) before the first request
+    """
+    for crosssize in crosssizes:
+        create_template(crosssize)
+
+
+def _init_worker(crosssizes, barrier):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    initializer of the worker processes
+
+    :param barrier: multiprocessing.Barrier of all worker processes (only
+                    given by inheritance)
+    """
+    global _WORKER_BARRIER  # pylint: disable=global-statement
+    _WORKER_BARRIER = barrier
+    _warm_up(crosssizes)
+
+
+def _wait_for_workers(timeout):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    block the worker process until all worker processes wait
+    """
+    _WORKER_BARRIER.wait(timeout)
+
+
+def _find_checkerboard_in_bytes(name, data, parameters, reduction):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    decode the encoded image and run
+    :func:`detloclcheck.detect_localize_checkerboard.detect_localize_checkerboard`
+
+    :return: (name, result, seconds, timings) with result None if data
+             cannot be decoded as image
+    """
+    return _find_checkerboard_in_image(
+        name, decode_gray_image(data, reduction), parameters, reduction)
+
+
+class _DetectionService():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    handle the requests of the sub-command serve
+
+    The worker processes are started once and are kept (with their
+    templates) for all requests.
+    """
+
+    def __init__(self, parameters, jobs, max_concurrent, reduction):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param parameters: dict of keyword arguments for
+                           :func:`detect_localize_checkerboard`
+        :param jobs: number of worker processes; 1 handles all requests in
+                     the threads of the server
+        :param max_concurrent: maximal number of requests handled at once;
+                               further requests wait
+        :param reduction: reduction factor used to decode the images
+        """
+        self.parameters = parameters
+        self.reduction = reduction
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._executor = None
+        _warm_up(parameters['crosssizes'])
+        if jobs > 1:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_worker,
+                initargs=(parameters['crosssizes'],
+                          multiprocessing.Barrier(jobs)))
+            # start all workers now and not during the first requests: the
+            # tasks block their workers until jobs workers (each after its
+            # initializer) run one of them, hence no worker takes two
+            concurrent.futures.wait(
+                [self._executor.submit(_wait_for_workers, 60)
+                 for _ in range(jobs)])
+
+    def detect(self, name, data=None, *, binary=False, extra=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param name: name of the image; the image file is read if data is
+                     None
+        :param data: None or bytes of the encoded image (e. g. the content
+                     of a PNG file)
+        :param binary: if True, encode arrays in binary form (base64)
+        :param extra: None or dict of further keys of the record
+
+        :return: json line as from
+                 :func:`detloclcheck.batch.result_to_json_line` with the
+                 additional key "seconds" (and "timings" if requested)
+        """
+        if data is None:
+            task = (_find_checkerboard_in_file, name)
+        else:
+            task = (_find_checkerboard_in_bytes, name, data)
+        with self._semaphore:
+            if self._executor is None:
+                _, result, seconds, timings = task[0](
+                    *task[1:], self.parameters, self.reduction)
+            else:
+                _, result, seconds, timings = self._executor.submit(
+                    *task, self.parameters, self.reduction).result()
+        if result is None:
+            logging.getLogger('detloclcheck.run_serve').error(
+                '"%s" cannot be read as image', name)
+            result = (None, 8, None, None)
+        extra = {} if extra is None else dict(extra)
+        extra['seconds'] = seconds
+        if timings is not None:
+            extra['timings'] = timings
+        return result_to_json_line(name, result, binary=binary, extra=extra)
+
+    def __call__(self, request):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param request: dict with "file" (image file readable by the
+                        server) or "image" (base64 encoded content of an
+                        image file) and optional "name" (of the image),
+                        "id" (copied to the result) and "binary"
+
+        :return: json line
+        """
+        if not isinstance(request, dict):
+            raise ValueError('request has to be a json object')
+        extra = {}
+        if 'id' in request:
+            extra['id'] = request['id']
+        binary = bool(request.get('binary', False))
+        if 'file' in request:
+            return self.detect(
+                str(request['file']), binary=binary, extra=extra)
+        if 'image' in request:
+            return self.detect(
+                str(request.get('name', 'image')),
+                base64.b64decode(request['image'], validate=True),
+                binary=binary, extra=extra)
+        raise ValueError('request needs "file" or "image"')
+
+    def close(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _UnixRequestHandler(socketserver.StreamRequestHandler):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    every line of a connection is a json request and is answered by one
+    json line; a failed request is answered by {"error": ...} and the
+    connection is kept
+    """
+
+    def handle(self):
+        # pylint: disable=broad-exception-caught
+        for line in self.rfile:
+            if len(line.strip()) == 0:
+                continue
+            try:
+                response = self.server.service(json.loads(line))
+            except (ValueError, TypeError) as error:
+                response = json.dumps({'error': str(error)}) + '\n'
+            except Exception as error:
+                logging.getLogger('detloclcheck.run_serve').exception(
+                    'exception during handling a request')
+                response = json.dumps({'error': repr(error)}) + '\n'
+            self.wfile.write(response.encode('utf8'))
+
+
+class _HTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    A POST request with the content type application/json is a json
+    request, any other content is an encoded image named by the path.
+    The answer is one json line; a failed request is answered by
+    {"error": ...} with the status 400 (bad request) or 500 (failure of
+    the server).
+    """
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        code = 200
+        try:
+            if self.headers.get_content_type() == 'application/json':
+                response = self.server.service(json.loads(data))
+            else:
+                response = self.server.service.detect(
+                    self.path.lstrip('/') or 'image', data)
+        except (ValueError, TypeError) as error:
+            code = 400
+            response = json.dumps({'error': str(error)}) + '\n'
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logging.getLogger('detloclcheck.run_serve').exception(
+                'exception during handling a request')
+            code = 500
+            response = json.dumps({'error': repr(error)}) + '\n'
+        response = response.encode('utf8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        # pylint: disable=redefined-builtin
+        logging.getLogger('detloclcheck.run_serve').debug(format, *args)
+
+
+def _create_server(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: server listening on the Unix socket or on localhost
+    """
+    if args.socket is not None:
+        if (os.path.exists(args.socket[0]) and
+                stat.S_ISSOCK(os.stat(args.socket[0]).st_mode)):
+            # left over by a killed server
+            os.remove(args.socket[0])
+        server = socketserver.ThreadingUnixStreamServer(
+            args.socket[0], _UnixRequestHandler)
+    else:
+        server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', args.port[0]), _HTTPRequestHandler)
+    server.daemon_threads = True
+    return server
+
+
+def run_serve(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    run a detection server until SIGTERM or SIGINT
+    """
+    log = logging.getLogger('detloclcheck.run_serve')
+    if (args.socket is None) == (args.port is None):
+        log.error('ERROR: exactly one of -socket and -port is necessary')
+        return 1
+    jobs = args.jobs[0]
+    parameters = detection_parameters(args)
+    parameters['run_parallel'] = False
+    if args.result_cache is not None:
+        parameters['cache'] = DetectionResultCache(args.result_cache[0])
+    if args.timings or args.memory:
+        parameters['timings'] = {'memory': args.memory}
+    max_concurrent = jobs
+    if args.max_concurrent is not None:
+        max_concurrent = args.max_concurrent[0]
+    if args.memory and (jobs == 1) and (max_concurrent > 1):
+        # the memory of a stage is only valid for one detection at a time
+        log.error('ERROR: -memory with -jobs 1 needs -max_concurrent 1')
+        return 1
+    service = _DetectionService(
+        parameters, jobs, max_concurrent, args.decode_reduction[0])
+    try:
+        server = _create_server(args)
+    except OSError as error:
+        service.close()
+        log.error('ERROR: %s', error)
+        return 1
+    server.service = service
+    # shutdown has to be called from another thread than serve_forever
+    signal.signal(
+        signal.SIGTERM,
+        lambda *_: threading.Thread(target=server.shutdown).start())
+    if args.socket is not None:
+        log.info('listening on "%s"', args.socket[0])
+    else:
+        log.info('listening on http://127.0.0.1:%i', server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket is not None:
+            os.remove(args.socket[0])
+    log.info('stopped')
+    return 0
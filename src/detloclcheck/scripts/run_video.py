@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+
+implementation of the sub-command video of the script detloclcheck
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import sys
+import time
+
+from detloclcheck.batch import result_to_json_line
+from detloclcheck.detect_localize_checkerboard import \
+    detect_localize_checkerboard_video
+from detloclcheck.scripts.arguments import detection_parameters
+from detloclcheck.tools import StageTimings
+
+
+def _handle_video(filename, results, timings, stdout_format):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    handle all frames of the video and stream a record per frame to stdout
+
+    :param results: generator of
+                    :func:`detect_localize_checkerboard_video`
+    :param timings: StageTimings given to
+                    :func:`detect_localize_checkerboard_video`
+    """
+    log = logging.getLogger('detloclcheck.run_video')
+    frames = 0
+    failed_frames = 0
+    start = time.perf_counter()
+    for index, seconds, result, source in results:
+        frames += 1
+        if result[0] is None:
+            failed_frames += 1
+        if stdout_format != 'none':
+            # one write and flush per record; the consumer gets each record
+            # as soon as the frame is done
+            sys.stdout.write(result_to_json_line(
+                filename, result, binary=stdout_format == 'jsonl_base64',
+                extra={'frame': index, 'seconds': seconds,
+                       'source': source}))
+            sys.stdout.flush()
+    seconds = time.perf_counter() - start
+    counts = timings.as_dict()['counts']
+    log.info(
+        'handled %i frames of "%s" in %.1f s (%.1f frames per second): '
+        '%i keyframes, %i tracked frames, %i track losses, '
+        '%i frames without checkerboard',
+        frames, filename, seconds, frames / seconds if seconds > 0 else 0.0,
+        counts.get('keyframes', 0), counts.get('tracked_frames', 0),
+        counts.get('track_losses', 0), failed_frames)
+
+
+def run_video(args):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    Detect and localize the checkerboard in every frame of the given video
+    files, see
+    :func:`detloclcheck.detect_localize_checkerboard.detect_localize_checkerboard_video`.
+
+    The returned error code is the number of files, which cannot be read as
+    video, but at most 255 (an exit status is taken modulo 256). Frames
+    without checkerboard are only reported in the records.
+    """
+    log = logging.getLogger('detloclcheck.run_video')
+    parameters = dict(
+        detection_parameters(args),
+        run_parallel=args.run_parallel,
+        keyframe_interval=args.keyframe_interval[0],
+        min_tracked=args.min_tracked[0],
+        prefetch=args.prefetch[0])
+    errorcode = 0
+    for filename in args.file:
+        log.info('handle video "%s"', filename)
+        timings = StageTimings()
+        try:
+            results = detect_localize_checkerboard_video(
+                filename, log=None, timings=timings, **parameters)
+        except ValueError as msg:
+            log.error('ERROR: %s', msg)
+            errorcode += 1
+            continue
+        # errors of the detection are not caught
+        _handle_video(filename, results, timings, args.stdout_format[0])
+    return min(errorcode, 255)
@@ -1,4 +1,4 @@
-# SPDX-FileCopyrightText: 2024 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
@@ -22,18 +22,29 @@ functions
 ---------
 .. currentmodule:: detloclcheck.tools
 .. autofunction:: array2image
+.. autofunction:: calculate_corner_sharpness
 .. autofunction:: calculate_sharpness
 .. autofunction:: calculate_square_distances
+.. autofunction:: decode_gray_image
 .. autofunction:: draw_coordinate_system
 .. autofunction:: filter_blurry_corners
 .. autofunction:: normed_tm_ccorr_normed
+.. autofunction:: read_gray_image
+.. autofunction:: scale_coordinate_system
+
+classes
+-------
+.. autoclass:: StageTimings
+   :members:
+.. autoclass:: TraceEvents
+   :members:
 
 copyright + license
 -------------------
 :Author: Daniel Mohr
-:Date: 2024-07-08
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
@@ -51,15 +62,26 @@ copyright + license
 # along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
 
 from .array2image import array2image
+from .calculate_corner_sharpness import calculate_corner_sharpness
 from .calculate_sharpness import calculate_sharpness
 from .calculate_square_distances import calculate_square_distances
 from .draw_coordinate_system import draw_coordinate_system
 from .filter_blurry_corners import filter_blurry_corners
 from .normed_tm_ccorr_normed import normed_tm_ccorr_normed
+from .read_gray_image import decode_gray_image, read_gray_image
+from .scale_coordinate_system import scale_coordinate_system
+from .stage_timings import StageTimings
+from .trace_events import TraceEvents
 
 __all__ = ["array2image",
+           "calculate_corner_sharpness",
            "calculate_sharpness",
            "calculate_square_distances",
+           "decode_gray_image",
            "draw_coordinate_system",
            "filter_blurry_corners",
-           "normed_tm_ccorr_normed"]
+           "normed_tm_ccorr_normed",
+           "read_gray_image",
+           "scale_coordinate_system",
+           "StageTimings",
+           "TraceEvents"]
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import numpy
+
+from .calculate_sharpness import calculate_sharpness
+
+
+def calculate_corner_sharpness(image, coordinates, size):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    calculate the sharpness around the corners of a checkerboard
+
+    :param image: 2 dimensional numpy array describing the image
+    :param coordinates: coordinates of the inner corners of the checkerboard
+    :param size: int to desribe the window for sharpness calculation
+
+    :return: numpy array with the sharpness of every corner; -inf if the
+             window is not inside the image (the sharpness is unknown)
+    """
+    sharpness = numpy.full((coordinates.shape[0],), -numpy.inf)
+    for i in range(coordinates.shape[0]):
+        i0 = int(round(coordinates[i, 0, 0] - size))
+        i1 = int(round(coordinates[i, 0, 0] + size))
+        j0 = int(round(coordinates[i, 0, 1] - size))
+        j1 = int(round(coordinates[i, 0, 1] + size))
+        if ((0 <= i0 < image.shape[1]) and (0 <= i1 < image.shape[1]) and
+                (0 <= j0 < image.shape[0]) and (0 <= j1 < image.shape[0])):
+            sharpness[i] = calculate_sharpness(image[j0:j1, i0:i1])
+    return sharpness
@@ -1,13 +1,13 @@
-# SPDX-FileCopyrightText: 2024 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2024-07-01
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
-:Copyright: (C) 2024 Daniel Mohr
+:Copyright: (C) 2024-2026 Daniel Mohr
 """
 # This file is part of DetLocLCheck.
 #
@@ -26,15 +26,13 @@
 
 import logging
 
-import numpy
-
-from .calculate_sharpness import calculate_sharpness
+from .calculate_corner_sharpness import calculate_corner_sharpness
 
 
 def filter_blurry_corners(image, coordinates, size, min_sharpness):
     """
     :Author: Daniel Mohr
-    :Date: 2024-06-11, 2024-06-13
+    :Date: 2024-06-11, 2024-06-13, 2026-10-19
     :License: LGPL-3.0-or-later
 
     filter blurry corners in an image of a checkerboard
@@ -44,26 +42,12 @@ def filter_blurry_corners(image, coordinates, size, min_sharpness):
     :param size: int to desribe the window for sharpness calculation
     """
     log = logging.getLogger('detloclcheck.filter_blurry_corners')
-    blurry_corners = []
     log.debug('use size = %f for filtering blurry corners', size)
-    for i in range(coordinates.shape[0]):
-        i0 = int(round(coordinates[i, 0, 0] - size))
-        i1 = int(round(coordinates[i, 0, 0] + size))
-        j0 = int(round(coordinates[i, 0, 1] - size))
-        j1 = int(round(coordinates[i, 0, 1] + size))
-        if ((0 <= i0 < image.shape[1]) and (0 <= i1 < image.shape[1]) and
-                (0 <= j0 < image.shape[0]) and (0 <= j1 < image.shape[0])):
-            clip = image[j0:j1, i0:i1]
-            sharpness = calculate_sharpness(clip)
-            if sharpness < min_sharpness:
-                blurry_corners.append(i)
-        else:
-            # we cannot calculate the sharpness in this way
-            # this means, we do not know the sharpness
-            blurry_corners.append(i)
-    if len(blurry_corners) > 0:
-        coordinates = numpy.delete(
-            coordinates, blurry_corners, axis=0)
+    # corners with unknown sharpness (-inf) are blurry, too
+    blurry_corners = \
+        calculate_corner_sharpness(image, coordinates, size) < min_sharpness
+    if blurry_corners.any():
+        coordinates = coordinates[~blurry_corners]
     log.debug('removed %i blurry corners (min_sharpness = %f)',
-              len(blurry_corners), min_sharpness)
+              blurry_corners.sum(), min_sharpness)
     return coordinates
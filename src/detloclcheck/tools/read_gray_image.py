@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import cv2
+import numpy
+
+_IMREAD_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8}
+
+
+def read_gray_image(filename, reduction=1):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    read an image file directly as gray image
+
+    The image is decoded directly to one channel without an intermediate
+    color image. With reduction larger than 1 the image is decoded with
+    reduced size; for JPEG files the decoder then skips most of the work.
+
+    :param filename: image file to read
+    :param reduction: 1, 2, 4 or 8; each side of the image is reduced by
+                      this factor
+
+    :return: gray image or None if the file cannot be read as image
+    """
+    if reduction not in _IMREAD_FLAGS:
+        raise ValueError(f'reduction {reduction} is not in 1, 2, 4, 8')
+    return cv2.imread(filename, _IMREAD_FLAGS[reduction])
+
+
+def decode_gray_image(data, reduction=1):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    decode an encoded image (e. g. the content of a PNG or JPEG file)
+    directly as gray image
+
+    :param data: bytes of the encoded image
+    :param reduction: 1, 2, 4 or 8; each side of the image is reduced by
+                      this factor
+
+    :return: gray image or None if data cannot be decoded as image
+    """
+    if reduction not in _IMREAD_FLAGS:
+        raise ValueError(f'reduction {reduction} is not in 1, 2, 4, 8')
+    return cv2.imdecode(
+        numpy.frombuffer(data, dtype=numpy.uint8), _IMREAD_FLAGS[reduction])
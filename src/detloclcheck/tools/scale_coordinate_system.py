@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+
+def scale_coordinate_system(coordinate_system, zeropoint, axis1, axis2,
+                            factor):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    scale a result of the detection in an image with reduced size
+    (e. g. read by :func:`detloclcheck.tools.read_gray_image`) to the pixel
+    coordinates of the full image
+
+    A pixel of the reduced image covers factor x factor pixels of the full
+    image. Therefore its center is mapped to factor * (x + 0.5) - 0.5.
+
+    :param coordinate_system: numpy array of shape (n, 2, 2); only the
+                              pixel coordinates [:, 0, :] are scaled
+    :param zeropoint: pixel coordinates of the zero point
+    :param axis1: first axis in pixel
+    :param axis2: second axis in pixel
+    :param factor: size of the full image divided by the reduced size
+
+    :return: (coordinate_system, zeropoint, axis1, axis2) for the full image
+    """
+    if factor == 1:
+        return coordinate_system, zeropoint, axis1, axis2
+    coordinate_system = coordinate_system.copy()
+    coordinate_system[:, 0, :] = \
+        factor * (coordinate_system[:, 0, :] + 0.5) - 0.5
+    return (coordinate_system, factor * (zeropoint + 0.5) - 0.5,
+            factor * axis1, factor * axis2)
@@ -0,0 +1,370 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import collections
+import contextlib
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+
+
+def _max_rss():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :return: maximal resident set size of this process in bytes or 0 if
+             not available (e. g. on Windows)
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return max_rss
+    return 1024 * max_rss
+
+
+class _SharedTracing():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    :mod:`tracemalloc` shared by all instances of :class:`StageTimings` of
+    this process measuring memory
+
+    The tracing is started for the first instance and stopped after the
+    last one is closed (only if it was not running before). The peak of
+    tracemalloc is reset at every memory point; the peak up to the reset
+    is given to every instance, hence instances do not reset the peaks of
+    each other.
+    """
+
+    def __init__(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        self.lock = threading.Lock()
+        self.instances = weakref.WeakSet()
+        self.started = False
+
+    def add(self, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        start the tracing if necessary
+        """
+        with self.lock:
+            if (len(self.instances) == 0) and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started = True
+            self.instances.add(timings)
+
+    def remove(self, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        stop the tracing after the last instance if it was started by add
+        """
+        with self.lock:
+            self.instances.discard(timings)
+            if (len(self.instances) == 0) and self.started:
+                tracemalloc.stop()
+                self.started = False
+
+    def point(self, timings):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        the peak since the last point is given to every instance by
+        :meth:`StageTimings.add_peak`
+
+        :return: (number of intervals of timings, traced memory)
+        """
+        with self.lock:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            intervals = None
+            for instance in self.instances:
+                number = instance.add_peak(peak)
+                if instance is timings:
+                    intervals = number
+        return intervals, current
+
+
+_TRACING = _SharedTracing()
+
+
+class StageTimings():  # pylint: disable=too-many-instance-attributes
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    record the wall time and the cpu time of the stages of a detection
+    together with counts (e. g. number of peaks)
+
+    The cpu time is the time of all threads of this process (OpenCV uses
+    threads); the time of worker processes (run_parallel) is not included.
+    A stage measured several times is summed up. A disabled instance
+    records nothing and costs (almost) nothing.
+
+    With memory set to True also the memory of every stage is recorded
+    using :mod:`tracemalloc` (started if necessary, which slows down
+    allocations). The tracing is shared by all instances of the process
+    and started tracing is stopped after the last instance is closed by
+    :meth:`close` (or at the end of a with statement). The memory of numpy
+    arrays (also the arrays returned by OpenCV) is traced; internal
+    buffers of OpenCV are not traced, but
+    increase the maximal resident set size of the process. For every
+    stage are given:
+
+    ================ =======================================================
+    peak_memory      maximal traced memory during the stage above the
+                     traced memory at its start (maximum of all calls)
+    retained_memory  traced memory at the end minus at the start of the
+                     stage (sum of all calls)
+    max_rss_growth   growth of the maximal resident set size of the
+                     process during the stage (sum of all calls)
+    ================ =======================================================
+
+    All memory values are in bytes. The tracing is process wide, therefore
+    other threads allocating memory at the same time are included: the
+    values of a stage are only valid with one measured detection at a
+    time per process (e. g. not with several detections in flight in
+    :func:`detloclcheck.detect_localize_checkerboard.detect_localize_checkerboard_async`).
+
+    With trace set to an instance of :class:`.trace_events.TraceEvents`
+    every stage is also added as span and the tasks of the process pools
+    (run_parallel) are traced.
+
+    Example:
+
+    >>> from detloclcheck.detect_localize_checkerboard import \\
+    ...     detect_localize_checkerboard
+    >>> from detloclcheck.tools import StageTimings
+    >>> timings = StageTimings()
+    >>> result = detect_localize_checkerboard(
+    ...     image, (11, 23), (0, 45, 90, 135), timings=timings)
+    >>> timings.as_dict()['stages']['template_matching']
+    {'wall': 0.28, 'cpu': 1.02, 'calls': 1}
+    >>> with StageTimings(memory=True) as timings:
+    ...     result = detect_localize_checkerboard(
+    ...         image, (11, 23), (0, 45, 90, 135), timings=timings)
+    >>> timings.as_dict()['stages']['template_matching']['peak_memory']
+    201326720
+    """
+
+    def __init__(self, enabled=True, memory=False, trace=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :param enabled: if False, nothing is recorded
+        :param memory: if True, also the memory of the stages is recorded
+        :param trace: None or an instance of
+                      :class:`.trace_events.TraceEvents`
+        """
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.trace = trace if enabled else None
+        self.wall = collections.defaultdict(float)
+        self.cpu = collections.defaultdict(float)
+        self.calls = collections.Counter()
+        self.counts = collections.Counter()
+        self.peak_memory = collections.Counter()
+        self.retained_memory = collections.Counter()
+        self.max_rss_growth = collections.Counter()
+        # the peak of tracemalloc is reset at every memory point (of all
+        # instances), these are the peaks of the intervals between the resets
+        self._peaks = []
+        self._tracing = self.memory
+        if self._tracing:
+            _TRACING.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        stop the tracing of the memory if this is the last instance using
+        it; the recorded values are kept, but no further stage may be
+        measured
+        """
+        if self._tracing:
+            _TRACING.remove(self)
+            self._tracing = False
+
+    def add_peak(self, peak):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add the peak of the traced memory of an interval (called by the
+        shared tracing for every reset of the peak)
+
+        :return: number of intervals
+        """
+        self._peaks.append(peak)
+        return len(self._peaks)
+
+    def _memory_point(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: (interval index, traced memory, maximal resident set size)
+        """
+        return (*_TRACING.point(self), _max_rss())
+
+    def _point(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: (wall time, cpu time, memory point or None, time for the
+                 trace or None)
+        """
+        return (time.perf_counter(), time.process_time(),
+                self._memory_point() if self.memory else None,
+                None if self.trace is None else time.time())
+
+    def start(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: start point for :meth:`stop` (None if disabled)
+        """
+        if not self.enabled:
+            return None
+        return self._point()
+
+    def stop(self, stage, start):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add the time since start to the stage
+
+        :param stage: name of the stage
+        :param start: start point from :meth:`start` or :meth:`stop`
+
+        :return: new start point for the next stage
+        """
+        if not self.enabled:
+            return None
+        now = self._point()
+        self.wall[stage] += now[0] - start[0]
+        self.cpu[stage] += now[1] - start[1]
+        self.calls[stage] += 1
+        if self.memory:
+            interval, traced, max_rss = start[2]
+            # peaks of all intervals since start (nested stages reset the
+            # peak)
+            self.peak_memory[stage] = max(
+                self.peak_memory[stage],
+                max(self._peaks[interval:]) - traced)
+            self.retained_memory[stage] += now[2][1] - traced
+            self.max_rss_growth[stage] += now[2][2] - max_rss
+        if self.trace is not None:
+            self.trace.span(stage, start[3], now[3])
+        return now
+
+    @contextlib.contextmanager
+    def stage(self, stage):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        context manager measuring the stage
+        """
+        start = self.start()
+        try:
+            yield
+        finally:
+            self.stop(stage, start)
+
+    def count(self, name, value=1):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add value to the count name
+        """
+        if self.enabled:
+            self.counts[name] += int(value)
+
+    def as_dict(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        :return: dict (json serializable) with "stages" (for every stage a
+                 dict with "wall", "cpu" and "calls" and with memory also
+                 "peak_memory", "retained_memory" and "max_rss_growth")
+                 and "counts"
+        """
+        stages = {}
+        for stage in self.calls:
+            stages[stage] = {'wall': self.wall[stage],
+                             'cpu': self.cpu[stage],
+                             'calls': self.calls[stage]}
+            if self.memory:
+                stages[stage]['peak_memory'] = self.peak_memory[stage]
+                stages[stage]['retained_memory'] = \
+                    self.retained_memory[stage]
+                stages[stage]['max_rss_growth'] = self.max_rss_growth[stage]
+        return {'stages': stages, 'counts': dict(self.counts)}
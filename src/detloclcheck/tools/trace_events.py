@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+:Copyright: (C) 2026 Daniel Mohr
+"""
+# This file is part of DetLocLCheck.
+#
+# DetLocLCheck free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License,
+# or (at your option) any later version.
+#
+# DetLocLCheck is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DetLocLCheck. If not, see <https://www.gnu.org/licenses/>.
+
+import itertools
+import json
+import os
+import threading
+import time
+
+# ids of the async events, unique with the pid
+_EVENT_IDS = itertools.count()
+
+
+# pylint: disable=too-few-public-methods
+class _TracedFunction():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    call function in a worker process and return its result together with
+    (pid, tid, start, end) of the call
+    """
+
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self, argument):
+        start = time.time()
+        result = self.function(argument)
+        return result, (os.getpid(), threading.get_native_id(), start,
+                        time.time())
+
+
+class TraceEvents():
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+    :License: LGPL-3.0-or-later
+
+    collect spans as trace events, which can be viewed with chrome://tracing
+    or https://ui.perfetto.dev
+
+    The times are given by :func:`time.time`, therefore the events of
+    several processes fit together. Every process (pid) and thread (tid)
+    is shown as own track.
+
+    Example:
+
+    >>> from detloclcheck.detect_localize_checkerboard import \\
+    ...     detect_localize_checkerboard
+    >>> from detloclcheck.tools import StageTimings, TraceEvents
+    >>> trace = TraceEvents()
+    >>> result = detect_localize_checkerboard(
+    ...     image, (11, 23), (0, 45, 90, 135), run_parallel=True,
+    ...     timings=StageTimings(trace=trace))
+    >>> trace.write('trace.json')
+    """
+
+    def __init__(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+        """
+        self.events = []
+
+    def span(self, name, start, end, *,
+             category='stage', pid=None, tid=None, args=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add a complete event
+
+        :param name: name of the span
+        :param start: start as from :func:`time.time`
+        :param end: end as from :func:`time.time`
+        :param category: category of the span
+        :param pid: process id; default: this process
+        :param tid: thread id; default: this thread
+        :param args: None or dict of further information
+        """
+        self.events.append({
+            'name': name, 'cat': category, 'ph': 'X',
+            'ts': 1e6 * start, 'dur': 1e6 * (end - start),
+            'pid': os.getpid() if pid is None else pid,
+            'tid': threading.get_native_id() if tid is None else tid,
+            'args': {} if args is None else dict(args)})
+
+    def async_span(self, name, start, end, *, category, args=None):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add a span of this process, which may overlap other spans (e. g.
+        waiting tasks)
+        """
+        event_id = f'{os.getpid()}.{next(_EVENT_IDS)}'
+        for phase, timestamp in (('b', start), ('e', end)):
+            self.events.append({
+                'name': name, 'cat': category, 'ph': phase,
+                'ts': 1e6 * timestamp, 'id': event_id,
+                'pid': os.getpid(), 'tid': threading.get_native_id(),
+                'args': {} if args is None else dict(args)})
+
+    def map(self, pool, function, iterable, name):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        like pool.map(function, iterable) and add spans for every task
+
+        For every task a span "queue" (from the call of map until the start
+        in the worker, including transfer of the arguments), a span with
+        the name of the task (compute in the worker) and a span "collect"
+        (from the end in the worker until all results are received) is
+        added.
+
+        :param pool: :class:`multiprocessing.pool.Pool`
+        :param function: function to call for every item
+        :param iterable: the items
+        :param name: name of the tasks
+
+        :return: list of the results
+        """
+        submitted = time.time()
+        results = pool.map(_TracedFunction(function), iterable)
+        collected = time.time()
+        for index, (_, (pid, tid, start, end)) in enumerate(results):
+            args = {'task': index}
+            self.async_span(f'{name} queue', submitted, start,
+                            category='queue', args=args)
+            self.span(f'{name} {index}', start, end,
+                      category='compute', pid=pid, tid=tid, args=args)
+            self.async_span(f'{name} collect', end, collected,
+                            category='collect', args=args)
+        return [result for result, _ in results]
+
+    def extend(self, events, **args):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        add events (e. g. of another process) and set args in all of them
+
+        :param events: list of events (e. g. :attr:`events` of another
+                       instance)
+        :param args: further information for every event, e. g. the file
+        """
+        for event in events:
+            event['args'].update(args)
+            self.events.append(event)
+
+    def write(self, filename):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        :License: LGPL-3.0-or-later
+
+        write the events as json file in the trace event format
+        """
+        with open(filename, 'w', encoding='utf8') as fd:
+            json.dump({'traceEvents': self.events,
+                       'displayTimeUnit': 'ms'}, fd)
@@ -0,0 +1,324 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+
+aggregation of tests
+
+You can run this file directly::
+
+  env python3 batch.py
+  pytest-3 batch.py
+
+  env python3 batch.py TestBatch.test_prefetch_images
+  env python3 batch.py TestBatch.test_result_store
+  env python3 batch.py TestBatch.test_visualize_result_store
+  env python3 batch.py TestBatch.test_json_lines
+  env python3 batch.py TestBatch.test_job_manifest
+  env python3 batch.py TestBatch.test_work_queue
+
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import tempfile
+import unittest
+
+import numpy
+
+
+def _work_queue_worker(directory, die):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+
+    handle all items of the work queue or die after claiming one item
+    """
+    # pylint: disable=import-outside-toplevel
+    from detloclcheck.batch import WorkQueue
+    work_queue = WorkQueue(directory, timeout=0.5)
+    filename = work_queue.claim()
+    if die:
+        os.kill(os.getpid(), signal.SIGKILL)
+    while (filename is not None) or work_queue.wait(poll_interval=0.1):
+        if filename is not None:
+            work_queue.update(
+                filename, 3 if filename == 'bad.png' else 0, 0.0, [])
+        filename = work_queue.claim()
+    work_queue.close()
+
+
+class TestBatch(unittest.TestCase):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+
+    env python3 batch.py TestBatch
+    pytest-3 -k TestBatch batch.py
+    """
+    # pylint: disable=import-outside-toplevel
+
+    def test_prefetch_images(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import cv2
+        from detloclcheck.batch import prefetch_images
+        from detloclcheck.tools import read_gray_image
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filenames = []
+            for i in range(5):
+                filename = os.path.join(tmpdir, f'{i}.png')
+                cv2.imwrite(filename, numpy.full((8, 9), i, dtype=numpy.uint8))
+                filenames.append(filename)
+            # a broken file
+            filenames.insert(2, os.path.join(tmpdir, 'broken.png'))
+            with open(filenames[2], 'w', encoding='utf8') as fd:
+                fd.write('no image')
+            self.assertIsNone(read_gray_image(filenames[2]))
+            for prefetch in (0, 1, 3, 10):
+                result = list(prefetch_images(filenames, prefetch=prefetch))
+                self.assertEqual([filename for filename, _ in result],
+                                 filenames)
+                self.assertIsNone(result[2][1])
+                for i, (_, image) in enumerate(result[:2] + result[3:]):
+                    self.assertEqual(image.shape, (8, 9))
+                    self.assertTrue((image == i).all())
+            # stop early
+            for _, image in prefetch_images(iter(filenames), prefetch=2):
+                break
+            self.assertTrue((image == 0).all())
+
+    def test_result_store(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.batch import ResultStore
+        rng = numpy.random.default_rng(42)
+        results = []
+        for count in (30, 0, 42):
+            if count == 0:
+                results.append((None, 5, None, None))
+                continue
+            coordinate_system = numpy.empty((count, 2, 2))
+            coordinate_system[:, 0, :] = 1000 * rng.random((count, 2))
+            coordinate_system[:, 1, :] = rng.integers(-9, 9, (count, 2))
+            results.append((coordinate_system, 1000 * rng.random(2),
+                            rng.random(2), rng.random(2)))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            directory = os.path.join(tmpdir, 'store')
+            with ResultStore(directory, mode='a') as result_store:
+                result_store.append('a.png', results[0])
+                result_store.append('b.png', results[1])
+            # simulate an interrupted append
+            with open(os.path.join(directory, 'pixel.bin'), 'ab') as fd:
+                fd.write(b'garbage')
+            with ResultStore(directory, mode='a') as result_store:
+                result_store.append('c.png', results[2])
+                self.assertEqual(len(result_store), 3)
+            result_store = ResultStore(directory)
+            self.assertEqual(result_store.filenames,
+                             ['a.png', 'b.png', 'c.png'])
+            numpy.testing.assert_array_equal(result_store.status, [0, 5, 0])
+            self.assertEqual(result_store.find('c.png'), 2)
+            self.assertEqual(result_store[1], (None, 5, None, None))
+            for i in (0, 2):
+                coordinate_system, zeropoint, axis1, axis2 = result_store[i]
+                numpy.testing.assert_allclose(
+                    coordinate_system, results[i][0], rtol=1e-6)
+                numpy.testing.assert_array_equal(zeropoint, results[i][1])
+                numpy.testing.assert_array_equal(axis1, results[i][2])
+                numpy.testing.assert_array_equal(axis2, results[i][3])
+                self.assertEqual(result_store.pixel(i).dtype, numpy.float32)
+                self.assertEqual(result_store.lattice(i).dtype, numpy.int16)
+            result_store.close()
+            with self.assertRaises(ValueError):
+                ResultStore(directory).append('d.png', results[1])
+
+    def test_visualize_result_store(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.batch import ResultStore
+        from detloclcheck.scripts.detloclcheck import (
+            _load_visualize_data, run_visualize)
+        result = (numpy.array([[[1.0, 2.0], [0, 0]]]), numpy.array([1.0, 2.0]),
+                  numpy.array([15.0, 0.0]), numpy.array([0.0, 15.0]))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ResultStore(tmpdir, mode='a') as result_store:
+                result_store.append('a.png', (None, 8, None, None))
+                result_store.append('b.png', result)
+            # a failed image keeps its position (in line with the images)
+            data = _load_visualize_data(tmpdir)
+        self.assertEqual(len(data), 2)
+        self.assertIsNone(data[0])
+        for array, expected in zip(data[1], result):
+            numpy.testing.assert_array_equal(array, expected)
+        # nothing to visualize in an empty result store
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ResultStore(tmpdir, mode='a').close()
+            self.assertEqual(run_visualize(argparse.Namespace(
+                data_file_name=[tmpdir], dosubplot=True,
+                image_file_name=None)), 1)
+
+    def test_json_lines(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.batch import (
+            json_line_to_result, result_to_json_line)
+        rng = numpy.random.default_rng(42)
+        result = (rng.random((30, 2, 2)), rng.random(2), rng.random(2),
+                  rng.random(2))
+        for binary in (False, True):
+            line = result_to_json_line('foo.png', result, binary=binary)
+            self.assertTrue(line.endswith('\n'))
+            self.assertEqual(line.count('\n'), 1)
+            filename, decoded = json_line_to_result(line)
+            self.assertEqual(filename, 'foo.png')
+            for array, decoded_array in zip(result, decoded):
+                numpy.testing.assert_array_equal(array, decoded_array)
+        line = result_to_json_line('bar.png', (None, 5, None, None))
+        self.assertEqual(line, '{"file":"bar.png","status":5}\n')
+        self.assertEqual(json_line_to_result(line),
+                         ('bar.png', (None, 5, None, None)))
+
+    def test_job_manifest(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.batch import JobManifest
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'job.jsonl')
+            parameters = {'crosssizes': (11, 23), 'hit_bound': 0.9}
+            with JobManifest(filename, parameters) as manifest:
+                manifest.add(['a.png', 'b.png', 'c.png'])
+                self.assertEqual(manifest.todo(), ['a.png', 'b.png', 'c.png'])
+                manifest.update('a.png', 0, 0.5, ['a.json'])
+                manifest.update('b.png', 3, 0.1, [])
+            # simulate an interrupted write
+            with open(filename, 'a', encoding='utf8') as fd:
+                fd.write('{"file": "c.png", "sta')
+            with JobManifest(filename, parameters) as manifest:
+                self.assertEqual(manifest.todo(), ['c.png'])
+                self.assertEqual(manifest.todo(retry_failed=True),
+                                 ['b.png', 'c.png'])
+                self.assertEqual(manifest.records['a.png']['outputs'],
+                                 ['a.json'])
+                manifest.add(['a.png', 'd.png'])
+                manifest.update('c.png', 0, 0.2, ['c.json'])
+            with JobManifest(filename, parameters) as manifest:
+                self.assertEqual(manifest.todo(), ['d.png'])
+                self.assertEqual(manifest.records['b.png']['error_code'], 3)
+            with self.assertRaises(ValueError):
+                JobManifest(filename, {'crosssizes': [11]})
+            # interrupted while writing the header
+            with open(filename, 'w', encoding='utf8') as fd:
+                fd.write('{"version": 1, "param')
+            with JobManifest(filename, parameters) as manifest:
+                manifest.add(['a.png'])
+            with JobManifest(filename, parameters) as manifest:
+                self.assertEqual(manifest.todo(), ['a.png'])
+
+    def test_work_queue(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import json
+        from detloclcheck.batch import WorkQueue
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filenames = [f'{i}.png' for i in range(7)] + ['bad.png']
+            work_queue = WorkQueue(tmpdir, timeout=0.5)
+            self.assertEqual(work_queue.add(filenames), 8)
+            self.assertEqual(work_queue.add(filenames[:3]), 0)
+            # a worker dies after claiming an item
+            process = multiprocessing.Process(
+                target=_work_queue_worker, args=(tmpdir, True))
+            process.start()
+            process.join()
+            self.assertEqual(work_queue.counts()['claimed'], 1)
+            processes = [
+                multiprocessing.Process(
+                    target=_work_queue_worker, args=(tmpdir, False))
+                for _ in range(3)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            self.assertEqual(
+                work_queue.counts(),
+                {'pending': 0, 'claimed': 0, 'done': 7, 'failed': 1})
+            records = []
+            for state in ('done', 'failed'):
+                for key in os.listdir(os.path.join(tmpdir, state)):
+                    with open(os.path.join(tmpdir, state, key),
+                              encoding='utf8') as fd:
+                        records.append(json.load(fd))
+            self.assertEqual(sorted(record['file'] for record in records),
+                             sorted(filenames))
+            self.assertEqual(
+                [record['error_code'] for record in records
+                 if record['state'] == 'failed'], [3])
+            # an interrupted worker gives back its items
+            work_queue.add(['new.png'])
+            self.assertEqual(work_queue.claim(), 'new.png')
+            work_queue.close()
+            self.assertEqual(work_queue.counts()['pending'], 1)
+
+    def test_batch_metrics(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import json
+        from detloclcheck.batch import BatchMetrics
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'metrics.prom')
+            metrics = BatchMetrics(
+                filename, jobs=2, interval=0, buckets=(1, 10))
+            metrics.add(0, 0.5)
+            # written on every add with interval 0
+            self.assertTrue(os.path.isfile(filename))
+            metrics.add(3, 5.0)
+            metrics.add(0, 20.0)
+            data = metrics.as_dict()
+            self.assertEqual(data['images'], 3)
+            self.assertEqual(data['failed_images'], 1)
+            self.assertEqual(data['error_codes'], {'0': 2, '3': 1})
+            self.assertEqual(data['latency_seconds']['buckets'],
+                             [[1, 1], [10, 2], [None, 3]])
+            self.assertAlmostEqual(data['busy_seconds'], 25.5)
+            metrics.write()
+            with open(filename, encoding='utf8') as fd:
+                lines = fd.read().splitlines()
+            self.assertIn('detloclcheck_images_total{error_code="3"} 1',
+                          lines)
+            self.assertIn(
+                'detloclcheck_image_seconds_bucket{le="+Inf"} 3', lines)
+            self.assertIn('detloclcheck_image_seconds_count 3', lines)
+            filename = os.path.join(tmpdir, 'metrics.json')
+            metrics = BatchMetrics(filename, output_format='json')
+            metrics.add(0, 0.5)
+            # the interval is not over
+            self.assertFalse(os.path.isfile(filename))
+            metrics.write()
+            with open(filename, encoding='utf8') as fd:
+                self.assertEqual(json.load(fd)['images'], 1)
+            with self.assertRaises(ValueError):
+                BatchMetrics(output_format='csv')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -4,7 +4,7 @@
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-02-06
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
 
 aggregation of tests
@@ -140,6 +140,31 @@ class TestCheckerboardImageClass(unittest.TestCase):
             dtype=numpy.uint8)
         numpy.testing.assert_array_equal(img, expected_result)
 
+    def test_vectorized_checkerboard(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import numpy
+        from detloclcheck.create_checkerboard_image.checkerboard_image_class \
+            import CheckerboardImageClass
+        n = 42
+        x, y = numpy.meshgrid(
+            numpy.arange(n), numpy.arange(n), indexing='ij')
+        for integrate_method in (0, 1):
+            for homography in (None,
+                               [[0.9, 0.2, 3.0],
+                                [-0.1, 1.1, -2.0],
+                                [0.001, -0.002, 1.0]]):
+                c = CheckerboardImageClass(
+                    3, (23, 23.5), integrate_method, 42, homography)
+                img = numpy.zeros((n, n), dtype=numpy.uint8)
+                for i in range(n):
+                    for j in range(n):
+                        img[i, j] = int(c(i, j))
+                numpy.testing.assert_array_equal(
+                    c.evaluate(x, y).astype(numpy.uint8), img)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,187 @@
+# SPDX-FileCopyrightText: 2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+"""
+:Author: Daniel Mohr
+:Email: daniel.mohr@uni-greifswald.de
+:Date: 2026-10-19
+:License: LGPL-3.0-or-later
+
+aggregation of tests
+
+You can run this file directly::
+
+  env python3 create_checkerboard_image.py
+  pytest-3 create_checkerboard_image.py
+
+  env python3 create_checkerboard_image.py \
+    TestCreateCheckerboardImage.test_homography
+
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy
+
+
+class TestCreateCheckerboardImage(unittest.TestCase):
+    """
+    :Author: Daniel Mohr
+    :Date: 2026-10-19
+
+    env python3 create_checkerboard_image.py TestCreateCheckerboardImage
+    pytest-3 -k TestCreateCheckerboardImage create_checkerboard_image.py
+    """
+    # pylint: disable=import-outside-toplevel
+
+    def test_identity_homography(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        zeropoint, _, image = create_checkerboard_image(
+            8, 8, 15, zeropoint=(59.3, 59.7), integrate_method=1)
+        homography_zeropoint, coordinates, homography_image = \
+            create_checkerboard_image(
+                8, 8, 15, zeropoint=(59.3, 59.7), integrate_method=1,
+                homography=numpy.eye(3))
+        numpy.testing.assert_array_equal(image, homography_image)
+        numpy.testing.assert_almost_equal(zeropoint, homography_zeropoint)
+        self.assertGreater(coordinates.shape[0], 24)
+
+    def test_homography(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import cv2
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.find_checkerboard import find_checkerboard
+        from detloclcheck.tools import calculate_square_distances
+        for angle, perspective in ((30, 0.0), (10, 0.0005)):
+            homography = numpy.vstack((
+                cv2.getRotationMatrix2D((90, 90), angle, 1), (0, 0, 1)))
+            homography[2, 0] = perspective
+            _, coordinates, image = create_checkerboard_image(
+                12, 12, 15, integrate_method=1, homography=homography)
+            self.assertTrue((coordinates > 3).all())
+            self.assertTrue((coordinates < image.shape[0] - 3).all())
+            detected_coordinates = find_checkerboard(
+                image, crosssizes=(11,),
+                angles=(0.0, 22.5, 45.0, 67.5, 90.0, 112.5, 135.0, 157.5))
+            distances = calculate_square_distances(
+                coordinates[:, 0], coordinates[:, 1],
+                detected_coordinates[:, 0, 0], detected_coordinates[:, 0, 1])
+            # every detected corner has to be near to a ground truth corner
+            self.assertLess(numpy.sqrt(distances.min(axis=1)).max(), 0.5)
+
+    def test_create_checkerboard_dataset(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import cv2
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_dataset
+        spec = {'random': {'count': 5,
+                           'size': {'uniform': [11, 17]},
+                           'angle': {'uniform': [-10, 10]},
+                           'noise': [0, 3]}}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dir1 = os.path.join(tmpdir, 'a')
+            dir2 = os.path.join(tmpdir, 'b')
+            manifest1 = create_checkerboard_dataset(
+                spec, dir1, seed=42, processes=1)
+            manifest2 = create_checkerboard_dataset(
+                spec, dir2, seed=42, processes=2)
+            self.assertEqual(manifest1, manifest2)
+            self.assertEqual(len(manifest1['items']), 5)
+            with open(os.path.join(dir1, 'ground_truth.json'), 'r',
+                      encoding='utf8') as fd:
+                ground_truth = json.load(fd)
+            self.assertEqual(
+                len(ground_truth['coordinates']),
+                sum(item['number_of_coordinates']
+                    for item in manifest1['items']))
+            # resume: only the missing image is created again
+            filename = os.path.join(dir2, manifest2['items'][3]['file'])
+            os.remove(filename)
+            create_checkerboard_dataset(spec, dir2, seed=42, processes=1)
+            for item in manifest1['items']:
+                numpy.testing.assert_array_equal(
+                    cv2.imread(os.path.join(dir1, item['file'])),
+                    cv2.imread(os.path.join(dir2, item['file'])))
+            with self.assertRaises(ValueError):
+                create_checkerboard_dataset(spec, dir2, seed=43)
+
+    def test_create_checkerboard_dataset_resume(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_dataset
+        spec = {'random': {'count': 3, 'size': {'uniform': [11, 17]}}}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            progress_filename = os.path.join(tmpdir, 'progress.jsonl')
+            # interrupted before or while writing the header
+            for content in ('', '{"spec": {"ran'):
+                with open(progress_filename, 'w', encoding='utf8') as fd:
+                    fd.write(content)
+                manifest = create_checkerboard_dataset(
+                    spec, tmpdir, seed=42, processes=1)
+                self.assertEqual(len(manifest['items']), 3)
+            # interrupted while writing the record of the last image
+            with open(progress_filename, 'r', encoding='utf8') as fd:
+                lines = fd.readlines()
+            index = json.loads(lines[-1])['index']
+            os.remove(os.path.join(
+                tmpdir, manifest['items'][index]['file']))
+            with open(progress_filename, 'w', encoding='utf8') as fd:
+                fd.write(''.join(lines[:-1]) + lines[-1][:10])
+            create_checkerboard_dataset(spec, tmpdir, seed=42, processes=1)
+            # the new record is not appended to the incomplete line
+            with open(progress_filename, 'r', encoding='utf8') as fd:
+                lines = fd.readlines()
+            self.assertEqual(json.loads(lines[-1])['index'], index)
+            self.assertEqual(len(lines), 5)
+
+    def test_cache(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.create_checkerboard_image.\
+            checkerboard_image_cache import CheckerboardImageCache
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = create_checkerboard_image(
+                8, 8, 15, integrate_method=1, cache=tmpdir)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            cached_result = create_checkerboard_image(
+                8, 8, 15, integrate_method=1, cache=tmpdir)
+            self.assertNotIsInstance(cached_result[2], numpy.memmap)
+            self.assertTrue(cached_result[2].flags.writeable)
+            self.assertIsInstance(cached_result[0], tuple)
+            for value, cached_value in zip(result, cached_result):
+                numpy.testing.assert_array_equal(value, cached_value)
+            # other parameters lead to another entry
+            create_checkerboard_image(8, 8, 15, cache=tmpdir)
+            self.assertEqual(len(os.listdir(tmpdir)), 2)
+            # least recently used entries are removed
+            cache = CheckerboardImageCache(tmpdir, max_size=20000)
+            create_checkerboard_image(
+                8, 8, 15, integrate_method=1, cache=cache)
+            create_checkerboard_image(8, 8, 16, cache=cache)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
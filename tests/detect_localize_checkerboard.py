@@ -1,10 +1,10 @@
-# SPDX-FileCopyrightText: 2024-2025 Daniel Mohr <daniel.mohr@uni-greifswald.de>
+# SPDX-FileCopyrightText: 2024-2026 Daniel Mohr <daniel.mohr@uni-greifswald.de>
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-01-31
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
 
 aggregation of tests
@@ -19,6 +19,9 @@ You can run this file directly::
 
 """
 
+import json
+import os
+import tempfile
 import unittest
 
 import numpy
@@ -195,6 +198,637 @@ class TestCheckDetectLocalizeCheckerboard(unittest.TestCase):
             coordinates, coordinate_system)
         self.assertLess(root_mean_square_error, 0.02)
 
+    def test_detect_localize_checkerboard_file(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import cv2
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard_file
+        ground_truth_zeropoint, coordinates, image = \
+            create_checkerboard_image(10, 10, 30, integrate_method=1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for extension in ('png', 'jpg'):
+                filename = os.path.join(tmpdir, 'foo.' + extension)
+                cv2.imwrite(filename, image)
+                for reduction, crosssizes in ((1, (23,)), (2, (11,))):
+                    result = detect_localize_checkerboard_file(
+                        filename, crosssizes, (0.0, 45.0, 90.0, 135.0),
+                        reduction=reduction)
+                    numpy.testing.assert_almost_equal(
+                        ground_truth_zeropoint, result[1], decimal=2)
+                    self.assertLess(
+                        coordinates_root_mean_square_error(
+                            coordinates, result[0]), 0.1)
+            filename = os.path.join(tmpdir, 'bar.png')
+            with open(filename, 'w', encoding='utf8') as fd:
+                fd.write('no image')
+            self.assertEqual(
+                detect_localize_checkerboard_file(filename, (11,), (0.0,)),
+                (None, 8, None, None))
+
+    def test_detection_result_cache(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard, DetectionResultCache
+        angles = (0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5)
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = detect_localize_checkerboard(
+                image, (11,), angles, cache=DetectionResultCache(tmpdir))
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            # a new cache instance (e. g. a later run) uses the directory
+            cache = DetectionResultCache(tmpdir)
+            key = cache.key(
+                image,
+                {'crosssizes': (11,), 'angles': angles, 'hit_bound': 0.93,
+                 'min_sharpness': (100, 500, 1000),
+                 'max_distance_factor_range': (
+                     1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.)})
+            for cached_array, array in zip(cache.load(key), result):
+                numpy.testing.assert_array_equal(cached_array, array)
+            cached_result = detect_localize_checkerboard(
+                image, (11,), angles, cache=cache)
+            for cached_array, array in zip(cached_result, result):
+                numpy.testing.assert_array_equal(cached_array, array)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            # other parameters or another image lead to another key
+            self.assertNotEqual(cache.key(image, {'hit_bound': 0.9}),
+                                cache.key(image, {'hit_bound': 0.93}))
+            self.assertNotEqual(cache.key(image, {}),
+                                cache.key(image[:-1], {}))
+            # errors are cached, too
+            result = detect_localize_checkerboard(
+                image, (11,), angles, hit_bound=1.1, cache=cache)
+            self.assertEqual(result, (None, 1, None, None))
+            self.assertEqual(len(os.listdir(tmpdir)), 2)
+            self.assertEqual(
+                detect_localize_checkerboard(
+                    image, (11,), angles, hit_bound=1.1,
+                    cache=DetectionResultCache(tmpdir)),
+                (None, 1, None, None))
+
+    def test_detection_result_cache_memory(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard, DetectionResultCache
+        angles = (0.0, 45.0, 90.0, 135.0)
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        cache = DetectionResultCache(max_entries=1)
+        result = detect_localize_checkerboard(
+            image, (11,), angles, cache=cache)
+        # a loaded result is a copy, which can be modified
+        for _ in range(2):
+            cached_result = detect_localize_checkerboard(
+                image, (11,), angles, cache=cache)
+            for cached_array, array in zip(cached_result, result):
+                numpy.testing.assert_array_equal(cached_array, array)
+                cached_array[:] = 0
+        # only max_entries results are kept in memory
+        cache.store('a', (None, 1, None, None))
+        cache.store('b', (None, 2, None, None))
+        self.assertIsNone(cache.load('a'))
+        self.assertEqual(cache.load('b'), (None, 2, None, None))
+
+    def _check_batch(self, items, files, ground_truth):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        check the batch of the items (images and files) in all modes
+
+        :param items: list of the items, the third is a broken file and the
+                      fourth raises an exception
+        :param files: the expected file of every result
+        :param ground_truth: (zeropoint, coordinates) of the checkerboard
+        """
+        # pylint: disable=import-outside-toplevel
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard_batch
+        angles = (0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5)
+        for jobs, ordered in ((1, True), (2, True), (2, False)):
+            results = list(detect_localize_checkerboard_batch(
+                iter(items), (11,), angles, jobs=jobs, ordered=ordered,
+                max_in_flight=2))
+            if ordered:
+                self.assertEqual([result.index for result in results],
+                                 list(range(len(items))))
+            results.sort(key=lambda result: result.index)
+            self.assertEqual([result.file for result in results], files)
+            self.assertEqual(
+                [result.error_code for result in results],
+                [0, 0, 8, None, 0])
+            self.assertIsNotNone(results[3].exception)
+            for i in (0, 1, 4):
+                self.assertIsNone(results[i].exception)
+                numpy.testing.assert_almost_equal(
+                    ground_truth[0], results[i].result[1], decimal=3)
+                self.assertLess(
+                    coordinates_root_mean_square_error(
+                        ground_truth[1], results[i].result[0]), 0.02)
+
+    def test_detect_localize_checkerboard_batch(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import cv2
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard_batch
+        ground_truth_zeropoint, coordinates, image = \
+            create_checkerboard_image(8, 8, 15)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'foo.png')
+            cv2.imwrite(filename, image)
+            broken_filename = os.path.join(tmpdir, 'bar.png')
+            with open(broken_filename, 'w', encoding='utf8') as fd:
+                fd.write('no image')
+            self._check_batch(
+                [image, filename, broken_filename, None, image],
+                [None, filename, broken_filename, None, None],
+                (ground_truth_zeropoint, coordinates))
+        # error codes are given per item
+        result, = detect_localize_checkerboard_batch(
+            [image], (11,), (0.0, 45.0, 90.0, 135.0), hit_bound=1.1)
+        self.assertEqual(result.error_code, 1)
+        self.assertIsNone(result.result)
+
+    def test_detect_localize_checkerboard_async(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import asyncio
+        import concurrent.futures
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard, detect_localize_checkerboard_async
+        angles = (0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5)
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        expected = detect_localize_checkerboard(image, (11,), angles)
+
+        async def detect_all():
+            semaphore = asyncio.Semaphore(2)
+            with concurrent.futures.ThreadPoolExecutor(4) as executor:
+                results = await asyncio.gather(*(
+                    detect_localize_checkerboard_async(
+                        image, (11,), angles, hit_bound=hit_bound,
+                        executor=executor, semaphore=semaphore)
+                    for hit_bound in (0.93, 0.93, 1.1)))
+                # cancel between the stages
+                task = asyncio.create_task(
+                    detect_localize_checkerboard_async(
+                        image, (11,), angles, executor=executor))
+                await asyncio.sleep(0)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+            return results
+
+        results = asyncio.run(detect_all())
+        for result in results[:2]:
+            for array, expected_array in zip(result, expected):
+                numpy.testing.assert_array_equal(array, expected_array)
+        self.assertEqual(results[2], (None, 1, None, None))
+        # the same features as detect_localize_checkerboard, e. g. fallback
+        report = {}
+        result = asyncio.run(detect_localize_checkerboard_async(
+            image, (11,), angles, hit_bound=1.1,
+            fallback=({'hit_bound': 0.93},), report=report))
+        for array, expected_array in zip(result, expected):
+            numpy.testing.assert_array_equal(array, expected_array)
+        self.assertEqual(report['rung'], 1)
+        self.assertEqual(report['counts']['overall_map'], 1)
+
+    def test_detection_session(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            DetectionSession
+        from detloclcheck.find_checkerboard import find_checkerboard
+        angles = (0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5)
+        ground_truth_zeropoint, coordinates, image = \
+            create_checkerboard_image(8, 8, 15)
+        session = DetectionSession(image, (11,), angles)
+        coordinate_system, zeropoint, _, _ = session.detect()
+        numpy.testing.assert_almost_equal(
+            ground_truth_zeropoint, zeropoint, decimal=3)
+        self.assertLess(
+            coordinates_root_mean_square_error(
+                coordinates, coordinate_system), 0.02)
+        numpy.testing.assert_array_equal(
+            session.corners(0.93, 100),
+            find_checkerboard(image, crosssizes=(11,), angles=angles))
+        # retries do not repeat the template matching
+        self.assertEqual(session.detect(hit_bound=1.1),
+                         (None, 1, None, None))
+        self.assertEqual(
+            session.detect(min_sharpness=(100, 500, 1e9))[0].shape[0], 0)
+        self.assertEqual(session.counts['overall_map'], 1)
+        self.assertEqual(session.counts['peaks'], 2)
+        self.assertEqual(session.counts['corners'], 1)
+        self.assertEqual(session.counts['lattice'], 1)
+
+    def test_detect_localize_checkerboard_fallback(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard
+        angles = (0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5)
+        ground_truth_zeropoint, _, image = \
+            create_checkerboard_image(8, 8, 15)
+        report = {}
+        self.assertEqual(
+            detect_localize_checkerboard(
+                image, (11,), angles, hit_bound=1.1, report=report),
+            (None, 1, None, None))
+        self.assertIsNone(report['rung'])
+        report = {}
+        _, zeropoint, _, _ = detect_localize_checkerboard(
+            image, (11,), angles, hit_bound=1.1,
+            fallback=({'hit_bound': 1.05}, {'hit_bound': 0.93}),
+            report=report)
+        numpy.testing.assert_almost_equal(
+            ground_truth_zeropoint, zeropoint, decimal=3)
+        self.assertEqual(report['rung'], 2)
+        self.assertEqual(report['parameters']['hit_bound'], 0.93)
+        self.assertEqual([attempt['error_code']
+                          for attempt in report['attempts']], [1, 1, 0])
+        # the template matching is done only once
+        self.assertEqual(report['counts']['overall_map'], 1)
+        self.assertEqual(report['counts']['peaks'], 3)
+
+    def test_stage_timings(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard
+        from detloclcheck.tools import StageTimings
+        angles = (0.0,  22.5,  45.0,  67.5,  90.0, 112.5, 135.0, 157.5)
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        timings = StageTimings()
+        coordinate_system, _, _, _ = detect_localize_checkerboard(
+            image, (11,), angles, timings=timings)
+        data = timings.as_dict()
+        for stage in ('template_matching', 'peaks', 'peak_sharpness',
+                      'corner_subpix', 'corner_sharpness',
+                      'coordinate_system', 'axis_search', 'axis_refinement',
+                      'lattice_assignment', 'marker_search',
+                      'lattice_sharpness'):
+            self.assertGreaterEqual(data['stages'][stage]['wall'], 0)
+            self.assertGreaterEqual(data['stages'][stage]['calls'], 1)
+        self.assertEqual(data['stages']['template_matching']['calls'], 1)
+        self.assertEqual(data['counts']['rungs'], 1)
+        self.assertGreaterEqual(data['counts']['corners'],
+                                coordinate_system.shape[0])
+        self.assertGreaterEqual(data['counts']['peaks'],
+                                data['counts']['corners'])
+        self.assertGreaterEqual(data['counts']['zeropoint_attempts'], 1)
+        # a disabled instance records nothing
+        timings = StageTimings(enabled=False)
+        detect_localize_checkerboard(image, (11,), angles, timings=timings)
+        self.assertEqual(timings.as_dict(), {'stages': {}, 'counts': {}})
+
+    def test_stage_timings_memory(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import tracemalloc
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard
+        from detloclcheck.tools import StageTimings
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        # the tracing is stopped only if the instance started it
+        was_tracing = tracemalloc.is_tracing()
+        with StageTimings(memory=True) as timings:
+            self.assertTrue(tracemalloc.is_tracing())
+            detect_localize_checkerboard(
+                image, (11,), (0.0, 45.0, 90.0, 135.0), timings=timings)
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+        stages = timings.as_dict()['stages']
+        # at least the float32 map of the template matching
+        self.assertGreaterEqual(stages['template_matching']['peak_memory'],
+                                4 * image.size)
+        for values in stages.values():
+            self.assertGreaterEqual(values['peak_memory'], 0)
+            self.assertGreaterEqual(values['max_rss_growth'], 0)
+            self.assertIn('retained_memory', values)
+
+    def test_stage_timings_memory_shared(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        import tracemalloc
+        from detloclcheck.tools import StageTimings
+        was_tracing = tracemalloc.is_tracing()
+        first = StageTimings(memory=True)
+        second = StageTimings(memory=True)
+        with second.stage('second'):
+            data = numpy.ones(2**21)
+            del data
+            # the memory points of first do not reset the peak of second
+            with first.stage('first'):
+                data = numpy.ones(2**20)
+                del data
+        first.close()
+        # closing first does not stop the tracing of second
+        self.assertTrue(tracemalloc.is_tracing())
+        with second.stage('third'):
+            data = numpy.ones(2**20)
+            del data
+        second.close()
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+        stages = second.as_dict()['stages']
+        self.assertGreaterEqual(stages['second']['peak_memory'], 8 * 2**21)
+        self.assertGreaterEqual(stages['third']['peak_memory'], 8 * 2**20)
+        self.assertGreaterEqual(
+            first.as_dict()['stages']['first']['peak_memory'], 8 * 2**20)
+
+    def _traced_detection(self, angles):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        :return: the TraceEvents of a parallel detection
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard
+        from detloclcheck.tools import StageTimings, TraceEvents
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        trace = TraceEvents()
+        coordinate_system, _, _, _ = detect_localize_checkerboard(
+            image, (11,), angles, run_parallel=True,
+            timings=StageTimings(trace=trace))
+        self.assertIsNotNone(coordinate_system)
+        return trace
+
+    def test_trace_events(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        angles = (0.0, 45.0, 90.0, 135.0)
+        trace = self._traced_detection(angles)
+        names = {event['name'] for event in trace.events}
+        for name in ('template_matching', 'corner_subpix',
+                     'template_matching reduce', 'corner_subpix reduce',
+                     'template_matching 0', 'template_matching queue',
+                     'template_matching collect'):
+            self.assertIn(name, names)
+        # one computation in a worker process for every angle
+        compute = [event for event in trace.events
+                   if event['cat'] == 'compute' and
+                   event['name'].startswith('template_matching')]
+        self.assertEqual(len(compute), len(angles))
+        for event in compute:
+            self.assertNotEqual(event['pid'], os.getpid())
+            self.assertGreaterEqual(event['dur'], 0)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'trace.json')
+            trace.write(filename)
+            with open(filename, encoding='utf8') as fd:
+                data = json.load(fd)
+        self.assertEqual(len(data['traceEvents']), len(trace.events))
+
+    def test_frame_detector(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import (
+            detect_localize_checkerboard, FrameDetector)
+        from detloclcheck.find_checkerboard.find_checkerboard import \
+            _calculate_overall_map
+        crosssizes = (11, 23)
+        angles = (0.0, 22.5, 45.0, 67.5, 90.0, 112.5, 135.0, 157.5)
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        detector = FrameDetector(image.shape, crosssizes, angles)
+        overall_map = detector.template_matching(image)
+        numpy.testing.assert_allclose(
+            overall_map,
+            _calculate_overall_map(image, crosssizes, angles, False),
+            atol=1e-6)
+        expected = detect_localize_checkerboard(image, crosssizes, angles)
+        # the buffers are reused for every frame
+        for frame in (image, 255 - image, image.copy()):
+            result = detector.detect(frame)
+            self.assertIs(detector.template_matching.overall_map,
+                          overall_map)
+        for array, expected_array in zip(result, expected):
+            numpy.testing.assert_array_equal(array, expected_array)
+        with self.assertRaises(ValueError):
+            detector.detect(image[1:, :])
+
+    def _tracking_frames(self, crosssizes, angles):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        :return: (frames, prior, expected) with two frames with a shifted
+                 checkerboard, the prior from the first frame and the result
+                 of the second frame
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        from detloclcheck.detect_localize_checkerboard import (
+            detect_localize_checkerboard, prior_from_result)
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        frames = []
+        for y0, x0 in ((10, 10), (14, 17)):
+            frame = numpy.full(
+                (image.shape[0] + 40, image.shape[1] + 40), image[0, 0],
+                dtype=image.dtype)
+            frame[y0:y0 + image.shape[0], x0:x0 + image.shape[1]] = image
+            frames.append(frame)
+        result = detect_localize_checkerboard(frames[0], crosssizes, angles)
+        prior = prior_from_result(result, crosssizes)
+        self.assertEqual(prior['crosssize'], 11)
+        self.assertEqual(prior['corners'], result[0].shape[0])
+        json.dumps(prior)
+        self.assertIsNone(prior_from_result((None, 1, None, None)))
+        return frames, prior, detect_localize_checkerboard(
+            frames[1], crosssizes, angles)
+
+    def test_tracking_prior(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.detect_localize_checkerboard import \
+            detect_localize_checkerboard
+        from detloclcheck.tools import StageTimings
+        crosssizes = (11,)
+        angles = (0.0, 22.5, 45.0, 67.5, 90.0, 112.5, 135.0, 157.5)
+        frames, prior, expected = self._tracking_frames(crosssizes, angles)
+
+        def sort(coordinate_system):
+            return coordinate_system[numpy.lexsort(
+                (coordinate_system[:, 1, 0], coordinate_system[:, 1, 1]))]
+        report = {}
+        timings = StageTimings()
+        tracked = detect_localize_checkerboard(
+            frames[1], crosssizes, angles, prior=prior, report=report,
+            timings=timings)
+        self.assertEqual(report['prior'], 'tracked')
+        self.assertNotIn('prior_fallbacks', timings.as_dict()['counts'])
+        numpy.testing.assert_allclose(
+            sort(tracked[0]), sort(expected[0]), atol=1e-3)
+        numpy.testing.assert_allclose(tracked[1], expected[1], atol=1e-3)
+
+    def test_tracking_prior_fallback(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.detect_localize_checkerboard import (
+            detect_localize_checkerboard, DetectionResultCache)
+        from detloclcheck.tools import StageTimings
+        crosssizes = (11,)
+        angles = (0.0, 22.5, 45.0, 67.5, 90.0, 112.5, 135.0, 157.5)
+        frames, prior, expected = self._tracking_frames(crosssizes, angles)
+        report = {}
+        timings = StageTimings()
+        cache = DetectionResultCache()
+        # a prior not fitting to the image leads to the full search
+        result = detect_localize_checkerboard(
+            frames[1], crosssizes, angles,
+            prior=dict(prior, bbox=[0.0, 0.0, 5.0, 5.0],
+                       axis1=[3.0, 0.0], axis2=[0.0, 3.0]),
+            report=report, timings=timings, cache=cache)
+        self.assertEqual(report['prior'], 'full')
+        self.assertEqual(timings.as_dict()['counts']['prior_fallbacks'], 1)
+        for array, expected_array in zip(result, expected):
+            numpy.testing.assert_array_equal(array, expected_array)
+        # the prior is not part of the key of the cache
+        report = {}
+        result = detect_localize_checkerboard(
+            frames[1], crosssizes, angles, prior=prior, report=report,
+            cache=cache)
+        self.assertTrue(report['cached'])
+        for array, expected_array in zip(result, expected):
+            numpy.testing.assert_array_equal(array, expected_array)
+        # a result of the tracked search is not stored
+        cache = DetectionResultCache()
+        report = {}
+        detect_localize_checkerboard(
+            frames[1], crosssizes, angles, prior=prior, report=report,
+            cache=cache)
+        self.assertEqual(report['prior'], 'tracked')
+        report = {}
+        detect_localize_checkerboard(
+            frames[1], crosssizes, angles, report=report, cache=cache)
+        self.assertFalse(report['cached'])
+
+    @staticmethod
+    def _video_frames(number):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        :return: frames with the checkerboard moved by one row per frame
+        """
+        from detloclcheck.create_checkerboard_image import \
+            create_checkerboard_image
+        _, _, image = create_checkerboard_image(8, 8, 15)
+        frames = []
+        for shift in range(number):
+            frame = numpy.full(
+                (image.shape[0] + 20, image.shape[1] + 20), image[0, 0],
+                dtype=image.dtype)
+            frame[5 + shift:5 + shift + image.shape[0],
+                  10:10 + image.shape[1]] = image
+            frames.append(frame)
+        return frames
+
+    def _assert_moved(self, result, reference, offset):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        assert the corners of result are the corners of reference with the
+        same world coordinates moved by offset (in pixel)
+        """
+        for pixel, world in result[0]:
+            index = numpy.flatnonzero(
+                (reference[0][:, 1, :] == world).all(axis=1))
+            self.assertEqual(index.shape[0], 1)
+            numpy.testing.assert_allclose(
+                pixel, reference[0][index[0], 0, :] + offset, atol=0.1)
+        for axis in (2, 3):
+            numpy.testing.assert_allclose(
+                result[axis], reference[axis], atol=0.1)
+
+    def test_optical_flow_tracker(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+        """
+        from detloclcheck.detect_localize_checkerboard import \
+            OpticalFlowTracker
+        from detloclcheck.tools import StageTimings
+        frames = self._video_frames(5)
+        tracker = OpticalFlowTracker(
+            (11,), (0.0, 22.5, 45.0, 67.5, 90.0, 112.5, 135.0, 157.5),
+            keyframe_interval=3)
+        timings = StageTimings()
+        sources = []
+        keyframe_shift, keyframe = 0, None
+        for shift, frame in enumerate(frames):
+            result, source = tracker(frame, timings)
+            sources.append(source)
+            if source == 'keyframe':
+                keyframe_shift, keyframe = shift, result
+                continue
+            # the tracked corners are a subset of the corners of the
+            # keyframe with the same world coordinates
+            self._assert_moved(
+                result, keyframe, (0.0, float(shift - keyframe_shift)))
+        self.assertEqual(sources, ['keyframe', 'tracked', 'tracked',
+                                   'tracked', 'keyframe'])
+        counts = timings.as_dict()['counts']
+        self.assertEqual(counts['keyframes'], 2)
+        self.assertEqual(counts['tracked_frames'], 3)
+        # a frame without checkerboard loses the track
+        result, source = tracker(numpy.zeros_like(frames[0]))
+        self.assertIsNone(result[0])
+        self.assertEqual(source, 'keyframe')
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
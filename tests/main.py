@@ -1,7 +1,7 @@
 """
 :Author: Daniel Mohr
 :Email: daniel.mohr@uni-greifswald.de
-:Date: 2025-02-20
+:Date: 2026-10-19
 :License: LGPL-3.0-or-later
 
 aggregation of tests
@@ -15,10 +15,19 @@ Or you can run only one test, e. g.::
 
   env python3 main.py TestScriptsExecutable
   pytest-3 -k TestScriptsExecutable main.py
+
+The artificial checkerboard images used in the tests can be cached on disk
+by setting the environment variable DETLOCLCHECK_CACHE_DIR, e. g.::
+
+  env DETLOCLCHECK_CACHE_DIR=~/.cache/detloclcheck pytest-3 main.py
 """
 
+import base64
+import json
+import socket
 import subprocess  # nosec B404
 import tempfile  # nosec B404
+import time
 import unittest
 import os
 
@@ -30,6 +39,9 @@ try:
         import TestCheckDetectLocalizeCheckerboard  # noqa: F401
     from checkerboard_image_class \
         import TestCheckerboardImageClass  # noqa: F401
+    from create_checkerboard_image \
+        import TestCreateCheckerboardImage  # noqa: F401
+    from batch import TestBatch  # noqa: F401
 except ImportError:
     from tests.scripts_detloclcheck_check_arg_file \
         import TestCheckArgFile  # noqa: F401
@@ -37,6 +49,9 @@ except ImportError:
         import TestCheckDetectLocalizeCheckerboard  # noqa: F401
     from tests.checkerboard_image_class \
         import TestCheckerboardImageClass  # noqa: F401
+    from tests.create_checkerboard_image \
+        import TestCreateCheckerboardImage  # noqa: F401
+    from tests.batch import TestBatch  # noqa: F401
 
 
 class TestImport(unittest.TestCase):
@@ -51,10 +66,11 @@ class TestImport(unittest.TestCase):
     def test_import(self):
         """
         :Author: Daniel Mohr
-        :Date: 2024-07-10
+        :Date: 2026-10-19
         """
         # pylint: disable=import-outside-toplevel
         import detloclcheck  # noqa: F401
+        import detloclcheck.batch  # noqa: F401
         import detloclcheck.create_checkerboard_image  # noqa: F401
         import detloclcheck.create_coordinate_system  # noqa: F401
         import detloclcheck.find_checkerboard  # noqa: F401
@@ -278,6 +294,458 @@ class TestScriptsExecutable(unittest.TestCase):
                 os.path.splitext(filename)[0] + '.' + 'mat'
             self.assertTrue(os.path.isfile(data_filename))
 
+    def test_detloclcheck_2(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_2
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filenames = [os.path.join(tmpdir, name)
+                         for name in ("foo.png", "bar.png")]
+            for filename in filenames:
+                subprocess.run(  # nosec B602
+                    "detloclcheck create_checkerboard_image "
+                    "-outfile " + filename + " -integrate_method 0",
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    shell=True, timeout=self.subprocess_timeout, check=True)
+            # a broken file is skipped and leads to an error code
+            broken_filename = os.path.join(tmpdir, "baz.png")
+            with open(broken_filename, 'w', encoding='utf8') as fd:
+                fd.write('no image')
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard "
+                "-f " + " ".join(filenames + [broken_filename]) +
+                " -crosssizes 11 -jobs 2",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=2*self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 8)
+            for filename in filenames:
+                data_filename = \
+                    os.path.splitext(filename)[0] + '.' + 'json'
+                self.assertTrue(os.path.isfile(data_filename))
+                os.remove(data_filename)
+            # pipelined mode
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard "
+                "-f " + " ".join(filenames + [broken_filename]) +
+                " -crosssizes 11 -prefetch 2",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=2*self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 8)
+            for filename in filenames:
+                data_filename = \
+                    os.path.splitext(filename)[0] + '.' + 'json'
+                self.assertTrue(os.path.isfile(data_filename))
+                os.remove(data_filename)
+            # result store instead of one file per image
+            result_store = os.path.join(tmpdir, "results")
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard "
+                "-f " + " ".join(filenames + [broken_filename]) +
+                " -crosssizes 11 -jobs 2 -result_store " + result_store,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=2*self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 8)
+            self.assertTrue(os.path.isdir(result_store))
+            for filename in filenames:
+                self.assertFalse(os.path.isfile(
+                    os.path.splitext(filename)[0] + '.' + 'json'))
+            self.assertFalse(os.path.isfile(
+                os.path.splitext(broken_filename)[0] + '.' + 'json'))
+
+    def test_detloclcheck_3(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_3
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "foo.png")
+            subprocess.run(  # nosec B602
+                "detloclcheck create_checkerboard_image "
+                "-outfile " + filename + " -integrate_method 0",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            broken_filename = os.path.join(tmpdir, "baz.png")
+            with open(broken_filename, 'w', encoding='utf8') as fd:
+                fd.write('no image')
+            # stream the results to stdout
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard "
+                "-f " + filename + " " + broken_filename +
+                " -crosssizes 11 -stdout_format jsonl",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 8)
+            records = [json.loads(line) for line in cpi.stdout.splitlines()]
+            self.assertEqual([record['file'] for record in records],
+                             [filename, broken_filename])
+            self.assertEqual([record['status'] for record in records],
+                             [0, 8])
+            self.assertGreater(len(records[0]['coordinate_system']), 24)
+            self.assertFalse(os.path.isfile(
+                os.path.splitext(filename)[0] + '.' + 'json'))
+            # identical images are only handled once
+            result_cache = os.path.join(tmpdir, "cache")
+            subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard "
+                "-f " + filename + " " + filename +
+                " -crosssizes 11 -result_cache " + result_cache,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            self.assertEqual(len(os.listdir(result_cache)), 1)
+            # continue a job using a manifest
+            manifest = os.path.join(tmpdir, "job.jsonl")
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard "
+                "-f " + filename + " " + broken_filename +
+                " -crosssizes 11 -manifest " + manifest,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 8)
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard "
+                "-f " + filename + " " + broken_filename +
+                " -crosssizes 11 -manifest " + manifest,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            self.assertIn(b'handle 0 unfinished of 2 files', cpi.stderr)
+            with open(manifest, encoding='utf8') as fd:
+                records = [json.loads(line) for line in fd]
+            self.assertEqual([record['state'] for record in records[-2:]],
+                             ['done', 'failed'])
+            # two workers of a work queue
+            work_queue = os.path.join(tmpdir, "queue")
+            result_store = os.path.join(tmpdir, "store")
+            # pylint: disable=consider-using-with
+            workers = [
+                subprocess.Popen(  # nosec B602
+                    "detloclcheck find_checkerboard "
+                    "-f " + filename + " " + broken_filename +
+                    " -crosssizes 11 -work_queue " + work_queue +
+                    " -result_store " + result_store,
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    shell=True)
+                for _ in range(2)]
+            for worker in workers:
+                worker.communicate(timeout=self.subprocess_timeout)
+            self.assertEqual(
+                sorted(worker.returncode for worker in workers), [0, 8])
+            for state in ('pending', 'claimed', 'done', 'failed'):
+                self.assertEqual(
+                    len(os.listdir(os.path.join(work_queue, state))),
+                    int(state in ('done', 'failed')))
+            self.assertEqual(len(os.listdir(result_store)), 2)
+
+    def test_detloclcheck_4(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_4
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "foo.png")
+            subprocess.run(  # nosec B602
+                "detloclcheck create_checkerboard_image "
+                "-outfile " + filename + " -integrate_method 0",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            socket_name = os.path.join(tmpdir, "detloclcheck.sock")
+            with subprocess.Popen(  # nosec B603, B607
+                    ["detloclcheck", "serve", "-socket", socket_name,
+                     "-crosssizes", "11", "-jobs", "2"],
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE) as server:
+                start = time.monotonic()
+                while not os.path.exists(socket_name):
+                    self.assertLess(time.monotonic() - start,
+                                    self.subprocess_timeout)
+                    time.sleep(0.1)
+                with open(filename, 'rb') as fd:
+                    image = base64.b64encode(fd.read()).decode('ascii')
+                tiny_filename = self._create_tiny_image(tmpdir)
+                requests = [{'id': 1, 'file': filename},
+                            {'id': 2, 'image': image, 'name': 'bar'},
+                            {'id': 3, 'image': 'bm8gaW1hZ2U='},
+                            {'id': 4},
+                            {'id': 5, 'file': tiny_filename},
+                            {'id': 6, 'file': filename}]
+                with socket.socket(socket.AF_UNIX) as client:
+                    client.connect(socket_name)
+                    client.settimeout(self.subprocess_timeout)
+                    with client.makefile('rw', encoding='utf8') as stream:
+                        for request in requests:
+                            stream.write(json.dumps(request) + '\n')
+                        stream.flush()
+                        records = [json.loads(stream.readline())
+                                   for _ in requests]
+                server.terminate()
+                server.communicate(timeout=self.subprocess_timeout)
+            self.assertEqual(server.returncode, 0)
+            self.assertFalse(os.path.exists(socket_name))
+            self.assertEqual([record.get('id') for record in records[:3]],
+                             [1, 2, 3])
+            self.assertEqual([record['file'] for record in records[:2]],
+                             [filename, 'bar'])
+            self.assertEqual([record['status'] for record in records[:3]],
+                             [0, 0, 8])
+            self.assertEqual(records[0]['coordinate_system'],
+                             records[1]['coordinate_system'])
+            self.assertIn('error', records[3])
+            # the connection is kept after a failed request
+            self.assertEqual([record['status'] for record in records[4:]],
+                             [9, 0])
+            # the memory is only valid for one request at a time
+            cpi = subprocess.run(  # nosec B603, B607
+                ["detloclcheck", "serve", "-socket", socket_name,
+                 "-memory", "-max_concurrent", "2"],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 1)
+
+    def test_detloclcheck_5(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_5
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            baseline = os.path.join(tmpdir, "baseline.json")
+            subprocess.run(  # nosec B602
+                "detloclcheck benchmark -megapixel 0.05 -square_size 15 "
+                "-rotation 0 30 -repeat 1 -crosssizes 11 -json " + baseline,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            with open(baseline, encoding='utf8') as fd:
+                data = json.load(fd)
+            self.assertIn('python', data['environment'])
+            self.assertEqual(
+                [workload['rotation'] for workload in data['results']],
+                [0, 30])
+            for workload in data['results']:
+                self.assertEqual(workload['error_code'], 0)
+                self.assertIn('overall_map', workload['seconds'])
+                self.assertIn('total', workload['seconds'])
+            # no regression against itself with a large tolerance
+            result = os.path.join(tmpdir, "result.json")
+            subprocess.run(  # nosec B602
+                "detloclcheck benchmark -megapixel 0.05 -square_size 15 "
+                "-rotation 0 -repeat 1 -crosssizes 11 -tolerance 100 "
+                "-compare " + baseline + " -json " + result,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            with open(result, encoding='utf8') as fd:
+                comparison = json.load(fd)['comparison']
+            self.assertEqual(len(comparison),
+                             len(data['results'][0]['seconds']))
+            # a too fast baseline gives a regression
+            for workload in data['results']:
+                workload['seconds']['overall_map'] = 0
+            with open(baseline, 'w', encoding='utf8') as fd:
+                json.dump(data, fd)
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck benchmark -megapixel 0.05 -square_size 15 "
+                "-rotation 0 -repeat 1 -crosssizes 11 -compare " + baseline,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 1)
+            # not a result of the benchmark
+            with open(baseline, 'w', encoding='utf8') as fd:
+                json.dump({'environment': {}}, fd)
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck benchmark -megapixel 0.05 -compare " + baseline,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 1)
+            self.assertIn(b'is not a result of detloclcheck benchmark',
+                          cpi.stderr)
+            self.assertNotIn(b'Traceback', cpi.stderr)
+            # the image size has to be positive
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck benchmark -megapixel 0",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 2)
+
+    def test_detloclcheck_6(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_6
+        """
+        # the start of the script does not import the heavy modules
+        cpi = subprocess.run(  # nosec B602, B607
+            "python3 -c 'import sys; "
+            "import detloclcheck.scripts.detloclcheck; "
+            "print(sorted({\"cv2\", \"numpy\", \"scipy\", "
+            "\"matplotlib\"} & set(sys.modules)))'",
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            shell=True, timeout=self.subprocess_timeout, check=True)
+        self.assertEqual(cpi.stdout.strip(), b'[]')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = os.path.join(tmpdir, "result.json")
+            subprocess.run(  # nosec B602
+                "detloclcheck benchmark -megapixel 0.05 -square_size 15 "
+                "-rotation 0 -repeat 1 -crosssizes 11 -import_time "
+                "-json " + result,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            with open(result, encoding='utf8') as fd:
+                data = json.load(fd)
+            self.assertIn('detloclcheck.scripts.detloclcheck',
+                          data['import_seconds'])
+            for seconds in data['import_seconds'].values():
+                self.assertGreater(seconds, 0)
+
+    def _create_video(self, tmpdir, frames):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        :return: name of a video with a checkerboard moved by one row per
+                 frame
+        """
+        # pylint: disable=import-outside-toplevel
+        import cv2
+        import numpy
+        filename = os.path.join(tmpdir, "foo.png")
+        subprocess.run(  # nosec B602
+            "detloclcheck create_checkerboard_image "
+            "-outfile " + filename + " -integrate_method 0",
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            shell=True, timeout=self.subprocess_timeout, check=True)
+        image = cv2.imread(filename, cv2.IMREAD_GRAYSCALE)
+        video = os.path.join(tmpdir, "foo.avi")
+        shape = (image.shape[0] + 20, image.shape[1] + 20)
+        writer = cv2.VideoWriter(
+            video, cv2.VideoWriter_fourcc(*'MJPG'), 10,
+            (shape[1], shape[0]))
+        for shift in range(frames):
+            frame = numpy.full(shape, image[0, 0], dtype=numpy.uint8)
+            frame[2 + shift:2 + shift + image.shape[0],
+                  10:10 + image.shape[1]] = image
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+        writer.release()
+        return video
+
+    def test_detloclcheck_7(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_7
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            video = self._create_video(tmpdir, 6)
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck video -f " + video +
+                " -crosssizes 11 -keyframe_interval 3",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=2*self.subprocess_timeout, check=True)
+            records = [json.loads(line)
+                       for line in cpi.stdout.decode().splitlines()]
+            self.assertEqual([record['frame'] for record in records],
+                             list(range(6)))
+            self.assertEqual(records[0]['source'], 'keyframe')
+            self.assertIn('tracked',
+                          [record['source'] for record in records])
+            self.assertEqual(records[0]['status'], 0)
+            for record in records:
+                self.assertEqual(record['file'], video)
+            # a file, which is no video, leads to an error code
+            broken_video = os.path.join(tmpdir, "bar.avi")
+            with open(broken_video, 'w', encoding='utf8') as fd:
+                fd.write('no video')
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck video -f " + broken_video,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 1)
+
+    @staticmethod
+    def _create_tiny_image(tmpdir):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        :return: name of an image, which is smaller than the templates; the
+                 template matching raises an exception
+        """
+        # pylint: disable=import-outside-toplevel
+        import cv2
+        import numpy
+        filename = os.path.join(tmpdir, "tiny.png")
+        cv2.imwrite(filename, numpy.full((3, 20), 128, numpy.uint8))
+        return filename
+
+    def test_detloclcheck_8(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_8
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "foo.png")
+            subprocess.run(  # nosec B602
+                "detloclcheck create_checkerboard_image "
+                "-outfile " + filename + " -integrate_method 0",
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=True)
+            tiny_filename = self._create_tiny_image(tmpdir)
+            for jobs in (1, 2):
+                cpi = subprocess.run(  # nosec B602
+                    "detloclcheck find_checkerboard -f " + tiny_filename +
+                    " " + filename + f" -jobs {jobs}",
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    shell=True, timeout=2*self.subprocess_timeout,
+                    check=False)
+                self.assertEqual(cpi.returncode, 9)
+                data_filename = os.path.splitext(filename)[0] + '.json'
+                self.assertTrue(os.path.isfile(data_filename))
+                os.remove(data_filename)
+            # the failed file is recorded in the manifest and not retried
+            manifest = os.path.join(tmpdir, "job.jsonl")
+            for options, returncode in (('', 9), ('', 0),
+                                        (' -retry_failed', 9)):
+                cpi = subprocess.run(  # nosec B602
+                    "detloclcheck find_checkerboard -f " + tiny_filename +
+                    " -manifest " + manifest + options,
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    shell=True, timeout=self.subprocess_timeout,
+                    check=False)
+                self.assertEqual(cpi.returncode, returncode)
+            with open(manifest, encoding='utf8') as fd:
+                record = json.loads(fd.readlines()[-1])
+            self.assertEqual(record['state'], 'failed')
+            self.assertEqual(record['error_code'], 9)
+
+    def test_detloclcheck_9(self):
+        """
+        :Author: Daniel Mohr
+        :Date: 2026-10-19
+
+        env python3 main.py TestScriptsExecutable.test_detloclcheck_9
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # the exit status is bounded (32 * 8 = 256 is 0 modulo 256)
+            broken_filenames = []
+            for i in range(32):
+                broken_filenames.append(os.path.join(tmpdir, f"{i}.png"))
+                with open(broken_filenames[-1], 'w', encoding='utf8') as fd:
+                    fd.write('no image')
+            cpi = subprocess.run(  # nosec B602
+                "detloclcheck find_checkerboard -f " +
+                " ".join(broken_filenames),
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                shell=True, timeout=self.subprocess_timeout, check=False)
+            self.assertEqual(cpi.returncode, 255)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)